@@ -0,0 +1,224 @@
+"""Add menu snapshots
+
+Revision ID: 0b6e3d9f5a21
+Revises: e4b7c19a3f60
+Create Date: 2026-10-19 18:47:33.516092
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e3d9f5a21"
+down_revision: Union[str, None] = "e4b7c19a3f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "menu_snapshots",
+        sa.Column("place_id", sa.UUID(), nullable=False),
+        sa.Column("lang", sa.String(), nullable=False),
+        sa.Column("document", sa.Text(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["place_id"], ["places.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("place_id", "lang"),
+    )
+
+    # Render the menus of a place as served by GET /places/{place_id}/menus, with names in a language
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION render_menu_document(p_place_id uuid, p_lang text) RETURNS text AS $$
+            SELECT coalesce(json_agg(rendered.menu ORDER BY menus.created_at, menus.id), '[]'::json)::text
+            FROM menus
+            CROSS JOIN LATERAL (
+                SELECT json_build_object(
+                    'id', menus.id,
+                    'categories', coalesce((
+                        SELECT json_agg(
+                            json_build_object(
+                                'id', dish_categories.id,
+                                'display_name', CASE
+                                    WHEN p_lang = 'zh-CN' AND dish_categories.name_zh <> '' THEN dish_categories.name_zh
+                                    ELSE dish_categories.name
+                                END,
+                                'dishes', coalesce((
+                                    SELECT json_agg(
+                                        json_build_object(
+                                            'id', dishes.id,
+                                            'display_name', CASE
+                                                WHEN p_lang = 'zh-CN' AND dishes.name_zh <> '' THEN dishes.name_zh
+                                                ELSE dishes.name
+                                            END,
+                                            'price', dishes.price::text,
+                                            'properties', dishes.properties
+                                        )
+                                        ORDER BY dishes.name, dishes.id
+                                    )
+                                    FROM dishes
+                                    WHERE dishes.menu_id = menus.id AND dishes.category_id = dish_categories.id
+                                ), '[]'::json)
+                            )
+                            ORDER BY dish_categories.name, dish_categories.id
+                        )
+                        FROM dish_categories
+                        WHERE dish_categories.menu_id = menus.id
+                    ), '[]'::json),
+                    'dishes', coalesce((
+                        SELECT json_agg(
+                            json_build_object(
+                                'id', dishes.id,
+                                'display_name', CASE
+                                    WHEN p_lang = 'zh-CN' AND dishes.name_zh <> '' THEN dishes.name_zh
+                                    ELSE dishes.name
+                                END,
+                                'price', dishes.price::text,
+                                'properties', dishes.properties
+                            )
+                            ORDER BY dishes.name, dishes.id
+                        )
+                        FROM dishes
+                        WHERE dishes.menu_id = menus.id AND dishes.category_id IS NULL
+                    ), '[]'::json)
+                ) AS menu
+            ) AS rendered
+            WHERE menus.place_id = p_place_id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+    # Store the rendered menus of the given places in every language, with the SHA-256 of the document.
+    # Concurrent writers to the same place are serialized by an advisory lock taken before rendering, so that the
+    # last snapshot written includes the changes committed by the others. Places share 1024 locks by the hash of
+    # their ID, so that a bulk write holds a bounded number of locks however many places it writes, as each lock
+    # takes a slot of the shared lock table until commit. The languages must be kept in sync with
+    # app.constants.Language.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_snapshots(place_ids uuid[]) RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('menu_snapshots'), buckets.bucket)
+            FROM (
+                SELECT DISTINCT (hashtextextended(ids.place_id::text, 0) & 1023)::int AS bucket
+                FROM unnest(place_ids) AS ids(place_id)
+                ORDER BY 1
+            ) AS buckets;
+
+            INSERT INTO menu_snapshots (place_id, lang, document, etag, updated_at)
+            SELECT places.id,
+                   langs.lang,
+                   rendered.document,
+                   encode(sha256(convert_to(rendered.document, 'UTF8')), 'hex'),
+                   now()
+            FROM places
+            CROSS JOIN (VALUES ('en-US'), ('zh-CN')) AS langs(lang)
+            CROSS JOIN LATERAL (SELECT render_menu_document(places.id, langs.lang) AS document) AS rendered
+            WHERE places.id = ANY(place_ids)
+            ON CONFLICT (place_id, lang) DO UPDATE
+            SET document = EXCLUDED.document, etag = EXCLUDED.etag, updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    # Statement-level triggers, so that a bulk write renders each affected place once.
+    # Every trigger names its transition tables old_rows and new_rows, so that the functions can be shared.
+    # A transaction writing menus with several statements, such as a bulk load, can defer the refresh by setting
+    # weat.defer_menu_snapshots, then refresh the snapshots of the places it wrote once.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_snapshots_from_menus() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('weat.defer_menu_snapshots', true) = 'on' THEN
+                RETURN NULL;
+            ELSIF TG_OP = 'INSERT' THEN
+                PERFORM refresh_menu_snapshots(ARRAY(SELECT DISTINCT place_id FROM new_rows));
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_menu_snapshots(ARRAY(
+                    SELECT place_id FROM old_rows UNION SELECT place_id FROM new_rows
+                ));
+            ELSE
+                PERFORM refresh_menu_snapshots(ARRAY(SELECT DISTINCT place_id FROM old_rows));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_snapshots_from_menu_items() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('weat.defer_menu_snapshots', true) = 'on' THEN
+                RETURN NULL;
+            ELSIF TG_OP = 'INSERT' THEN
+                PERFORM refresh_menu_snapshots(ARRAY(
+                    SELECT DISTINCT menus.place_id FROM new_rows JOIN menus ON menus.id = new_rows.menu_id
+                ));
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_menu_snapshots(ARRAY(
+                    SELECT menus.place_id FROM old_rows JOIN menus ON menus.id = old_rows.menu_id
+                    UNION
+                    SELECT menus.place_id FROM new_rows JOIN menus ON menus.id = new_rows.menu_id
+                ));
+            ELSE
+                -- Rows deleted along with their menu are covered by the trigger on menus
+                PERFORM refresh_menu_snapshots(ARRAY(
+                    SELECT DISTINCT menus.place_id FROM old_rows JOIN menus ON menus.id = old_rows.menu_id
+                ));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, function in [
+        ("menus", "refresh_menu_snapshots_from_menus"),
+        ("dish_categories", "refresh_menu_snapshots_from_menu_items"),
+        ("dishes", "refresh_menu_snapshots_from_menu_items"),
+    ]:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_menu_snapshots_insert
+            AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_menu_snapshots_update
+            AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_menu_snapshots_delete
+            AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """
+        )
+
+    op.execute("SELECT refresh_menu_snapshots(ARRAY(SELECT DISTINCT place_id FROM menus))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ["dishes", "dish_categories", "menus"]:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_menu_snapshots_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_menu_snapshots_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_menu_snapshots_insert ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_menu_snapshots_from_menu_items()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_menu_snapshots_from_menus()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_menu_snapshots(uuid[])")
+    op.execute("DROP FUNCTION IF EXISTS render_menu_document(uuid, text)")
+
+    op.drop_table("menu_snapshots")
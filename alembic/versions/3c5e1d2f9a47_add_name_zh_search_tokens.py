@@ -0,0 +1,97 @@
+"""Add name_zh search tokens
+
+Revision ID: 3c5e1d2f9a47
+Revises: f90c99b3f824
+Create Date: 2026-10-19 11:02:17.904635
+
+"""
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+from opencc import OpenCC
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5e1d2f9a47"
+down_revision: Union[str, None] = "f90c99b3f824"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of the tokenization of app.utils.text at this revision, so that later changes
+# to the application do not change what this migration writes
+_CJK_CHARACTERS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_CJK_PATTERN = re.compile(f"[{_CJK_CHARACTERS}]")
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_CHARACTERS}]+|[^\W{_CJK_CHARACTERS}]+")
+
+_traditional_to_simplified = OpenCC("t2s")
+
+
+def _zh_search_tokens(value: str) -> list[str]:
+    normalized = _traditional_to_simplified.convert(unicodedata.normalize("NFKC", value)).casefold()
+    tokens = set()
+    for run in _TOKEN_PATTERN.findall(normalized):
+        if _CJK_PATTERN.search(run):
+            tokens.update(run)
+            tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.add(run)
+
+    return sorted(tokens)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "places",
+        sa.Column("name_zh_tokens", postgresql.ARRAY(sa.String()), server_default="{}", nullable=False),
+    )
+
+    # Tokenizing needs the same normalization as the application, so backfill from Python
+    conn = op.get_bind()
+    places = sa.table(
+        "places",
+        sa.column("id", sa.UUID()),
+        sa.column("name_zh_tokens", postgresql.ARRAY(sa.String())),
+    )
+    names = sa.table("places", sa.column("id", sa.UUID()), sa.column("name_zh", sa.String()))
+    last_id = None
+    while True:
+        # Paginated by ID rather than loaded at once, so that memory stays bounded
+        stmt = (
+            sa.select(names.c.id, names.c.name_zh)
+            .where(names.c.name_zh.isnot(None))
+            .order_by(names.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(names.c.id > last_id)
+        rows = conn.execute(stmt).all()
+        if not rows:
+            break
+
+        conn.execute(
+            places.update().where(places.c.id == sa.bindparam("place_id")),
+            [{"place_id": place_id, "name_zh_tokens": _zh_search_tokens(name_zh)} for place_id, name_zh in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "idx_places_name_zh_tokens",
+        "places",
+        ["name_zh_tokens"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_places_name_zh_tokens", table_name="places", postgresql_using="gin")
+    op.drop_column("places", "name_zh_tokens")
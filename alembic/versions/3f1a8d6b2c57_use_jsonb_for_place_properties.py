@@ -0,0 +1,74 @@
+"""Use JSONB for place properties
+
+Revision ID: 3f1a8d6b2c57
+Revises: 9c2e5f7a1b84
+Create Date: 2026-10-19 20:12:48.630271
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a8d6b2c57"
+down_revision: Union[str, None] = "9c2e5f7a1b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "places",
+        "opening_hours",
+        existing_type=postgresql.JSON(astext_type=sa.Text()),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using="opening_hours::jsonb",
+    )
+    op.alter_column(
+        "places",
+        "properties",
+        existing_type=postgresql.JSON(astext_type=sa.Text()),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using="properties::jsonb",
+    )
+    op.create_index(
+        "idx_places_properties",
+        "places",
+        ["properties"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"properties": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_places_properties",
+        table_name="places",
+        postgresql_using="gin",
+        postgresql_ops={"properties": "jsonb_path_ops"},
+    )
+    op.alter_column(
+        "places",
+        "properties",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using="properties::json",
+    )
+    op.alter_column(
+        "places",
+        "opening_hours",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using="opening_hours::json",
+    )
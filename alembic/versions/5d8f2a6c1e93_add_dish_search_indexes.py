@@ -0,0 +1,57 @@
+"""Add dish search indexes
+
+Revision ID: 5d8f2a6c1e93
+Revises: 7a4b9e0c2d18
+Create Date: 2026-10-19 16:05:18.204716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8f2a6c1e93"
+down_revision: Union[str, None] = "7a4b9e0c2d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Foreign keys are not indexed by Postgres, so joins from places down to dishes scan whole tables without these
+    op.create_index(op.f("ix_menus_place_id"), "menus", ["place_id"], unique=False)
+    op.create_index(op.f("ix_dish_categories_menu_id"), "dish_categories", ["menu_id"], unique=False)
+    op.create_index(op.f("ix_dishes_menu_id"), "dishes", ["menu_id"], unique=False)
+    op.create_index(op.f("ix_dishes_category_id"), "dishes", ["category_id"], unique=False)
+
+    op.create_index(op.f("ix_dishes_price"), "dishes", ["price"], unique=False)
+    op.create_index(
+        "idx_dishes_name_trgm",
+        "dishes",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_dishes_name_zh_trgm",
+        "dishes",
+        ["name_zh"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name_zh": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_dishes_name_zh_trgm", table_name="dishes", postgresql_using="gin")
+    op.drop_index("idx_dishes_name_trgm", table_name="dishes", postgresql_using="gin")
+    op.drop_index(op.f("ix_dishes_price"), table_name="dishes")
+
+    op.drop_index(op.f("ix_dishes_category_id"), table_name="dishes")
+    op.drop_index(op.f("ix_dishes_menu_id"), table_name="dishes")
+    op.drop_index(op.f("ix_dish_categories_menu_id"), table_name="dish_categories")
+    op.drop_index(op.f("ix_menus_place_id"), table_name="menus")
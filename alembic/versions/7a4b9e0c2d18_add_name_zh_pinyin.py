@@ -0,0 +1,100 @@
+"""Add name_zh pinyin
+
+Revision ID: 7a4b9e0c2d18
+Revises: 3c5e1d2f9a47
+Create Date: 2026-10-19 13:40:52.671290
+
+"""
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+from opencc import OpenCC
+from pypinyin import Style, lazy_pinyin
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4b9e0c2d18"
+down_revision: Union[str, None] = "3c5e1d2f9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of the transliteration of app.utils.text at this revision, so that later changes
+# to the application do not change what this migration writes
+_NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-z0-9]+")
+
+_traditional_to_simplified = OpenCC("t2s")
+
+
+def _to_pinyin(value: str) -> tuple[str | None, str | None]:
+    normalized = _traditional_to_simplified.convert(unicodedata.normalize("NFKC", value)).casefold()
+    full = _NON_ALPHANUMERIC_PATTERN.sub("", "".join(lazy_pinyin(normalized)).casefold())
+    initials = _NON_ALPHANUMERIC_PATTERN.sub("", "".join(lazy_pinyin(normalized, style=Style.FIRST_LETTER)).casefold())
+    return full or None, initials or None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("places", sa.Column("name_zh_pinyin", sa.String(), nullable=True))
+    op.add_column("places", sa.Column("name_zh_pinyin_initials", sa.String(), nullable=True))
+
+    # Transliteration happens in the application, so backfill from Python
+    conn = op.get_bind()
+    places = sa.table(
+        "places",
+        sa.column("id", sa.UUID()),
+        sa.column("name_zh_pinyin", sa.String()),
+        sa.column("name_zh_pinyin_initials", sa.String()),
+    )
+    names = sa.table("places", sa.column("id", sa.UUID()), sa.column("name_zh", sa.String()))
+    last_id = None
+    while True:
+        # Paginated by ID rather than loaded at once, so that memory stays bounded
+        stmt = (
+            sa.select(names.c.id, names.c.name_zh)
+            .where(names.c.name_zh.isnot(None))
+            .order_by(names.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(names.c.id > last_id)
+        rows = conn.execute(stmt).all()
+        if not rows:
+            break
+
+        batch = []
+        for place_id, name_zh in rows:
+            pinyin, initials = _to_pinyin(name_zh)
+            batch.append({"place_id": place_id, "name_zh_pinyin": pinyin, "name_zh_pinyin_initials": initials})
+        conn.execute(places.update().where(places.c.id == sa.bindparam("place_id")), batch)
+        last_id = rows[-1].id
+
+    op.create_index(
+        "idx_places_name_zh_pinyin_trgm",
+        "places",
+        ["name_zh_pinyin"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name_zh_pinyin": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_places_name_zh_pinyin_initials_trgm",
+        "places",
+        ["name_zh_pinyin_initials"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name_zh_pinyin_initials": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_places_name_zh_pinyin_initials_trgm", table_name="places", postgresql_using="gin")
+    op.drop_index("idx_places_name_zh_pinyin_trgm", table_name="places", postgresql_using="gin")
+    op.drop_column("places", "name_zh_pinyin_initials")
+    op.drop_column("places", "name_zh_pinyin")
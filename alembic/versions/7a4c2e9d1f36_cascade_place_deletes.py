@@ -0,0 +1,103 @@
+"""Cascade place deletes
+
+Revision ID: 7a4c2e9d1f36
+Revises: 3f1a8d6b2c57
+Create Date: 2026-10-19 21:04:37.518264
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4c2e9d1f36"
+down_revision: Union[str, None] = "3f1a8d6b2c57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deleting a place or a tag deletes its tag assignments in the database, without loading them
+    op.drop_constraint("places_tags_place_id_fkey", "places_tags", type_="foreignkey")
+    op.drop_constraint("places_tags_tag_id_fkey", "places_tags", type_="foreignkey")
+    op.create_foreign_key(
+        "places_tags_place_id_fkey", "places_tags", "places", ["place_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_foreign_key("places_tags_tag_id_fkey", "places_tags", "tags", ["tag_id"], ["id"], ondelete="CASCADE")
+
+    # The primary key of places_tags leads with place_id, so only tag_id needs an index for the cascade
+    op.create_index(op.f("ix_places_tags_tag_id"), "places_tags", ["tag_id"], unique=False)
+    op.create_index(op.f("ix_tags_tag_type_id"), "tags", ["tag_type_id"], unique=False)
+
+    # Only lock the places that still exist, so that deleting many places with menus takes no lock
+    # when the menus deleted by the cascade trigger a refresh of their snapshots
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_snapshots(place_ids uuid[]) RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('menu_snapshots'), buckets.bucket)
+            FROM (
+                SELECT DISTINCT (hashtextextended(places.id::text, 0) & 1023)::int AS bucket
+                FROM places
+                WHERE places.id = ANY(place_ids)
+                ORDER BY 1
+            ) AS buckets;
+
+            INSERT INTO menu_snapshots (place_id, lang, document, etag, updated_at)
+            SELECT places.id,
+                   langs.lang,
+                   rendered.document,
+                   encode(sha256(convert_to(rendered.document, 'UTF8')), 'hex'),
+                   now()
+            FROM places
+            CROSS JOIN (VALUES ('en-US'), ('zh-CN')) AS langs(lang)
+            CROSS JOIN LATERAL (SELECT render_menu_document(places.id, langs.lang) AS document) AS rendered
+            WHERE places.id = ANY(place_ids)
+            ON CONFLICT (place_id, lang) DO UPDATE
+            SET document = EXCLUDED.document, etag = EXCLUDED.etag, updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_snapshots(place_ids uuid[]) RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('menu_snapshots'), buckets.bucket)
+            FROM (
+                SELECT DISTINCT (hashtextextended(ids.place_id::text, 0) & 1023)::int AS bucket
+                FROM unnest(place_ids) AS ids(place_id)
+                ORDER BY 1
+            ) AS buckets;
+
+            INSERT INTO menu_snapshots (place_id, lang, document, etag, updated_at)
+            SELECT places.id,
+                   langs.lang,
+                   rendered.document,
+                   encode(sha256(convert_to(rendered.document, 'UTF8')), 'hex'),
+                   now()
+            FROM places
+            CROSS JOIN (VALUES ('en-US'), ('zh-CN')) AS langs(lang)
+            CROSS JOIN LATERAL (SELECT render_menu_document(places.id, langs.lang) AS document) AS rendered
+            WHERE places.id = ANY(place_ids)
+            ON CONFLICT (place_id, lang) DO UPDATE
+            SET document = EXCLUDED.document, etag = EXCLUDED.etag, updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    op.drop_index(op.f("ix_tags_tag_type_id"), table_name="tags")
+    op.drop_index(op.f("ix_places_tags_tag_id"), table_name="places_tags")
+
+    op.drop_constraint("places_tags_tag_id_fkey", "places_tags", type_="foreignkey")
+    op.drop_constraint("places_tags_place_id_fkey", "places_tags", type_="foreignkey")
+    op.create_foreign_key("places_tags_place_id_fkey", "places_tags", "places", ["place_id"], ["id"])
+    op.create_foreign_key("places_tags_tag_id_fkey", "places_tags", "tags", ["tag_id"], ["id"])
@@ -0,0 +1,117 @@
+"""Add place opening minutes
+
+Revision ID: 9c2e5f7a1b84
+Revises: 0b6e3d9f5a21
+Create Date: 2026-10-19 19:35:12.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from timezonefinder import TimezoneFinder
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2e5f7a1b84"
+down_revision: Union[str, None] = "0b6e3d9f5a21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "places",
+        sa.Column("opening_minutes", postgresql.INT4MULTIRANGE(), server_default="{}", nullable=False),
+    )
+    op.add_column("places", sa.Column("timezone", sa.String(), server_default="UTC", nullable=False))
+
+    # Backfill the minute-of-week ranges from the opening hours, Monday 00:00 being minute 0
+    op.execute(
+        """
+        UPDATE places
+        SET opening_minutes = coalesce(
+            (
+                SELECT range_agg(
+                    int4range(
+                        ((hours->>'day')::int - 1) * 1440
+                            + (extract(epoch FROM (hours->>'open')::time) / 60)::int,
+                        ((hours->>'day')::int - 1) * 1440
+                            + (extract(epoch FROM (hours->>'close')::time) / 60)::int
+                    )
+                )
+                FROM json_array_elements(places.opening_hours) AS hours
+            ),
+            '{}'
+        )
+        WHERE json_array_length(opening_hours) > 0
+        """,
+    )
+
+    # Existing places are in the timezone of their location, UTC being kept only for places without a location
+    conn = op.get_bind()
+    places = sa.table(
+        "places",
+        sa.column("id", sa.UUID()),
+        sa.column("timezone", sa.String()),
+        sa.column("location_geom"),
+    )
+    timezone_finder = TimezoneFinder()
+    last_id = None
+    while True:
+        stmt = (
+            sa.select(
+                places.c.id,
+                sa.func.ST_Y(places.c.location_geom).label("latitude"),
+                sa.func.ST_X(places.c.location_geom).label("longitude"),
+            )
+            .where(places.c.location_geom.isnot(None))
+            .order_by(places.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(places.c.id > last_id)
+        rows = conn.execute(stmt).all()
+        if not rows:
+            break
+
+        batch = [
+            {"place_id": row.id, "timezone": timezone}
+            for row in rows
+            if (timezone := timezone_finder.timezone_at(lat=row.latitude, lng=row.longitude))
+        ]
+        if batch:
+            conn.execute(places.update().where(places.c.id == sa.bindparam("place_id")), batch)
+        last_id = rows[-1].id
+
+    # Places open at an instant are looked up for each distinct timezone, found by a loose scan of their index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_index(
+        "idx_places_opening_minutes",
+        "places",
+        ["opening_minutes"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "idx_places_timezone_opening_minutes",
+        "places",
+        ["timezone", "opening_minutes"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index("idx_places_timezone", "places", ["timezone"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_places_timezone", table_name="places")
+    op.drop_index("idx_places_timezone_opening_minutes", table_name="places", postgresql_using="gist")
+    op.drop_index("idx_places_opening_minutes", table_name="places", postgresql_using="gist")
+    op.drop_column("places", "timezone")
+    op.drop_column("places", "opening_minutes")
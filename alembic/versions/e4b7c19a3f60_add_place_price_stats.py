@@ -0,0 +1,176 @@
+"""Add place price stats
+
+Revision ID: e4b7c19a3f60
+Revises: 5d8f2a6c1e93
+Create Date: 2026-10-19 17:22:09.731854
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7c19a3f60"
+down_revision: Union[str, None] = "5d8f2a6c1e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("places", sa.Column("price_min", sa.Numeric(10, 2), nullable=True))
+    op.add_column("places", sa.Column("price_median", sa.Numeric(10, 2), nullable=True))
+    op.add_column("places", sa.Column("price_max", sa.Numeric(10, 2), nullable=True))
+    op.add_column("places", sa.Column("dish_count", sa.Integer(), server_default="0", nullable=False))
+
+    # Recompute the stats of the given places from the dishes of all their menus. Concurrent writers to the same
+    # place are serialized by an advisory lock taken before computing, so that the last stats written include the
+    # dishes committed by the others. As for menu snapshots, places share 1024 locks by the hash of their ID.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_place_price_stats(place_ids uuid[]) RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('place_price_stats'), buckets.bucket)
+            FROM (
+                SELECT DISTINCT (hashtextextended(ids.place_id::text, 0) & 1023)::int AS bucket
+                FROM unnest(place_ids) AS ids(place_id)
+                ORDER BY 1
+            ) AS buckets;
+
+            UPDATE places
+            SET price_min = stats.price_min,
+                price_median = stats.price_median,
+                price_max = stats.price_max,
+                dish_count = stats.dish_count
+            FROM (
+                SELECT ids.place_id,
+                       min(dishes.price) AS price_min,
+                       (percentile_cont(0.5) WITHIN GROUP (ORDER BY dishes.price))::numeric(10, 2) AS price_median,
+                       max(dishes.price) AS price_max,
+                       count(dishes.id) AS dish_count
+                FROM unnest(place_ids) AS ids(place_id)
+                LEFT JOIN menus ON menus.place_id = ids.place_id
+                LEFT JOIN dishes ON dishes.menu_id = menus.id
+                GROUP BY ids.place_id
+            ) AS stats
+            WHERE places.id = stats.place_id;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    # Statement-level triggers, so that a bulk write recomputes each affected place once.
+    # Transition tables cannot be shared between events, hence one trigger per event.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_dish_price_stats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM refresh_place_price_stats(ARRAY(
+                    SELECT DISTINCT menus.place_id FROM new_dishes JOIN menus ON menus.id = new_dishes.menu_id
+                ));
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_place_price_stats(ARRAY(
+                    SELECT DISTINCT menus.place_id
+                    FROM new_dishes
+                    JOIN old_dishes ON old_dishes.id = new_dishes.id
+                    JOIN menus ON menus.id IN (new_dishes.menu_id, old_dishes.menu_id)
+                    WHERE new_dishes.price IS DISTINCT FROM old_dishes.price
+                       OR new_dishes.menu_id IS DISTINCT FROM old_dishes.menu_id
+                ));
+            ELSE
+                PERFORM refresh_place_price_stats(ARRAY(
+                    SELECT DISTINCT menus.place_id FROM old_dishes JOIN menus ON menus.id = old_dishes.menu_id
+                ));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_dishes_price_stats_insert
+        AFTER INSERT ON dishes REFERENCING NEW TABLE AS new_dishes
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_dish_price_stats()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_dishes_price_stats_update
+        AFTER UPDATE ON dishes REFERENCING OLD TABLE AS old_dishes NEW TABLE AS new_dishes
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_dish_price_stats()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_dishes_price_stats_delete
+        AFTER DELETE ON dishes REFERENCING OLD TABLE AS old_dishes
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_dish_price_stats()
+        """
+    )
+
+    # Dishes deleted along with their menu can no longer be traced back to a place, so menus have triggers too
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_menu_price_stats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_place_price_stats(ARRAY(
+                    SELECT old_menus.place_id FROM old_menus
+                    UNION
+                    SELECT new_menus.place_id FROM new_menus
+                ));
+            ELSE
+                PERFORM refresh_place_price_stats(ARRAY(SELECT DISTINCT place_id FROM old_menus));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_menus_price_stats_update
+        AFTER UPDATE ON menus REFERENCING OLD TABLE AS old_menus NEW TABLE AS new_menus
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_menu_price_stats()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_menus_price_stats_delete
+        AFTER DELETE ON menus REFERENCING OLD TABLE AS old_menus
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_menu_price_stats()
+        """
+    )
+
+    op.execute("SELECT refresh_place_price_stats(ARRAY(SELECT DISTINCT place_id FROM menus))")
+
+    op.create_index(op.f("ix_places_price_min"), "places", ["price_min"], unique=False)
+    op.create_index(op.f("ix_places_price_median"), "places", ["price_median"], unique=False)
+    op.create_index(op.f("ix_places_price_max"), "places", ["price_max"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_places_price_max"), table_name="places")
+    op.drop_index(op.f("ix_places_price_median"), table_name="places")
+    op.drop_index(op.f("ix_places_price_min"), table_name="places")
+
+    op.execute("DROP TRIGGER IF EXISTS trg_menus_price_stats_delete ON menus")
+    op.execute("DROP TRIGGER IF EXISTS trg_menus_price_stats_update ON menus")
+    op.execute("DROP TRIGGER IF EXISTS trg_dishes_price_stats_delete ON dishes")
+    op.execute("DROP TRIGGER IF EXISTS trg_dishes_price_stats_update ON dishes")
+    op.execute("DROP TRIGGER IF EXISTS trg_dishes_price_stats_insert ON dishes")
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_menu_price_stats()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_dish_price_stats()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_place_price_stats(uuid[])")
+
+    op.drop_column("places", "dish_count")
+    op.drop_column("places", "price_max")
+    op.drop_column("places", "price_median")
+    op.drop_column("places", "price_min")
@@ -0,0 +1,94 @@
+"""Notify place changes
+
+Revision ID: f90c99b3f824
+Revises: a727fc17e462
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f90c99b3f824"
+down_revision: Union[str, None] = "a727fc17e462"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Send the ID of every place whose name, location or tags change on the place_changes channel
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_place_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('place_changes', OLD.id::text);
+            ELSE
+                PERFORM pg_notify('place_changes', NEW.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_place_tag_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('place_changes', OLD.place_id::text);
+            ELSE
+                PERFORM pg_notify('place_changes', NEW.place_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_tag_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('place_changes', place_id::text) FROM places_tags WHERE tag_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    op.execute(
+        """
+        CREATE TRIGGER trg_places_notify_change
+        AFTER INSERT OR UPDATE OF name, name_zh, location_geom OR DELETE ON places
+        FOR EACH ROW EXECUTE FUNCTION notify_place_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_places_tags_notify_change
+        AFTER INSERT OR DELETE ON places_tags
+        FOR EACH ROW EXECUTE FUNCTION notify_place_tag_change()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_tags_notify_change
+        AFTER UPDATE OF name ON tags
+        FOR EACH ROW EXECUTE FUNCTION notify_tag_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_tags_notify_change ON tags")
+    op.execute("DROP TRIGGER IF EXISTS trg_places_tags_notify_change ON places_tags")
+    op.execute("DROP TRIGGER IF EXISTS trg_places_notify_change ON places")
+
+    op.execute("DROP FUNCTION IF EXISTS notify_tag_change()")
+    op.execute("DROP FUNCTION IF EXISTS notify_place_tag_change()")
+    op.execute("DROP FUNCTION IF EXISTS notify_place_change()")
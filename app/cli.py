@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+import asyncpg
+
+from app.db.loader import LoadReport, load_places, read_csv, read_ndjson, with_progress
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = 10_000
+
+READERS: dict[str, Callable[[Iterable[str]], Iterator[tuple]]] = {
+    "ndjson": read_ndjson,
+    "jsonl": read_ndjson,
+    "csv": read_csv,
+}
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="weat-load",
+        description="Bulk load places, with their tags and menus, from NDJSON or CSV.",
+    )
+    parser.add_argument("path", help="The file to load, or - for standard input.")
+    parser.add_argument(
+        "--format",
+        choices=sorted(READERS),
+        help="The format of the input. Defaults to the extension of the file.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate the input and report rejected rows without writing anything.",
+    )
+    parser.add_argument(
+        "--progress-every",
+        type=int,
+        default=PROGRESS_EVERY,
+        help=f"The number of rows between progress messages. Defaults to {PROGRESS_EVERY}.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.format is None:
+        args.format = Path(args.path).suffix.removeprefix(".").lower()
+        if args.format not in READERS:
+            parser.error("the format cannot be guessed from the file name, use --format")
+
+    return args
+
+
+async def _load(source: TextIO, args: argparse.Namespace) -> LoadReport:
+    records = with_progress(READERS[args.format](source), args.progress_every)
+
+    connection = await asyncpg.connect(dsn=settings.db_dsn)
+    try:
+        return await load_places(connection, records, dry_run=args.dry_run)
+    finally:
+        await connection.close()
+
+
+def _log_report(report: LoadReport, *, dry_run: bool) -> None:
+    logger.info(
+        "%s %d rows in %.1f s (%.0f rows/s)",
+        "Validated" if dry_run else "Loaded",
+        report.rows,
+        report.seconds,
+        report.rows_per_second,
+    )
+    if not dry_run:
+        logger.info(
+            "Created %d places, updated %d places, replaced %d menus with %d dishes",
+            report.created,
+            report.updated,
+            report.menus,
+            report.dishes,
+        )
+    for rejected in report.rejected:
+        logger.warning("Rejected %d rows: %s (first on line %d)", rejected.count, rejected.error, rejected.first_line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the bulk loader.
+
+    Args:
+        argv (list[str] | None): The command line arguments. Defaults to the arguments of the process.
+
+    Returns:
+        int: The exit status.
+
+    """
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    if args.path == "-":
+        report = asyncio.run(_load(sys.stdin, args))
+    else:
+        with Path(args.path).open(encoding="utf-8", newline="") as source:
+            report = asyncio.run(_load(source, args))
+
+    _log_report(report, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
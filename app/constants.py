@@ -1,4 +1,4 @@
-from enum import StrEnum
+from enum import IntEnum, StrEnum
 
 from app.settings import settings
 
@@ -9,6 +9,71 @@ PLACE_SEARCH_SIMILARITY_THRESHOLD = (
     settings.place_search_similarity_threshold or PLACE_SEARCH_SIMILARITY_THRESHOLD_DEFAULT
 )
 
+# Maximum number of matching places counted when computing tag facets
+PLACE_FACET_CANDIDATE_LIMIT = 5000
+
+# Maximum number of dishes in an imported menu, which keeps each multi-row insert within the bind parameter limit
+MENU_IMPORT_MAX_DISHES = 2000
+
+# Setting deferring the menu snapshot triggers of a transaction, which then refreshes the snapshots it wrote once
+MENU_SNAPSHOTS_DEFER_SETTING = "weat.defer_menu_snapshots"
+
+# Maximum number of places in a bulk upsert, which keeps the multi-row insert within the bind parameter limit
+PLACE_BULK_UPSERT_MAX_PLACES = 1000
+# Number of places upserted by each statement of a bulk upsert, after each of which its progress is reported
+PLACE_BULK_UPSERT_CHUNK_SIZE = 200
+
+# Maximum number of place IDs in a bulk delete, which are sent as a single array parameter
+PLACE_BULK_DELETE_MAX_PLACES = 10000
+
+# Maximum number of places fetched by ID at once, which keeps the response small
+PLACE_BATCH_GET_MAX_PLACES = 500
+
+# Maximum number of places whose tags are changed at once, which keeps the transaction short
+PLACE_TAGS_BATCH_MAX_PLACES = 10000
+
+# Places at most this many metres apart, of the same type and with names at least this similar, are likely duplicates
+PLACE_DUPLICATE_MAX_DISTANCE = 50
+PLACE_DUPLICATE_SIMILARITY_THRESHOLD = 0.5
+
+# Timezone of places whose timezone is not known, in which their opening hours are interpreted
+DEFAULT_PLACE_TIMEZONE = "UTC"
+
+# Postgres NOTIFY channel carrying the IDs of places whose searchable data changed
+PLACE_CHANGES_CHANNEL = "place_changes"
+
+# Query parameters making a read a search, which is admitted after cheaper requests and costs more to rate limits
+SEARCH_QUERY_PARAMS = frozenset({"q", "dish_q", "facets", "include_dish"})
+
+# Seconds after which a request rejected because the database is saturated should be retried
+DB_ADMISSION_RETRY_AFTER = 1
+
+# SQLSTATE of a statement cancelled by Postgres, on statement timeout or by a cancel request
+PG_QUERY_CANCELED = "57014"
+
+# Tokens taken from the rate limit of a client by a request, by method and path, 1 for others, and by a search
+RATE_LIMIT_ROUTE_COSTS = {
+    ("GET", "/places/"): 2,
+    ("POST", "/places/batch-get"): 5,
+}
+RATE_LIMIT_SEARCH_COST = 5
+
+# Idle rate limit buckets are forgotten, being full, once there are more than this many or every this many requests
+RATE_LIMIT_MAX_BUCKETS = 100_000
+RATE_LIMIT_PRUNE_INTERVAL = 10_000
+
+# Seconds between heartbeats of a running job, after which a job without a heartbeat is considered abandoned
+JOB_HEARTBEAT_INTERVAL = 15
+JOB_STALE_AFTER = 120
+
+# Maximum number of times a job is started, an abandoned job being started again until then
+JOB_MAX_ATTEMPTS = 3
+
+# Connections of the pool used at once outside of requests, and so reserved from their admission: by each running
+# job, for itself, its heartbeats and its progress reports, and by the suggestion index, for refreshes and rebuilds
+DB_CONNECTIONS_PER_JOB = 3
+DB_SUGGESTION_CONNECTIONS = 2
+
 
 class Language(StrEnum):
     """Language enum.
@@ -20,6 +85,65 @@ class Language(StrEnum):
     ZH_CN = "zh-CN"
 
 
+class AdmissionPriority(IntEnum):
+    """AdmissionPriority enum.
+
+    This enum represents the order in which requests waiting for a database connection are admitted,
+    lowest first.
+    """
+
+    # Admin writes
+    HIGH = 0
+    # Lookups by ID and other cheap reads
+    NORMAL = 1
+    # Searches and other expensive reads
+    LOW = 2
+
+
+class JobKind(StrEnum):
+    """JobKind enum.
+
+    This enum represents the operations run in the background by the job runner.
+    """
+
+    PLACE_BULK_UPSERT = "place_bulk_upsert"
+    PLACE_BULK_DELETE = "place_bulk_delete"
+    PLACE_DUPLICATE_SEARCH = "place_duplicate_search"
+
+
+class JobStatus(StrEnum):
+    """JobStatus enum.
+
+    This enum represents the state of a background job.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class MenuImportMode(StrEnum):
+    """MenuImportMode enum.
+
+    This enum represents how an imported menu is combined with the existing menus of a place.
+    """
+
+    REPLACE = "replace"
+    MERGE = "merge"
+
+
+class PlaceUpsertStatus(StrEnum):
+    """PlaceUpsertStatus enum.
+
+    This enum represents the outcome of each place of a bulk upsert.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    FAILED = "failed"
+
+
 class PlaceType(StrEnum):
     """PlaceType enum.
 
@@ -27,3 +151,11 @@ class PlaceType(StrEnum):
     """
 
     FOOD = "food"
+
+
+# Weights applied to the trigram distance of each column when ranking place search results, per language.
+# A lower weight makes matches on that column count for more.
+PLACE_SEARCH_WEIGHTS = {
+    Language.EN_US: {"name": 1.0, "name_zh": 1.5, "name_zh_pinyin": 1.5, "address": 2.0},
+    Language.ZH_CN: {"name": 1.5, "name_zh": 1.0, "name_zh_pinyin": 1.0, "address": 2.0},
+}
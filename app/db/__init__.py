@@ -8,19 +8,38 @@ DeclarativeBase = declarative_base()
 
 engine = None
 async_session_maker = None
+rate_limit_session_maker = None
 
 
-def get_async_engine_and_session() -> tuple:
+def get_async_engine_and_session(
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: float = 30,
+) -> tuple:
     """Get the async engine and session maker.
 
     This function retrieves the database connection parameters from environment variables
     and creates an async engine and session maker for the database connection.
 
+    Args:
+        pool_size (int | None): The number of connections kept in the pool. Defaults to None, for the
+            database pool size setting.
+        max_overflow (int | None): The number of connections opened beyond the pool size when needed.
+            Defaults to None, for the database max overflow setting.
+        pool_timeout (float): Seconds to wait for a connection of the pool. Defaults to 30.
+
     Returns:
         tuple: A tuple containing the async engine and session maker.
 
     """
-    engine_ = create_async_engine(settings.db_url, echo=True, future=True)
+    engine_ = create_async_engine(
+        settings.db_url,
+        echo=True,
+        future=True,
+        pool_size=settings.db_pool_size if pool_size is None else pool_size,
+        max_overflow=settings.db_max_overflow if max_overflow is None else max_overflow,
+        pool_timeout=pool_timeout,
+    )
     session_maker_ = async_sessionmaker(bind=engine_, expire_on_commit=False)
     return engine_, session_maker_
 
@@ -29,10 +48,18 @@ def init_async_engine_and_session() -> None:
     """Initialize the async engine and session maker.
 
     This function creates the async engine and session maker for the database connection.
-    It should be called once at the start of the application.
+    It should be called once at the start of the application. The rate limits shared through the
+    database get a pool of their own, since every request takes from them before being admitted
+    to use the main pool.
     """
-    global engine, async_session_maker
+    global engine, async_session_maker, rate_limit_session_maker
     engine, async_session_maker = get_async_engine_and_session()
+    if settings.rate_limit_backend == "postgres":
+        _, rate_limit_session_maker = get_async_engine_and_session(
+            pool_size=settings.rate_limit_db_pool_size,
+            max_overflow=0,
+            pool_timeout=settings.rate_limit_db_pool_timeout,
+        )
 
 
 def get_async_session_maker() -> async_sessionmaker:
@@ -43,3 +70,13 @@ def get_async_session_maker() -> async_sessionmaker:
 
     """
     return async_session_maker
+
+
+def get_rate_limit_session_maker() -> async_sessionmaker:
+    """Get the async session maker of the pool dedicated to rate limits.
+
+    Returns:
+        async_sessionmaker: The async session maker, None unless rate limits are shared through the database.
+
+    """
+    return rate_limit_session_maker
@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.constants import (
+    DB_ADMISSION_RETRY_AFTER,
+    DB_CONNECTIONS_PER_JOB,
+    DB_SUGGESTION_CONNECTIONS,
+    AdmissionPriority,
+)
+from app.services.errors import ServiceUnavailableError
+from app.settings import settings
+from app.utils.metrics import Counter, Gauge
+
+ADMITTED = Counter(
+    "weat_db_admission_admitted_total",
+    "Requests admitted to use the database, by priority.",
+    labels=("priority",),
+)
+REJECTED = Counter(
+    "weat_db_admission_rejected_total",
+    "Requests rejected because the database was saturated, by priority and reason.",
+    labels=("priority", "reason"),
+)
+WAIT_SECONDS = Counter(
+    "weat_db_admission_wait_seconds_total",
+    "Seconds spent by requests waiting to be admitted to use the database.",
+)
+
+
+class AdmissionController:
+    """Admission controller bounding the requests using the database at once.
+
+    Without it, every request beyond the size of the connection pool waits for a connection until the pool
+    times out, slowing down every request before they fail. The controller admits at most capacity requests
+    at once, lets a bounded number of the others wait in a queue ordered by priority, then by arrival, and
+    rejects the rest straight away, as well as those waiting for longer than the queue timeout.
+    """
+
+    def __init__(self, capacity: int, queue_size: int, queue_timeout: float) -> None:
+        """Initialize the admission controller.
+
+        Args:
+            capacity (int): The number of requests admitted at once, matching the connection pool.
+            queue_size (int): The number of requests waiting to be admitted, beyond which they are rejected.
+            queue_timeout (float): Seconds a request waits to be admitted before being rejected.
+
+        """
+        self._capacity = capacity
+        self._queue_size = queue_size
+        self._queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: list[tuple[AdmissionPriority, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of requests admitted and not yet released.
+
+        Returns:
+            int: The number of requests.
+
+        """
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Get the number of requests waiting to be admitted.
+
+        Returns:
+            int: The number of requests.
+
+        """
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self, priority: AdmissionPriority = AdmissionPriority.NORMAL) -> AsyncIterator[None]:
+        """Wait to be admitted, and release the admission on exit.
+
+        Args:
+            priority (AdmissionPriority): The priority of the request. Defaults to NORMAL.
+
+        Yields:
+            None: Once admitted.
+
+        Raises:
+            ServiceUnavailableError: If the queue is full, or the request waited for longer than the queue timeout.
+
+        """
+        if self._in_flight < self._capacity and not self._waiters:
+            self._in_flight += 1
+        elif len(self._waiters) >= self._queue_size:
+            REJECTED.inc(priority=priority.name.lower(), reason="queue_full")
+            raise ServiceUnavailableError(retry_after=DB_ADMISSION_RETRY_AFTER)
+        elif not await self._wait(priority):
+            REJECTED.inc(priority=priority.name.lower(), reason="timeout")
+            raise ServiceUnavailableError(retry_after=DB_ADMISSION_RETRY_AFTER)
+        ADMITTED.inc(priority=priority.name.lower())
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _wait(self, priority: AdmissionPriority) -> bool:
+        loop = asyncio.get_running_loop()
+        waiter = (priority, next(self._arrivals), loop.create_future())
+        heapq.heappush(self._waiters, waiter)
+        started = loop.time()
+
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await waiter[2]
+        except (TimeoutError, asyncio.CancelledError):
+            if waiter[2].done() and not waiter[2].cancelled():
+                # Admitted just as the wait ended, so the admission is handed over to the next request
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            if asyncio.current_task().cancelling():
+                raise
+            return False
+        finally:
+            WAIT_SECONDS.inc(loop.time() - started)
+        return True
+
+    def _release(self) -> None:
+        # The admission is handed over to the first waiting request, if any, rather than released
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+
+def request_capacity(pool_size: int, max_overflow: int, job_concurrency: int) -> int:
+    """Get the number of requests admitted to use the database at once.
+
+    The background jobs and the suggestion index use the same pool without being admitted, so their
+    connections are reserved, lest admitted requests wait for a connection of the pool anyway.
+
+    Args:
+        pool_size (int): The number of connections kept in the pool.
+        max_overflow (int): The number of connections opened beyond the pool size when needed.
+        job_concurrency (int): The number of jobs run at once.
+
+    Returns:
+        int: The connections of the pool left to requests, at least 1.
+
+    """
+    reserved = job_concurrency * DB_CONNECTIONS_PER_JOB + DB_SUGGESTION_CONNECTIONS
+    return max(1, pool_size + max_overflow - reserved)
+
+
+admission_controller = AdmissionController(
+    capacity=request_capacity(settings.db_pool_size, settings.db_max_overflow, settings.job_concurrency),
+    queue_size=settings.db_admission_queue_size,
+    queue_timeout=settings.db_admission_queue_timeout,
+)
+
+Gauge(
+    "weat_db_admission_in_flight",
+    "Requests admitted to use the database and not yet finished.",
+    lambda: admission_controller.in_flight,
+)
+Gauge(
+    "weat_db_admission_queue_depth",
+    "Requests waiting to be admitted to use the database.",
+    lambda: admission_controller.queue_depth,
+)
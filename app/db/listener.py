@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 5.0
+
+
+class ChangeListener:
+    """Postgres LISTEN/NOTIFY listener.
+
+    This class keeps a dedicated connection listening on a notification channel. Payloads are
+    collected into batches and handed to a handler after a short debounce, so a burst of writes
+    results in a single refresh. When the connection is lost, the listener reconnects and calls
+    the reconnect handler, since notifications sent in the meantime are gone.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        handler: Callable[[set[str]], Awaitable[None]],
+        on_reconnect: Callable[[], Awaitable[None]] | None = None,
+        debounce: float = 0.2,
+    ) -> None:
+        """Initialize the change listener.
+
+        Args:
+            dsn (str): The database DSN to connect to.
+            channel (str): The notification channel to listen on.
+            handler (Callable[[set[str]], Awaitable[None]]): Called with each batch of payloads.
+            on_reconnect (Callable[[], Awaitable[None]] | None): Called after a lost connection is restored.
+            debounce (float): Seconds to wait for more notifications before handling a batch.
+
+        """
+        self._dsn = dsn
+        self._channel = channel
+        self._handler = handler
+        self._on_reconnect = on_reconnect
+        self._debounce = debounce
+        self._connection: asyncpg.Connection | None = None
+        self._pending: set[str] = set()
+        self._notified = asyncio.Event()
+        self._disconnected = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Connect and start listening."""
+        await self._connect()
+        self._tasks = [
+            asyncio.create_task(self._dispatch()),
+            asyncio.create_task(self._supervise()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _connect(self) -> None:
+        self._connection = await asyncpg.connect(dsn=self._dsn)
+        self._connection.add_termination_listener(self._on_termination)
+        await self._connection.add_listener(self._channel, self._on_notification)
+        self._disconnected.clear()
+
+    def _on_notification(
+        self,
+        _connection: asyncpg.Connection,
+        _pid: int,
+        _channel: str,
+        payload: str,
+    ) -> None:
+        self._pending.add(payload)
+        self._notified.set()
+
+    def _on_termination(self, _connection: asyncpg.Connection) -> None:
+        self._disconnected.set()
+
+    async def _dispatch(self) -> None:
+        while True:
+            await self._notified.wait()
+            await asyncio.sleep(self._debounce)
+
+            batch, self._pending = self._pending, set()
+            self._notified.clear()
+
+            try:
+                await self._handler(batch)
+            except Exception:
+                logger.exception("Failed to handle notifications on channel %s", self._channel)
+
+    async def _supervise(self) -> None:
+        while True:
+            await self._disconnected.wait()
+            logger.warning("Lost connection listening on channel %s, reconnecting", self._channel)
+
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Failed to reconnect to channel %s", self._channel)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                continue
+
+            if self._on_reconnect:
+                try:
+                    await self._on_reconnect()
+                except Exception:
+                    logger.exception("Failed to resynchronize after reconnecting to channel %s", self._channel)
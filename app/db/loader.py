@@ -0,0 +1,571 @@
+import csv
+import json
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import asyncpg
+from pydantic import BaseModel, Field
+
+from app.constants import DEFAULT_PLACE_TIMEZONE, PHONE_NUMBER_REGEX, PlaceType
+from app.utils.text import to_pinyin, zh_search_tokens
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "loader_places"
+STAGING_COLUMNS = (
+    "line",
+    "google_maps_place_id",
+    "name",
+    "name_zh",
+    "name_zh_tokens",
+    "name_zh_pinyin",
+    "name_zh_pinyin_initials",
+    "type",
+    "address",
+    "latitude",
+    "longitude",
+    "google_maps_url",
+    "phone_number",
+    "website_url",
+    "opening_hours",
+    "timezone",
+    "properties",
+    "tags",
+    "menu",
+    "error",
+)
+
+INVALID_JSON_ERROR = "invalid JSON"
+SUPERSEDED_ERROR = "superseded by a later line with the same google_maps_place_id"
+
+# Values are staged as text and only cast once validated, so that a bad row is reported instead of failing the COPY
+_CREATE_STAGING_TABLE = """
+    CREATE TEMPORARY TABLE loader_places (
+        line bigint NOT NULL,
+        google_maps_place_id text,
+        name text,
+        name_zh text,
+        name_zh_tokens text[] NOT NULL,
+        name_zh_pinyin text,
+        name_zh_pinyin_initials text,
+        type text,
+        address text,
+        latitude text,
+        longitude text,
+        google_maps_url text,
+        phone_number text,
+        website_url text,
+        opening_hours text,
+        timezone text,
+        properties text,
+        tags text,
+        menu text,
+        error text,
+        place_id uuid,
+        inserted boolean,
+        menu_id uuid
+    ) ON COMMIT DROP
+"""
+
+# Temporary tables are never analyzed by autovacuum
+_INDEX_STAGING_TABLE = (
+    "CREATE INDEX ON loader_places (google_maps_place_id)",
+    "CREATE INDEX ON loader_places (place_id)",
+    "ANALYZE loader_places",
+)
+
+_TIME_PATTERN = r"^([01]\d|2[0-3]):[0-5]\d$"
+
+# The branches of a CASE are evaluated in order, so each check may rely on the ones before it
+_VALIDATE = """
+    UPDATE loader_places
+    SET error = CASE
+        WHEN coalesce(name, '') = '' THEN 'missing name'
+        WHEN coalesce(google_maps_place_id, '') = '' THEN 'missing google_maps_place_id'
+        WHEN type IS NULL OR type <> ALL($1::text[]) THEN 'invalid type'
+        WHEN (latitude IS NULL) <> (longitude IS NULL)
+            OR NOT pg_input_is_valid(coalesce(latitude, '0'), 'float8')
+            OR NOT pg_input_is_valid(coalesce(longitude, '0'), 'float8') THEN 'invalid location'
+        WHEN latitude::float8 NOT BETWEEN -90 AND 90 OR longitude::float8 NOT BETWEEN -180 AND 180
+            THEN 'invalid location'
+        WHEN phone_number !~ $2 THEN 'invalid phone number'
+        WHEN timezone NOT IN (SELECT name FROM pg_timezone_names) THEN 'invalid timezone'
+        WHEN NOT pg_input_is_valid(coalesce(opening_hours, '[]'), 'jsonb')
+            OR NOT pg_input_is_valid(coalesce(properties, '{}'), 'jsonb')
+            OR NOT pg_input_is_valid(coalesce(tags, '[]'), 'jsonb')
+            OR NOT pg_input_is_valid(coalesce(menu, '{}'), 'jsonb') THEN $4
+        WHEN jsonb_typeof(coalesce(opening_hours, '[]')::jsonb) <> 'array' THEN 'invalid opening hours'
+        WHEN EXISTS (
+            SELECT FROM jsonb_array_elements(coalesce(opening_hours, '[]')::jsonb) AS hours
+            WHERE jsonb_typeof(hours) <> 'object'
+                OR coalesce(hours->>'day', '') NOT IN ('1', '2', '3', '4', '5', '6', '7')
+                OR coalesce(hours->>'open', '') !~ $3
+                OR coalesce(hours->>'close', '') !~ $3
+                OR hours->>'open' >= hours->>'close'
+        ) THEN 'invalid opening hours'
+        WHEN jsonb_typeof(coalesce(properties, '{}')::jsonb) <> 'object' THEN 'invalid properties'
+        WHEN jsonb_typeof(coalesce(tags, '[]')::jsonb) <> 'array' THEN 'invalid tags'
+        WHEN EXISTS (
+            SELECT FROM jsonb_array_elements_text(tags::jsonb) AS tag(name)
+            WHERE NOT EXISTS (SELECT FROM tags WHERE tags.name = tag.name)
+        ) THEN 'unknown tag'
+        WHEN jsonb_typeof(coalesce(menu, '{}')::jsonb) <> 'object'
+            OR jsonb_typeof(coalesce(menu::jsonb->'categories', '[]')) <> 'array'
+            OR jsonb_typeof(coalesce(menu::jsonb->'dishes', '[]')) <> 'array' THEN 'invalid menu'
+        WHEN EXISTS (
+            SELECT FROM jsonb_array_elements(coalesce(menu::jsonb->'categories', '[]')) AS category
+            WHERE jsonb_typeof(category) <> 'object'
+                OR coalesce(category->>'name', '') = ''
+                OR coalesce(category->>'name_zh', '') = ''
+                OR jsonb_typeof(coalesce(category->'dishes', '[]')) <> 'array'
+        ) THEN 'invalid dish category'
+        WHEN (
+            SELECT count(*) <> count(DISTINCT category->>'name')
+            FROM jsonb_array_elements(coalesce(menu::jsonb->'categories', '[]')) AS category
+        ) THEN 'duplicate dish category'
+        WHEN EXISTS (
+            SELECT FROM (
+                SELECT jsonb_array_elements(coalesce(menu::jsonb->'dishes', '[]'))
+                UNION ALL
+                SELECT jsonb_array_elements(coalesce(category->'dishes', '[]'))
+                FROM jsonb_array_elements(coalesce(menu::jsonb->'categories', '[]')) AS category
+            ) AS dishes(dish)
+            WHERE jsonb_typeof(dish) <> 'object'
+                OR coalesce(dish->>'name', '') = ''
+                OR coalesce(dish->>'name_zh', '') = ''
+                OR jsonb_typeof(coalesce(dish->'properties', '{}')) <> 'object'
+                OR CASE
+                    WHEN jsonb_typeof(dish->'price') = 'number'
+                        AND pg_input_is_valid(dish->>'price', 'numeric(10, 2)')
+                        THEN (dish->>'price')::numeric < 0
+                    ELSE true
+                END
+        ) THEN 'invalid dish'
+    END
+    WHERE error IS NULL
+"""
+
+# Only the last line for each place is merged
+_SUPERSEDE = """
+    UPDATE loader_places AS staged
+    SET error = $1
+    FROM (
+        SELECT google_maps_place_id, max(line) AS line
+        FROM loader_places
+        WHERE error IS NULL
+        GROUP BY google_maps_place_id
+        HAVING count(*) > 1
+    ) AS latest
+    WHERE staged.error IS NULL
+        AND staged.google_maps_place_id = latest.google_maps_place_id
+        AND staged.line < latest.line
+"""
+
+_REJECTED = """
+    SELECT error, count(*) AS count, min(line) AS first_line
+    FROM loader_places
+    WHERE error IS NOT NULL
+    GROUP BY error
+    ORDER BY count(*) DESC, error
+"""
+
+_MERGE_PLACES = """
+    WITH upserted AS (
+        INSERT INTO places (
+            name, name_zh, name_zh_tokens, name_zh_pinyin, name_zh_pinyin_initials, type, address, location_geom,
+            google_maps_url, google_maps_place_id, phone_number, website_url, opening_hours, opening_minutes,
+            timezone, properties
+        )
+        SELECT
+            name,
+            name_zh,
+            name_zh_tokens,
+            name_zh_pinyin,
+            name_zh_pinyin_initials,
+            type,
+            address,
+            CASE
+                WHEN latitude IS NOT NULL THEN ST_SetSRID(ST_MakePoint(longitude::float8, latitude::float8), 4326)
+            END,
+            google_maps_url,
+            google_maps_place_id,
+            phone_number,
+            website_url,
+            coalesce(opening_hours, '[]')::jsonb,
+            coalesce(
+                (
+                    SELECT range_agg(
+                        int4range(
+                            ((hours->>'day')::int - 1) * 1440 + (extract(epoch FROM (hours->>'open')::time) / 60)::int,
+                            ((hours->>'day')::int - 1) * 1440 + (extract(epoch FROM (hours->>'close')::time) / 60)::int
+                        )
+                    )
+                    FROM jsonb_array_elements(coalesce(opening_hours, '[]')::jsonb) AS hours
+                ),
+                '{}'
+            ),
+            coalesce(timezone, $1),
+            coalesce(properties, '{}')::jsonb
+        FROM loader_places
+        WHERE error IS NULL
+        ON CONFLICT (google_maps_place_id) DO UPDATE
+        SET name = excluded.name,
+            name_zh = excluded.name_zh,
+            name_zh_tokens = excluded.name_zh_tokens,
+            name_zh_pinyin = excluded.name_zh_pinyin,
+            name_zh_pinyin_initials = excluded.name_zh_pinyin_initials,
+            type = excluded.type,
+            address = excluded.address,
+            location_geom = excluded.location_geom,
+            google_maps_url = excluded.google_maps_url,
+            phone_number = excluded.phone_number,
+            website_url = excluded.website_url,
+            opening_hours = excluded.opening_hours,
+            opening_minutes = excluded.opening_minutes,
+            timezone = excluded.timezone,
+            properties = excluded.properties,
+            updated_at = now()
+        -- xmax is only zero for rows inserted by this transaction
+        RETURNING id, google_maps_place_id, xmax = 0 AS inserted
+    )
+    UPDATE loader_places AS staged
+    SET place_id = upserted.id, inserted = upserted.inserted
+    FROM upserted
+    WHERE staged.error IS NULL AND staged.google_maps_place_id = upserted.google_maps_place_id
+"""
+
+# Tags are only replaced for the places given a tags list, and a name matches every tag with that name
+_MERGE_TAGS = (
+    """
+    DELETE FROM places_tags
+    USING loader_places AS staged
+    WHERE staged.place_id IS NOT NULL AND staged.tags IS NOT NULL AND places_tags.place_id = staged.place_id
+    """,
+    """
+    INSERT INTO places_tags (place_id, tag_id)
+    SELECT DISTINCT staged.place_id, tags.id
+    FROM loader_places AS staged
+    CROSS JOIN LATERAL jsonb_array_elements_text(staged.tags::jsonb) AS tag(name)
+    JOIN tags ON tags.name = tag.name
+    WHERE staged.place_id IS NOT NULL
+    """,
+)
+
+# Menus are only replaced for the places given a menu, along with their categories and dishes
+_MERGE_MENUS = (
+    """
+    DELETE FROM menus
+    USING loader_places AS staged
+    WHERE staged.place_id IS NOT NULL AND staged.menu IS NOT NULL AND menus.place_id = staged.place_id
+    """,
+    """
+    WITH inserted AS (
+        INSERT INTO menus (place_id)
+        SELECT place_id FROM loader_places WHERE place_id IS NOT NULL AND menu IS NOT NULL
+        RETURNING id, place_id
+    )
+    UPDATE loader_places AS staged
+    SET menu_id = inserted.id
+    FROM inserted
+    WHERE staged.place_id = inserted.place_id
+    """,
+    """
+    INSERT INTO dish_categories (menu_id, name, name_zh)
+    SELECT staged.menu_id, category->>'name', category->>'name_zh'
+    FROM loader_places AS staged
+    CROSS JOIN LATERAL jsonb_array_elements(coalesce(staged.menu::jsonb->'categories', '[]')) AS category
+    WHERE staged.menu_id IS NOT NULL
+    """,
+)
+
+# The menu snapshot triggers are deferred while menus are merged, and the snapshots rendered once afterwards
+_DEFER_MENU_SNAPSHOTS = "SELECT set_config('weat.defer_menu_snapshots', $1, true)"
+
+_REFRESH_MENU_SNAPSHOTS = """
+    SELECT refresh_menu_snapshots(ARRAY(SELECT place_id FROM loader_places WHERE menu_id IS NOT NULL))
+"""
+
+_MERGE_DISHES = """
+    INSERT INTO dishes (menu_id, category_id, name, name_zh, price, properties)
+    SELECT staged.menu_id, NULL::uuid, dish->>'name', dish->>'name_zh', (dish->>'price')::numeric,
+        coalesce(dish->'properties', '{}')::json
+    FROM loader_places AS staged
+    CROSS JOIN LATERAL jsonb_array_elements(coalesce(staged.menu::jsonb->'dishes', '[]')) AS dish
+    WHERE staged.menu_id IS NOT NULL
+    UNION ALL
+    SELECT staged.menu_id, dish_categories.id, dish->>'name', dish->>'name_zh', (dish->>'price')::numeric,
+        coalesce(dish->'properties', '{}')::json
+    FROM loader_places AS staged
+    CROSS JOIN LATERAL jsonb_array_elements(coalesce(staged.menu::jsonb->'categories', '[]')) AS category
+    JOIN dish_categories ON dish_categories.menu_id = staged.menu_id AND dish_categories.name = category->>'name'
+    CROSS JOIN LATERAL jsonb_array_elements(coalesce(category->'dishes', '[]')) AS dish
+    WHERE staged.menu_id IS NOT NULL
+"""
+
+_MERGED = """
+    SELECT
+        count(*) FILTER (WHERE inserted) AS created,
+        count(*) FILTER (WHERE NOT inserted) AS updated,
+        count(menu_id) AS menus
+    FROM loader_places
+    WHERE place_id IS NOT NULL
+"""
+
+
+class RejectedRows(BaseModel):
+    """Rejected rows schema.
+
+    This schema is used to report the input rows of a load rejected for the same reason.
+    """
+
+    error: str
+    count: int
+    first_line: int
+
+
+class LoadReport(BaseModel):
+    """Load report schema.
+
+    This schema is used to report the outcome of a bulk load.
+    """
+
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    menus: int = 0
+    dishes: int = 0
+    rejected: list[RejectedRows] = Field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Get the throughput of the load.
+
+        Returns:
+            float: The number of input rows loaded per second.
+
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _is_blank(value: Any) -> bool:  # noqa: ANN401
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _text(value: Any) -> str | None:  # noqa: ANN401
+    if _is_blank(value):
+        return None
+    return str(value)
+
+
+def _json(value: Any) -> str | None:  # noqa: ANN401
+    if _is_blank(value):
+        return None
+    # CSV cells already hold JSON text, which is validated along with the rest
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _place_type(value: Any) -> str | None:  # noqa: ANN401
+    try:
+        # Place types are stored by name
+        return PlaceType(value).name
+    except ValueError:
+        return _text(value)
+
+
+def staging_record(line: int, data: dict[str, Any]) -> tuple:
+    """Convert an input place into a staging table record.
+
+    The search columns are derived here, as they are by the Place model, since they need Python libraries.
+    Everything else is validated in the database.
+
+    Args:
+        line (int): The line number of the place in the input.
+        data (dict[str, Any]): The place, with the fields of PlaceCreate, its latitude and longitude, the
+            names of its tags and its menu, with the fields of MenuImport.
+
+    Returns:
+        tuple: The record, with values in the order of STAGING_COLUMNS.
+
+    """
+    name_zh = _text(data.get("name_zh"))
+    name_zh_pinyin, name_zh_pinyin_initials = to_pinyin(name_zh)
+    location = data.get("location") if isinstance(data.get("location"), dict) else {}
+
+    return (
+        line,
+        _text(data.get("google_maps_place_id")),
+        _text(data.get("name")),
+        name_zh,
+        zh_search_tokens(name_zh),
+        name_zh_pinyin,
+        name_zh_pinyin_initials,
+        _place_type(data.get("type")),
+        _text(data.get("address")),
+        _text(data.get("latitude", location.get("latitude"))),
+        _text(data.get("longitude", location.get("longitude"))),
+        _text(data.get("google_maps_url")),
+        _text(data.get("phone_number")),
+        _text(data.get("website_url")),
+        _json(data.get("opening_hours")),
+        _text(data.get("timezone")),
+        _json(data.get("properties")),
+        _json(data.get("tags")),
+        _json(data.get("menu")),
+        None,
+    )
+
+
+def _rejected_record(line: int, error: str) -> tuple:
+    return (line, *[None] * 3, [], *[None] * 14, error)
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[tuple]:
+    """Read places from newline-delimited JSON, one place object per line.
+
+    Args:
+        lines (Iterable[str]): The lines of the input.
+
+    Yields:
+        tuple: The staging table record of each place.
+
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            data = None
+
+        if isinstance(data, dict):
+            yield staging_record(line_number, data)
+        else:
+            yield _rejected_record(line_number, INVALID_JSON_ERROR)
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[tuple]:
+    """Read places from CSV with a header row.
+
+    Columns are named after the fields of NDJSON places. The opening_hours and properties cells hold
+    JSON, and the tags cell holds tag names separated by semicolons. Menus cannot be given in CSV.
+
+    Args:
+        lines (Iterable[str]): The lines of the input.
+
+    Yields:
+        tuple: The staging table record of each place.
+
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        data: dict[str, Any] = dict(row)
+        data.pop("menu", None)
+        if "tags" in data:
+            data["tags"] = [name.strip() for name in (data["tags"] or "").split(";") if name.strip()]
+        yield staging_record(reader.line_num, data)
+
+
+def with_progress(records: Iterable[tuple], every: int) -> Iterator[tuple]:
+    """Log the progress of a stream of records.
+
+    Args:
+        records (Iterable[tuple]): The records.
+        every (int): The number of records between progress messages.
+
+    Yields:
+        tuple: The records, unchanged.
+
+    """
+    started = time.perf_counter()
+    count = 0
+    for count, record in enumerate(records, start=1):
+        yield record
+        if count % every == 0:
+            logger.info("Staged %d rows (%.0f rows/s)", count, count / (time.perf_counter() - started))
+
+
+def _row_count(status: str) -> int:
+    # Command tags end with the number of affected rows, such as INSERT 0 42
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def load_places(
+    connection: asyncpg.Connection,
+    records: Iterable[tuple],
+    *,
+    dry_run: bool = False,
+) -> LoadReport:
+    """Load places, with their tags and menus, in one transaction.
+
+    The records are streamed into a temporary staging table with COPY, validated with set-based
+    statements, and merged into places, places_tags, menus, dish_categories and dishes with one
+    statement each, whatever the number of records. The menu snapshots of the merged places are rendered
+    once, after the menus, categories and dishes are merged, rather than by the triggers of each of these
+    statements. Places are matched by their Google Maps Place ID. Invalid records are rejected and reported,
+    without failing the load.
+
+    Args:
+        connection (asyncpg.Connection): The database connection.
+        records (Iterable[tuple]): The staging table records, as read by read_ndjson or read_csv.
+        dry_run (bool): Whether to only validate the records, rolling the transaction back. Defaults to False.
+
+    Returns:
+        LoadReport: The outcome of the load.
+
+    """
+    started = time.perf_counter()
+    report = LoadReport()
+
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        await connection.execute(_CREATE_STAGING_TABLE)
+        report.rows = _row_count(
+            await connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS),
+        )
+        logger.info("Staged %d rows, validating", report.rows)
+        for statement in _INDEX_STAGING_TABLE:
+            await connection.execute(statement)
+
+        await connection.execute(
+            _VALIDATE,
+            [place_type.name for place_type in PlaceType],
+            PHONE_NUMBER_REGEX,
+            _TIME_PATTERN,
+            INVALID_JSON_ERROR,
+        )
+        await connection.execute(_SUPERSEDE, SUPERSEDED_ERROR)
+        report.rejected = [RejectedRows(**row) for row in await connection.fetch(_REJECTED)]
+
+        if not dry_run:
+            logger.info("Merging places")
+            await connection.execute(_MERGE_PLACES, DEFAULT_PLACE_TIMEZONE)
+            for statement in _MERGE_TAGS:
+                await connection.execute(statement)
+            await connection.execute(_DEFER_MENU_SNAPSHOTS, "on")
+            for statement in _MERGE_MENUS:
+                await connection.execute(statement)
+            report.dishes = _row_count(await connection.execute(_MERGE_DISHES))
+            await connection.execute(_DEFER_MENU_SNAPSHOTS, "off")
+            logger.info("Rendering menu snapshots")
+            await connection.execute(_REFRESH_MENU_SNAPSHOTS)
+
+            merged = await connection.fetchrow(_MERGED)
+            report.created, report.updated, report.menus = merged["created"], merged["updated"], merged["menus"]
+    except BaseException:
+        await transaction.rollback()
+        raise
+
+    if dry_run:
+        await transaction.rollback()
+    else:
+        await transaction.commit()
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,97 @@
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.constants import RATE_LIMIT_PRUNE_INTERVAL
+from app.db.uow import DBUnitOfWork
+from app.models.rate_limit import rate_limit_buckets
+from app.utils.rate_limit import MemoryRateLimitBackend, RateLimit, rate_limit
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresRateLimitBackend:
+    """Token buckets shared by every process through the database.
+
+    Tokens are taken from a bucket with a single upsert, which refills the bucket from the time it was last
+    updated, so that concurrent requests of a client from any process take from the same bucket. Every
+    request takes from its bucket before being admitted to use the database, so the buckets are given a
+    small pool of their own, which the requests never wait for long. When the database cannot be reached,
+    or the pool is busy, each process falls back to its own in-memory buckets rather than rejecting or
+    blocking requests.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        session_maker: Callable[[], async_sessionmaker],
+    ) -> None:
+        """Initialize the Postgres backend.
+
+        Args:
+            capacity (int): The number of tokens of a full bucket, which is the burst allowed to a client.
+            refill_rate (float): The number of tokens added to a bucket per second.
+            session_maker (Callable[[], async_sessionmaker]): Returns the session maker of the pool dedicated to
+                rate limits, once initialized.
+
+        """
+        self.capacity = capacity
+        self._refill_rate = refill_rate
+        self._session_maker = session_maker
+        self._fallback = MemoryRateLimitBackend(capacity, refill_rate)
+        self._takes = 0
+
+    async def take(self, key: str, cost: int) -> RateLimit:
+        """Take tokens from the bucket of a client, if it holds enough.
+
+        Args:
+            key (str): The key of the client.
+            cost (int): The number of tokens taken by the request.
+
+        Returns:
+            RateLimit: Whether the request is allowed, and the state of the bucket.
+
+        """
+        elapsed = func.extract("epoch", func.now() - rate_limit_buckets.c.updated_at)
+        refilled = func.least(self.capacity, rate_limit_buckets.c.tokens + elapsed * self._refill_rate)
+        stmt = postgresql.insert(rate_limit_buckets).values(
+            key=key,
+            tokens=self.capacity - cost if cost <= self.capacity else self.capacity,
+            allowed=cost <= self.capacity,
+            updated_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rate_limit_buckets.c.key],
+            set_={
+                "tokens": case((refilled >= cost, refilled - cost), else_=refilled),
+                "allowed": refilled >= cost,
+                "updated_at": func.now(),
+            },
+        ).returning(rate_limit_buckets.c.tokens, rate_limit_buckets.c.allowed)
+
+        self._takes += 1
+        try:
+            async with DBUnitOfWork(self._session_maker()) as db:
+                tokens, allowed = (await db.execute(stmt)).one()
+                if self._takes % RATE_LIMIT_PRUNE_INTERVAL == 0:
+                    await self._prune(db)
+                await db.commit()
+        except (OSError, SQLAlchemyError):
+            logger.exception("Failed to take from the rate limit of %s, falling back to this process", key)
+            return await self._fallback.take(key, cost)
+
+        return rate_limit(tokens, cost, self.capacity, self._refill_rate, allowed=allowed)
+
+    async def _prune(self, db: DBUnitOfWork) -> None:
+        # Buckets idle long enough to be full again are the same as no bucket
+        elapsed = func.extract("epoch", func.now() - rate_limit_buckets.c.updated_at)
+        await db.execute(
+            delete(rate_limit_buckets).where(
+                rate_limit_buckets.c.tokens + elapsed * self._refill_rate >= self.capacity,
+            ),
+        )
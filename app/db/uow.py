@@ -1,33 +1,69 @@
-from collections.abc import Callable
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from types import TracebackType
 from typing import TypeVar
 from uuid import UUID
 
-from sqlalchemy import Executable, func, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Connection, Executable, Row, event, func, select
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.constants import PG_QUERY_CANCELED
+from app.services.errors import DeadlineExceededError
 
 T = TypeVar("T")
 
 
+def is_deadline_exceeded(error: BaseException) -> bool:
+    """Check whether an error is a deadline exceeded, or a statement cancelled by its statement timeout.
+
+    Args:
+        error (BaseException): The error.
+
+    Returns:
+        bool: Whether the error is caused by the deadline of the request.
+
+    """
+    if isinstance(error, DBAPIError):
+        return getattr(error.orig, "sqlstate", None) == PG_QUERY_CANCELED
+    return isinstance(error, DeadlineExceededError)
+
+
 class DBUnitOfWork:
     """Database unit of work class.
 
     This class provides a context manager for managing database sessions and transactions.
     It allows for executing queries, adding instances, committing transactions, and handling
-    rollbacks in case of errors.
+    rollbacks in case of errors. When given an admission, it is entered before the database is
+    first used, and exited with the unit of work. When given a deadline, each transaction gets a
+    statement timeout of the time left, so that Postgres cancels the statements running past it.
     """
 
-    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        admission: Callable[[], AbstractAsyncContextManager] | None = None,
+        deadline: float | None = None,
+    ) -> None:
         """Initialize the database unit of work.
 
         Args:
             session_factory (Callable[[], AsyncSession]): A callable that returns an AsyncSession.
+            admission (Callable[[], AbstractAsyncContextManager] | None): Returns the context to enter
+                before the database is first used. Defaults to None.
+            deadline (float | None): The time.monotonic() time by which the database must no longer be used.
+                Defaults to None, for no deadline.
 
         """
         self._session_factory = session_factory
         self._session: AsyncSession | None = None
         self._committed = False
+        self._admission = admission
+        self._exit_stack = AsyncExitStack()
+        self._deadline = deadline
 
     async def __aenter__(self) -> "DBUnitOfWork":
         """Enter the database unit of work context manager.
@@ -37,6 +73,8 @@ class DBUnitOfWork:
 
         """
         self._session = self._session_factory()
+        if self._deadline is not None:
+            event.listen(self._session.sync_session, "after_begin", self._set_statement_timeout)
         return self
 
     async def __aexit__(
@@ -60,7 +98,27 @@ class DBUnitOfWork:
             if exc_type or not self._committed:
                 await self._session.rollback()
         finally:
-            await self._session.close()
+            try:
+                await self._session.close()
+            finally:
+                await self._exit_stack.aclose()
+
+    async def _admit(self, *, check_deadline: bool = True) -> None:
+        if self._admission:
+            await self._exit_stack.enter_async_context(self._admission())
+            self._admission = None
+        if check_deadline and self._deadline is not None and time.monotonic() >= self._deadline:
+            raise DeadlineExceededError
+
+    def _set_statement_timeout(
+        self,
+        _session: Session,
+        _transaction: SessionTransaction,
+        connection: Connection,
+    ) -> None:
+        # A timeout of 0 disables it, so a deadline about to pass leaves the smallest timeout instead
+        timeout = max(1, int((self._deadline - time.monotonic()) * 1000))
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
 
     async def execute(self, stmt: Executable) -> None:
         """Execute a SQL statement.
@@ -69,20 +127,44 @@ class DBUnitOfWork:
             stmt (Executable): The SQL statement to execute
 
         """
+        await self._admit()
         return await self._session.execute(stmt)
 
-    async def get(self, model: type[T], model_id: UUID) -> T | None:
+    async def stream(self, stmt: Executable, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """Stream the rows of a SQL statement with a server-side cursor.
+
+        Args:
+            stmt (Executable): The SQL statement to execute.
+            batch_size (int): The number of rows fetched at a time. Defaults to 1000.
+
+        Yields:
+            Row: The rows of the result.
+
+        """
+        await self._admit()
+        result = await self._session.stream(stmt.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
+
+    async def get(
+        self,
+        model: type[T],
+        model_id: UUID,
+        options: Sequence[ExecutableOption] | None = None,
+    ) -> T | None:
         """Get an instance from the database.
 
         Args:
             model (Type[T]): The model to get.
             model_id (UUID): The ID of the instance to get.
+            options (Sequence[ExecutableOption] | None): Loader options to apply. Defaults to None.
 
         Returns:
             T | None: The instance if found, otherwise None.
 
         """
-        return await self._session.get(model, model_id)
+        await self._admit()
+        return await self._session.get(model, model_id, options=options)
 
     async def get_all(self, stmt: Executable) -> list[T]:
         """Get all instances from the database.
@@ -94,6 +176,7 @@ class DBUnitOfWork:
             list[T]: The list of instances.
 
         """
+        await self._admit()
         results = await self._session.execute(stmt)
         return results.scalars().all()
 
@@ -107,6 +190,7 @@ class DBUnitOfWork:
             int: The count of instances.
 
         """
+        await self._admit()
         count_stmt = select(func.count()).select_from(stmt.subquery())
         count_result = await self._session.execute(count_stmt)
         return count_result.scalar()
@@ -130,6 +214,8 @@ class DBUnitOfWork:
             SQLAlchemyError: If an error occurs during the commit.
 
         """
+        # Committing work already done is cheaper than throwing it away once the deadline passed
+        await self._admit(check_deadline=False)
         try:
             await self._session.commit()
             self._committed = True
@@ -142,6 +228,7 @@ class DBUnitOfWork:
 
         This method flushes the current session, sending any pending changes to the database.
         """
+        await self._admit()
         await self._session.flush()
 
     async def refresh(self, instance: T) -> None:
@@ -151,6 +238,7 @@ class DBUnitOfWork:
             instance (T): The instance to refresh.
 
         """
+        await self._admit()
         await self._session.refresh(instance)
 
     async def delete(self, instance: T) -> None:
@@ -160,4 +248,5 @@ class DBUnitOfWork:
             instance (T): The instance to delete.
 
         """
+        await self._admit()
         await self._session.delete(instance)
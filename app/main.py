@@ -4,19 +4,32 @@ from http import HTTPStatus
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
-from app.db import init_async_engine_and_session
+from app.constants import DB_ADMISSION_RETRY_AFTER, PLACE_CHANGES_CHANNEL
+from app.db import get_async_session_maker, get_rate_limit_session_maker, init_async_engine_and_session
+from app.db.listener import ChangeListener
+from app.db.rate_limit import PostgresRateLimitBackend
+from app.db.uow import is_deadline_exceeded
 from app.routes.admin import router as admin_router
+from app.routes.dishes import router as dishes_router
+from app.routes.menus import router as menus_router
 from app.routes.places import router as places_router
 from app.routes.tag_types import router as tag_types_router
 from app.routes.tags import router as tags_router
-from app.services.errors import CustomError
+from app.services.errors import CustomError, DeadlineExceededError, ServiceUnavailableError
+from app.services.jobs import JobRunner
+from app.services.suggestions import build_suggestion_index, refresh_place_suggestions
 from app.settings import settings
+from app.utils.disconnect import CancelOnDisconnectMiddleware
+from app.utils.rate_limit import MemoryRateLimitBackend, RateLimitMiddleware
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:  # noqa: RUF029
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     """Lifespan context manager for FastAPI application.
 
     Args:
@@ -28,8 +41,28 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:  # noqa: RUF029
     """
     init_async_engine_and_session()
 
+    # Listen before building, so that no change made during the build is missed
+    place_changes_listener = ChangeListener(
+        settings.db_dsn,
+        PLACE_CHANGES_CHANNEL,
+        handler=refresh_place_suggestions,
+        on_reconnect=build_suggestion_index,
+    )
+    await place_changes_listener.start()
+    await build_suggestion_index()
+
+    job_runner = JobRunner(
+        get_async_session_maker(),
+        concurrency=settings.job_concurrency,
+        poll_interval=settings.job_poll_interval,
+    )
+    await job_runner.start()
+
     yield
 
+    await job_runner.stop()
+    await place_changes_listener.stop()
+
 
 is_prod = settings.app_env == "prod"
 
@@ -45,6 +78,8 @@ app = FastAPI(
 )
 app.include_router(admin_router)
 app.include_router(places_router)
+app.include_router(menus_router)
+app.include_router(dishes_router)
 app.include_router(tags_router)
 app.include_router(tag_types_router)
 
@@ -67,6 +102,91 @@ def handle_custom_error(_request: Request, exc: CustomError) -> None:
     )
 
 
+@app.exception_handler(ServiceUnavailableError)
+def handle_service_unavailable_error(_request: Request, exc: ServiceUnavailableError) -> JSONResponse:
+    """Handle requests shed because the service is overloaded.
+
+    Args:
+        _request (Request): The request object.
+        exc (ServiceUnavailableError): The exception to handle.
+
+    Returns:
+        JSONResponse: A 503 response with the error message, telling the client when to retry.
+
+    """
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={"detail": exc.message},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+def handle_pool_timeout_error(_request: Request, _exc: PoolTimeoutError) -> JSONResponse:
+    """Handle requests that timed out waiting for a database connection.
+
+    Args:
+        _request (Request): The request object.
+        _exc (PoolTimeoutError): The exception to handle.
+
+    Returns:
+        JSONResponse: A 503 response, telling the client when to retry.
+
+    """
+    return handle_service_unavailable_error(_request, ServiceUnavailableError(retry_after=DB_ADMISSION_RETRY_AFTER))
+
+
+@app.exception_handler(DeadlineExceededError)
+def handle_deadline_exceeded_error(_request: Request, exc: DeadlineExceededError) -> JSONResponse:
+    """Handle requests that ran out of time.
+
+    Args:
+        _request (Request): The request object.
+        exc (DeadlineExceededError): The exception to handle.
+
+    Returns:
+        JSONResponse: A 504 response with the error message.
+
+    """
+    return JSONResponse(status_code=HTTPStatus.GATEWAY_TIMEOUT, content={"detail": exc.message})
+
+
+@app.exception_handler(DBAPIError)
+def handle_dbapi_error(_request: Request, exc: DBAPIError) -> JSONResponse:
+    """Handle statements cancelled by Postgres once the statement timeout of the request passed.
+
+    Other database errors are raised again, to be handled as internal server errors.
+
+    Args:
+        _request (Request): The request object.
+        exc (DBAPIError): The exception to handle.
+
+    Returns:
+        JSONResponse: A 504 response, as for a request deadline exceeded.
+
+    """
+    if not is_deadline_exceeded(exc):
+        raise exc
+    return handle_deadline_exceeded_error(_request, DeadlineExceededError())
+
+
+# Added first, so that it runs last, right around the routes, and cancels them when their client disconnects
+app.add_middleware(CancelOnDisconnectMiddleware)
+
+# Added before the proxy headers middleware, so that it runs after it and sees the address of the client
+app.add_middleware(
+    RateLimitMiddleware,
+    backend=(
+        PostgresRateLimitBackend(
+            settings.rate_limit_capacity,
+            settings.rate_limit_refill_rate,
+            get_rate_limit_session_maker,
+        )
+        if settings.rate_limit_backend == "postgres"
+        else MemoryRateLimitBackend(settings.rate_limit_capacity, settings.rate_limit_refill_rate)
+    ),
+)
+
 # This must be the *first* middleware
 app.add_middleware(ProxyHeadersMiddleware)
 
@@ -75,5 +195,13 @@ app.add_middleware(
     allow_origins=settings.cors_allow_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match", "X-Request-Timeout"],
+    expose_headers=[
+        "ETag",
+        "Location",
+        "Retry-After",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+    ],
 )
@@ -1,5 +1,7 @@
 from .associations import *  # noqa: F403
 from .base import *  # noqa: F403
 from .food import *  # noqa: F403
+from .job import *  # noqa: F403
 from .place import *  # noqa: F403
+from .rate_limit import *  # noqa: F403
 from .tag import *  # noqa: F403
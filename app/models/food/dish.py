@@ -2,7 +2,7 @@ import uuid
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, ForeignKey, Numeric, String
+from sqlalchemy import JSON, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -20,7 +20,7 @@ class DishCategory(Base):
 
     __tablename__ = "dish_categories"
 
-    menu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("menus.id", ondelete="CASCADE"))
+    menu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("menus.id", ondelete="CASCADE"), index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     name_zh: Mapped[str] = mapped_column(String, nullable=False)
 
@@ -36,15 +36,30 @@ class Dish(Base):
     """
 
     __tablename__ = "dishes"
+    __table_args__ = (
+        Index(
+            "idx_dishes_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_dishes_name_zh_trgm",
+            "name_zh",
+            postgresql_using="gin",
+            postgresql_ops={"name_zh": "gin_trgm_ops"},
+        ),
+    )
 
-    menu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("menus.id", ondelete="CASCADE"))
+    menu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("menus.id", ondelete="CASCADE"), index=True)
     category_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("dish_categories.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
     name: Mapped[str] = mapped_column(String, nullable=False)
     name_zh: Mapped[str] = mapped_column(String, nullable=False)
-    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, index=True)
 
     properties: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
 
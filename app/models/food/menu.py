@@ -1,9 +1,11 @@
+import datetime
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DateTime, ForeignKey, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db import DeclarativeBase
 from app.models.base import Base
 
 if TYPE_CHECKING:
@@ -20,7 +22,7 @@ class Menu(Base):
 
     __tablename__ = "menus"
 
-    place_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("places.id", ondelete="CASCADE"))
+    place_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("places.id", ondelete="CASCADE"), index=True)
     place: Mapped["Place"] = relationship(back_populates="menus")
 
     dish_categories: Mapped[list["DishCategory"]] = relationship(
@@ -36,3 +38,24 @@ class Menu(Base):
         lazy="selectin",
         passive_deletes=True,
     )
+
+
+class MenuSnapshot(DeclarativeBase):
+    """MenuSnapshot model.
+
+    This model represents the rendered menus of a place in a language, as served by the menus endpoint.
+    Snapshots are written by database triggers whenever menus, dish categories or dishes change, along
+    with the SHA-256 of the document.
+    """
+
+    __tablename__ = "menu_snapshots"
+
+    place_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("places.id", ondelete="CASCADE"), primary_key=True)
+    lang: Mapped[str] = mapped_column(String, primary_key=True)
+    document: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
@@ -0,0 +1,52 @@
+import datetime
+
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.constants import JobKind, JobStatus
+from app.models.base import Base
+
+
+class Job(Base):
+    """Job model.
+
+    This model represents an operation run in the background by the job runner, with its payload, its
+    progress and, once finished, its result or error.
+
+    """
+
+    __tablename__ = "jobs"
+
+    kind: Mapped[JobKind] = mapped_column(
+        Enum(JobKind, name="job_kind", native_enum=False),
+        nullable=False,
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status", native_enum=False),
+        default=JobStatus.QUEUED,
+        server_default=JobStatus.QUEUED.name,
+        nullable=False,
+    )
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Units of work done out of the total, reported by the job while it runs
+    progress: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    worker: Mapped[str | None] = mapped_column(String, nullable=True)
+    started_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only unfinished jobs are looked up by the runner, oldest first
+        Index(
+            "idx_jobs_unfinished",
+            "created_at",
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
@@ -1,14 +1,19 @@
+from decimal import Decimal
+from itertools import starmap
 from typing import TYPE_CHECKING
 
 from geoalchemy2 import Geometry
 from geoalchemy2.shape import to_shape
-from sqlalchemy import JSON, Enum, Index, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Enum, Index, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, INT4MULTIRANGE, JSONB, Range
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
-from app.constants import PlaceType
+from app.constants import DEFAULT_PLACE_TIMEZONE, PlaceType
 from app.models.associations import place_tag_association
 from app.models.base import Base
 from app.schemas.places import PlaceUpdate
+from app.utils.opening_hours import opening_minute_ranges
+from app.utils.text import to_pinyin, zh_search_tokens
 
 if TYPE_CHECKING:
     from app.models.food.menu import Menu
@@ -27,6 +32,17 @@ class Place(Base):
 
     name: Mapped[str] = mapped_column(String, nullable=False)
     name_zh: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Normalized CJK unigrams and bigrams of name_zh, maintained on write for searching
+    name_zh_tokens: Mapped[list[str]] = mapped_column(
+        ARRAY(String),
+        default=list,
+        server_default="{}",
+        nullable=False,
+        deferred=True,
+    )
+    # Pinyin transliteration of name_zh and its initials, maintained on write for searching
+    name_zh_pinyin: Mapped[str | None] = mapped_column(String, nullable=True, deferred=True)
+    name_zh_pinyin_initials: Mapped[str | None] = mapped_column(String, nullable=True, deferred=True)
     type: Mapped[PlaceType] = mapped_column(
         Enum(PlaceType, name="place_type", native_enum=False),
         nullable=False,
@@ -46,14 +62,35 @@ class Place(Base):
 
     phone_number: Mapped[str | None] = mapped_column(String, nullable=True)
     website_url: Mapped[str | None] = mapped_column(String, nullable=True)
-    opening_hours: Mapped[list] = mapped_column(JSON, default=list, nullable=False)
+    opening_hours: Mapped[list] = mapped_column(JSONB, default=list, nullable=False)
+    # Opening hours as minute-of-week ranges in the local time of the place, maintained on write for filtering
+    opening_minutes: Mapped[list[Range[int]]] = mapped_column(
+        INT4MULTIRANGE,
+        default=list,
+        server_default="{}",
+        nullable=False,
+        deferred=True,
+    )
+    timezone: Mapped[str] = mapped_column(
+        String,
+        default=DEFAULT_PLACE_TIMEZONE,
+        server_default=DEFAULT_PLACE_TIMEZONE,
+        nullable=False,
+    )
+
+    properties: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
 
-    properties: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    # Statistics over the prices of the dishes of every menu, maintained by database triggers on dishes and menus
+    price_min: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True, index=True)
+    price_median: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True, index=True)
+    price_max: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True, index=True)
+    dish_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
 
     tags: Mapped[list["Tag"]] = relationship(
         secondary=place_tag_association,
         back_populates="places",
         lazy="selectin",
+        passive_deletes=True,
     )
 
     # For Place.type = PlaceType.FOOD only
@@ -76,6 +113,23 @@ class Place(Base):
             postgresql_using="gin",
             postgresql_ops={"name_zh": "gin_trgm_ops"},
         ),
+        Index(
+            "idx_places_name_zh_tokens",
+            "name_zh_tokens",
+            postgresql_using="gin",
+        ),
+        Index(
+            "idx_places_name_zh_pinyin_trgm",
+            "name_zh_pinyin",
+            postgresql_using="gin",
+            postgresql_ops={"name_zh_pinyin": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_places_name_zh_pinyin_initials_trgm",
+            "name_zh_pinyin_initials",
+            postgresql_using="gin",
+            postgresql_ops={"name_zh_pinyin_initials": "gin_trgm_ops"},
+        ),
         Index(
             "idx_places_address_trgm",
             "address",
@@ -87,8 +141,60 @@ class Place(Base):
             "location_geom",
             postgresql_using="gist",
         ),
+        Index(
+            "idx_places_properties",
+            "properties",
+            postgresql_using="gin",
+            postgresql_ops={"properties": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_places_opening_minutes",
+            "opening_minutes",
+            postgresql_using="gist",
+        ),
+        Index(
+            "idx_places_timezone_opening_minutes",
+            "timezone",
+            "opening_minutes",
+            postgresql_using="gist",
+        ),
+        Index(
+            "idx_places_timezone",
+            "timezone",
+        ),
     )
 
+    @validates("name_zh")
+    def validate_name_zh(self, _key: str, value: str | None) -> str | None:
+        """Keep the search tokens and pinyin of the Chinese name in sync with it.
+
+        Args:
+            _key (str): The name of the attribute being set.
+            value (str | None): The new Chinese name.
+
+        Returns:
+            str | None: The Chinese name, unchanged.
+
+        """
+        self.name_zh_tokens = zh_search_tokens(value)
+        self.name_zh_pinyin, self.name_zh_pinyin_initials = to_pinyin(value)
+        return value
+
+    @validates("opening_hours")
+    def validate_opening_hours(self, _key: str, value: list) -> list:
+        """Keep the minute-of-week ranges of the opening hours in sync with them.
+
+        Args:
+            _key (str): The name of the attribute being set.
+            value (list): The new opening hours.
+
+        Returns:
+            list: The opening hours, unchanged.
+
+        """
+        self.opening_minutes = list(starmap(Range, opening_minute_ranges(value)))
+        return value
+
     @property
     def location(self) -> dict[str, float] | None:
         """Get the location of the place.
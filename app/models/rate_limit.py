@@ -0,0 +1,15 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, String, Table
+
+from app.models.base import Base
+
+# Token buckets of the clients rate limited through the database, shared by every process. The table is
+# unlogged, as the buckets are not worth writing to the WAL and start full again if lost in a crash.
+rate_limit_buckets = Table(
+    "rate_limit_buckets",
+    Base.metadata,
+    Column("key", String, primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("allowed", Boolean, nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+    prefixes=["UNLOGGED"],
+)
@@ -48,12 +48,14 @@ class Tag(Base):
         UUID(as_uuid=True),
         ForeignKey("tag_types.id"),
         nullable=False,
+        index=True,
     )
 
     tag_type: Mapped["TagType"] = relationship(back_populates="tags", lazy="selectin")
     places: Mapped[list["Place"]] = relationship(
         secondary=place_tag_association,
         back_populates="tags",
+        passive_deletes=True,
     )
 
     @property
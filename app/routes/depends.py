@@ -1,16 +1,23 @@
+import json
+import time
 from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from functools import partial
 from http import HTTPStatus
-from typing import Literal
+from typing import Any, Literal
 
 import httpx
-from fastapi import Depends, Header, HTTPException, Query
+from fastapi import Depends, Header, HTTPException, Query, Request
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from jose import JOSEError, jwk, jwt
 
-from app.constants import Language
+from app.constants import SEARCH_QUERY_PARAMS, AdmissionPriority, Language
 from app.db import get_async_session_maker
+from app.db.admission import admission_controller
 from app.db.uow import DBUnitOfWork
-from app.schemas.options import FilterOptions, PaginationOptions, SortOptions
+from app.schemas.errors import InvalidPropertyFilterError
+from app.schemas.options import FilterOptions, PaginationOptions, PriceRange, SortOptions
 from app.schemas.places import LocationBounds
 from app.settings import settings
 
@@ -20,15 +27,70 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
 )
 
 
-async def get_db() -> AsyncIterator[DBUnitOfWork]:
-    """Dependency that provides a database session for the request.
+async def get_admission_priority(request: Request) -> AdmissionPriority:  # noqa: RUF029
+    """Get the priority of the request for a database connection.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        AdmissionPriority: HIGH for admin writes, LOW for searches, and NORMAL for other requests.
+
+    """
+    if request.method != "GET":
+        return AdmissionPriority.HIGH if request.url.path.startswith("/admin/") else AdmissionPriority.NORMAL
+    if SEARCH_QUERY_PARAMS.intersection(request.query_params):
+        return AdmissionPriority.LOW
+    return AdmissionPriority.NORMAL
+
+
+async def get_deadline(  # noqa: RUF029
+    request: Request,
+    request_timeout: float | None = Header(None, alias="X-Request-Timeout", gt=0),
+) -> float:
+    """Get the time by which the request must be done using the database.
+
+    Args:
+        request (Request): The request.
+        request_timeout (float, optional): The seconds the client waits for the response, which can only shorten
+            the budget of the route. Defaults to None.
+
+    Returns:
+        float: The time.monotonic() time of the deadline.
+
+    """
+    if request.url.path.startswith("/admin/"):
+        budget = settings.admin_request_timeout
+    elif request.method == "GET" and SEARCH_QUERY_PARAMS.intersection(request.query_params):
+        budget = settings.search_request_timeout
+    else:
+        budget = settings.request_timeout
+
+    if request_timeout is not None:
+        budget = min(budget, request_timeout)
+    return time.monotonic() + budget
+
+
+async def get_db(
+    priority: AdmissionPriority = Depends(get_admission_priority),
+    deadline: float = Depends(get_deadline),
+) -> AsyncIterator[DBUnitOfWork]:
+    """Dependency that provides a database session for the request, admitted when first used.
+
+    Args:
+        priority (AdmissionPriority): The priority of the request for a database connection.
+        deadline (float): The time by which the request must be done using the database.
 
     Yields:
         DBUnitOfWork: The database unit of work.
 
     """
     async_session_maker = get_async_session_maker()
-    async with DBUnitOfWork(async_session_maker) as uow:
+    async with DBUnitOfWork(
+        async_session_maker,
+        admission=partial(admission_controller.admit, priority),
+        deadline=deadline,
+    ) as uow:
         yield uow
 
 
@@ -165,22 +227,104 @@ async def get_sort_options(  # noqa: RUF029
     return SortOptions(sort_by=sort_by, order=order)
 
 
+async def get_price_range(  # noqa: RUF029
+    min_price: Decimal | None = Query(None, ge=0),
+    max_price: Decimal | None = Query(None, ge=0),
+) -> PriceRange:
+    """Get the price range.
+
+    Args:
+        min_price (Decimal, optional): The minimum price. Defaults to None.
+        max_price (Decimal, optional): The maximum price. Defaults to None.
+
+    Returns:
+        PriceRange: The price range.
+
+    """
+    return PriceRange(min_price=min_price, max_price=max_price)
+
+
+PROPERTY_FILTER_PREFIX = "prop."
+
+
+async def get_property_filters(request: Request) -> dict[str, Any]:  # noqa: RUF029
+    """Get the property filters, given as prop.<key>=<value> query parameters.
+
+    Dotted keys address nested properties, and values are parsed as JSON when possible, so that
+    prop.has_parking=true matches the boolean true while prop.cuisine=sichuan matches a string.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        dict[str, Any]: The properties the places must contain.
+
+    Raises:
+        InvalidPropertyFilterError: If a key is empty or is both a value and a nested property.
+
+    """
+    properties: dict[str, Any] = {}
+    for name, raw_value in request.query_params.multi_items():
+        if not name.startswith(PROPERTY_FILTER_PREFIX):
+            continue
+
+        *parents, key = name.removeprefix(PROPERTY_FILTER_PREFIX).split(".")
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            value = raw_value
+
+        target = properties
+        for parent in parents:
+            target = target.setdefault(parent, {})
+            if not parent or not isinstance(target, dict):
+                raise InvalidPropertyFilterError(name)
+        if not key or isinstance(target.get(key), dict):
+            raise InvalidPropertyFilterError(name)
+        target[key] = value
+
+    return properties
+
+
 async def get_filter_options(  # noqa: RUF029
     q: str | None = Query(None),
+    dish_q: str | None = Query(None),
+    price_range: PriceRange = Depends(get_price_range),
+    open_at: datetime | None = Query(None),
+    open_now: bool = Query(default=False),  # noqa: FBT001
+    properties: dict[str, Any] = Depends(get_property_filters),
 ) -> FilterOptions | None:
     """Get the filter options.
 
     Args:
         q (str, optional): The query to filter by.
+        dish_q (str, optional): The query to filter the dishes served by.
+        price_range (PriceRange): The range to filter the median dish price by.
+        open_at (datetime, optional): The time the places must be open at, as a wall-clock time in the local time
+            of each place when it has no timezone. Defaults to None.
+        open_now (bool, optional): Whether the places must be open now, overriding open_at. Defaults to False.
+        properties (dict[str, Any]): The properties the places must contain.
 
     Returns:
         FilterOptions | None: The filter options.
 
     """
-    if not q:
+    if price_range.min_price is None and price_range.max_price is None:
+        price_range = None
+
+    if open_now:
+        open_at = datetime.now(UTC)
+
+    if not q and not dish_q and not price_range and not open_at and not properties:
         return None
 
-    return FilterOptions(q=q)
+    return FilterOptions(
+        q=q,
+        dish_q=dish_q,
+        price_range=price_range,
+        open_at=open_at,
+        properties=properties or None,
+    )
 
 
 async def get_location_bounds(  # noqa: RUF029
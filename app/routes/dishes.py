@@ -0,0 +1,45 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+import app.services.dishes as dishes_service
+from app.constants import Language
+from app.db.uow import DBUnitOfWork
+from app.routes.depends import get_db, get_lang, get_location_bounds, get_pagination_options, get_price_range
+from app.schemas.menus import DishSearchResult
+from app.schemas.options import PaginationOptions, PriceRange
+from app.schemas.pagination import PaginatedResponse
+from app.schemas.places import LocationBounds
+
+router = APIRouter(prefix="/dishes", tags=["Dishes"])
+
+
+@router.get(
+    "/search",
+)
+async def search_dishes(
+    q: Annotated[str, Query(min_length=1)],
+    db: Annotated[DBUnitOfWork, Depends(get_db)],
+    location_bounds: Annotated[LocationBounds, Depends(get_location_bounds)],
+    price_range: Annotated[PriceRange, Depends(get_price_range)],
+    pagination_options: Annotated[PaginationOptions | None, Depends(get_pagination_options)],
+    lang: Annotated[Language, Depends(get_lang)],
+) -> list[DishSearchResult] | PaginatedResponse[DishSearchResult]:
+    """Search dishes by name within the specified bounds and price range, along with the places serving them."""
+    items, total = await dishes_service.search_dishes(
+        db=db,
+        q=q,
+        bounds=location_bounds,
+        price_range=price_range,
+        pagination_options=pagination_options,
+        lang=lang,
+    )
+
+    if pagination_options:
+        return PaginatedResponse[DishSearchResult](
+            items=items,
+            total=total,
+            page=pagination_options.page,
+            page_size=pagination_options.page_size,
+        )
+    return items
@@ -0,0 +1,25 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+
+import app.services.jobs as jobs_service
+from app.db.uow import DBUnitOfWork
+from app.routes.depends import get_db
+from app.schemas.jobs import JobResponse
+
+protected_router = APIRouter(prefix="/jobs")
+
+
+@protected_router.get(
+    "/{job_id}",
+)
+async def get_job(
+    job_id: UUID,
+    db: Annotated[DBUnitOfWork, Depends(get_db)],
+) -> JobResponse:
+    """Get a background job by ID, with its progress and, once finished, its result or error."""
+    return await jobs_service.get_job(
+        db=db,
+        job_id=job_id,
+    )
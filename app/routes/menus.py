@@ -0,0 +1,57 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Response, status
+
+import app.services.menus as menus_service
+from app.constants import Language, MenuImportMode
+from app.db.uow import DBUnitOfWork
+from app.routes.depends import get_db, get_lang
+from app.schemas.menus import MenuImport, MenuImportResponse, MenuResponse
+from app.utils.http import etag_matches, quote_etag
+
+router = APIRouter(prefix="/places", tags=["Menus"])
+protected_router = APIRouter(prefix="/places")
+
+
+@router.get(
+    "/{place_id}/menus",
+    response_model=list[MenuResponse],
+)
+async def list_place_menus(
+    place_id: UUID,
+    db: Annotated[DBUnitOfWork, Depends(get_db)],
+    lang: Annotated[Language, Depends(get_lang)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """List the menus of a place, with their categories and dishes, and names in the requested language."""
+    snapshot = await menus_service.get_menu_snapshot(
+        db=db,
+        place_id=place_id,
+        lang=lang,
+    )
+
+    # The document is stored rendered, so it is sent as is
+    headers = {"ETag": quote_etag(snapshot.etag), "Vary": "Accept-Language"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=snapshot.document, media_type="application/json", headers=headers)
+
+
+@protected_router.post(
+    "/{place_id}/menus/import",
+)
+async def import_place_menu(
+    place_id: UUID,
+    menu_import: MenuImport,
+    db: Annotated[DBUnitOfWork, Depends(get_db)],
+    mode: MenuImportMode = MenuImportMode.REPLACE,
+) -> MenuImportResponse:
+    """Import a whole menu for a place, replacing its menus or merging into its latest menu."""
+    return await menus_service.import_place_menu(
+        db=db,
+        place_id=place_id,
+        menu_import=menu_import,
+        mode=mode,
+    )
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import render_metrics
+
+protected_router = APIRouter(prefix="/metrics")
+
+
+@protected_router.get(
+    "/",
+    response_class=PlainTextResponse,
+)
+async def get_metrics() -> str:
+    """Get the metrics of this process, in the Prometheus text exposition format."""
+    return render_metrics()
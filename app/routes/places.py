@@ -1,17 +1,40 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import app.services.duplicates as duplicates_service
+import app.services.jobs as jobs_service
 import app.services.places as places_service
-from app.routes.depends import get_db, get_filter_options, get_location_bounds, get_pagination_options, get_sort_options
+import app.services.suggestions as suggestions_service
+from app.constants import JobKind, Language
+from app.routes.depends import (
+    get_db,
+    get_filter_options,
+    get_lang,
+    get_location_bounds,
+    get_pagination_options,
+    get_sort_options,
+)
+from app.schemas.duplicates import DuplicateSearch, PlaceMerge, PlaceMergeResponse
+from app.schemas.jobs import JobResponse
 from app.schemas.options import FilterOptions, PaginationOptions, SortOptions
 from app.schemas.pagination import PaginatedResponse
 from app.schemas.places import (
+    LocalizedPlaceResponse,
     LocationBounds,
+    PaginatedPlaceResponse,
+    PlaceBatchGet,
+    PlaceBatchGetResponse,
+    PlaceBulkDelete,
+    PlaceBulkUpsert,
     PlaceCreate,
     PlaceResponse,
+    PlaceSuggestion,
+    PlaceTagIds,
+    PlaceTagsBatch,
+    PlaceTagsChangeResponse,
     PlaceUpdate,
 )
 
@@ -22,17 +45,58 @@ protected_router = APIRouter(prefix="/places")
 @router.get(
     "/",
 )
+async def list_places(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    location_bounds: Annotated[LocationBounds, Depends(get_location_bounds)],
+    sort_options: Annotated[SortOptions | None, Depends(get_sort_options)],
+    filter_options: Annotated[FilterOptions | None, Depends(get_filter_options)],
+    pagination_options: Annotated[PaginationOptions | None, Depends(get_pagination_options)],
+    lang: Annotated[Language, Depends(get_lang)],
+    facets: Annotated[bool, Query()] = False,  # noqa: FBT002
+    include_dish: Annotated[bool, Query()] = False,  # noqa: FBT002
+) -> list[LocalizedPlaceResponse] | PaginatedPlaceResponse:
+    """List all places within the specified bounds, with names in the requested language.
+
+    Tag and tag type counts of the matching places are included in paginated responses when facets is set.
+    When filtering by dish_q, the best matching dish of each place is included when include_dish is set.
+    Places can be filtered by their properties with prop.<key>=<value> parameters, such as prop.has_parking=true.
+    """
+    items, total = await places_service.list_places(
+        db=db,
+        bounds=location_bounds,
+        sort_options=sort_options,
+        filter_options=filter_options,
+        pagination_options=pagination_options,
+        lang=lang,
+        include_best_dish=include_dish,
+    )
+
+    if pagination_options:
+        return PaginatedPlaceResponse(
+            items=items,
+            total=total,
+            page=pagination_options.page,
+            page_size=pagination_options.page_size,
+            facets=(
+                await places_service.list_place_facets(db=db, bounds=location_bounds, filter_options=filter_options)
+                if facets
+                else None
+            ),
+        )
+    return items
+
+
 @protected_router.get(
     "/",
 )
-async def list_places(
+async def list_places_with_all_names(
     db: Annotated[AsyncSession, Depends(get_db)],
     location_bounds: Annotated[LocationBounds, Depends(get_location_bounds)],
     sort_options: Annotated[SortOptions | None, Depends(get_sort_options)],
     filter_options: Annotated[FilterOptions | None, Depends(get_filter_options)],
     pagination_options: Annotated[PaginationOptions | None, Depends(get_pagination_options)],
 ) -> list[PlaceResponse] | PaginatedResponse[PlaceResponse]:
-    """List all places within the specified bounds."""
+    """List all places within the specified bounds, with names in every language."""
     items, total = await places_service.list_places(
         db=db,
         bounds=location_bounds,
@@ -48,18 +112,63 @@ async def list_places(
             page=pagination_options.page,
             page_size=pagination_options.page_size,
         )
-    return [PlaceResponse.model_validate(item) for item in items]
+    return items
+
+
+@protected_router.post(
+    "/duplicates/search",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def search_duplicate_places(
+    duplicate_search: DuplicateSearch,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+) -> JobResponse:
+    """Find clusters of places likely to be duplicates in a background job, most similar first."""
+    job = await jobs_service.enqueue_job(
+        db=db,
+        kind=JobKind.PLACE_DUPLICATE_SEARCH,
+        payload=duplicate_search,
+    )
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job
+
+
+@router.get("/suggest")
+async def suggest_places(
+    q: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[PlaceSuggestion]:
+    """Suggest places for a type-ahead query, served from the in-memory suggestion index."""
+    return suggestions_service.suggest_places(q=q, limit=limit)
+
+
+@router.post("/batch-get")
+async def get_places(
+    place_batch_get: PlaceBatchGet,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    lang: Annotated[Language, Depends(get_lang)],
+) -> PlaceBatchGetResponse:
+    """Get many places by ID at once, in the requested order, with their names in the requested language."""
+    return await places_service.get_places(
+        db=db,
+        place_ids=place_batch_get.ids,
+        lang=lang,
+    )
 
 
 @router.get("/{place_id}")
 async def get_place(
     place_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> PlaceResponse:
-    """Get a place by ID."""
+    lang: Annotated[Language, Depends(get_lang)],
+) -> LocalizedPlaceResponse:
+    """Get a place by ID, with its name in the requested language."""
     return await places_service.get_place(
         db=db,
         place_id=place_id,
+        lang=lang,
     )
 
 
@@ -78,6 +187,60 @@ async def create_place(
     )
 
 
+@protected_router.post(
+    "/bulk",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def bulk_upsert_places(
+    place_bulk_upsert: PlaceBulkUpsert,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+) -> JobResponse:
+    """Create or update many places at once in a background job, matched by their Google Maps Place ID."""
+    job = await jobs_service.enqueue_job(
+        db=db,
+        kind=JobKind.PLACE_BULK_UPSERT,
+        payload=place_bulk_upsert,
+    )
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job
+
+
+@protected_router.post(
+    "/bulk-delete",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def bulk_delete_places(
+    place_bulk_delete: PlaceBulkDelete,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+) -> JobResponse:
+    """Delete many places at once in a background job, selected by ID, by bounds and filters, or both."""
+    job = await jobs_service.enqueue_job(
+        db=db,
+        kind=JobKind.PLACE_BULK_DELETE,
+        payload=place_bulk_delete,
+    )
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job
+
+
+@protected_router.post(
+    "/tags/batch",
+)
+async def update_places_tags(
+    batch: PlaceTagsBatch,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PlaceTagsChangeResponse:
+    """Add tags to and remove tags from many places at once."""
+    return await places_service.update_places_tags(
+        db=db,
+        batch=batch,
+    )
+
+
 @protected_router.put(
     "/{place_id}",
     response_model_exclude_unset=True,
@@ -108,3 +271,51 @@ async def delete_place(
         db=db,
         place_id=place_id,
     )
+
+
+@protected_router.post(
+    "/{place_id}/tags",
+)
+async def add_place_tags(
+    place_id: UUID,
+    place_tag_ids: PlaceTagIds,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PlaceTagsChangeResponse:
+    """Add tags to a place by ID, leaving its other tags unchanged."""
+    return await places_service.add_place_tags(
+        db=db,
+        place_id=place_id,
+        tag_ids=place_tag_ids.tag_ids,
+    )
+
+
+@protected_router.delete(
+    "/{place_id}/tags",
+)
+async def remove_place_tags(
+    place_id: UUID,
+    place_tag_ids: PlaceTagIds,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PlaceTagsChangeResponse:
+    """Remove tags from a place by ID, leaving its other tags unchanged."""
+    return await places_service.remove_place_tags(
+        db=db,
+        place_id=place_id,
+        tag_ids=place_tag_ids.tag_ids,
+    )
+
+
+@protected_router.post(
+    "/{place_id}/merge",
+)
+async def merge_places(
+    place_id: UUID,
+    place_merge: PlaceMerge,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PlaceMergeResponse:
+    """Merge duplicates into a place by ID, moving their tags and menus to it and deleting them."""
+    return await duplicates_service.merge_places(
+        db=db,
+        place_id=place_id,
+        duplicate_ids=place_merge.duplicate_ids,
+    )
@@ -0,0 +1,71 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.constants import PLACE_DUPLICATE_MAX_DISTANCE, PLACE_DUPLICATE_SIMILARITY_THRESHOLD
+
+
+class DuplicatePair(BaseModel):
+    """Duplicate pair schema.
+
+    This schema is used to represent two places likely to be the same, with the distance between them in
+    metres and the trigram similarity of their names.
+    """
+
+    place_id: UUID
+    duplicate_id: UUID
+    distance: float
+    similarity: float
+
+
+class DuplicateCluster(BaseModel):
+    """Duplicate cluster schema.
+
+    This schema is used to represent places linked by likely duplicate pairs, scored by the similarity of
+    their most similar pair.
+    """
+
+    place_ids: list[UUID] = Field(default_factory=list)
+    pairs: list[DuplicatePair] = Field(default_factory=list)
+    score: float
+
+
+class DuplicateSearch(BaseModel):
+    """Duplicate search schema.
+
+    This schema is used to find places likely to be duplicates, at most max_distance metres apart and with
+    names at least min_similarity similar.
+    """
+
+    max_distance: float = Field(PLACE_DUPLICATE_MAX_DISTANCE, gt=0, le=1000)
+    min_similarity: float = Field(PLACE_DUPLICATE_SIMILARITY_THRESHOLD, gt=0, le=1)
+
+
+class DuplicateSearchResponse(BaseModel):
+    """Duplicate search response schema.
+
+    This schema is used to report the clusters of places likely to be duplicates, most similar first.
+    """
+
+    clusters: list[DuplicateCluster] = Field(default_factory=list)
+
+
+class PlaceMerge(BaseModel):
+    """Place merge schema.
+
+    This schema is used to merge duplicates into a place.
+    """
+
+    duplicate_ids: list[UUID] = Field(min_length=1)
+
+
+class PlaceMergeResponse(BaseModel):
+    """Place merge response schema.
+
+    This schema is used to report the duplicates merged into a place, and the tags and menus moved to it.
+    """
+
+    place_id: UUID
+    merged: int = 0
+    tags: int = 0
+    menus: int = 0
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from app.services.errors import ValidationError
 
 
@@ -11,6 +13,13 @@ class InvalidBoundsError(ValidationError):
         )
 
 
+class ConflictingTagIdsError(ValidationError):
+    """Custom exception for tags both added and removed."""
+
+    def __init__(self, tag_ids: list) -> None:
+        super().__init__(f"Conflicting tag IDs: {tag_ids}. A tag cannot be both added and removed.")
+
+
 class InvalidDayError(ValidationError):
     """Custom exception for invalid day."""
 
@@ -18,6 +27,13 @@ class InvalidDayError(ValidationError):
         super().__init__(f"Invalid day: {day}. Day must be an integer between 1 (Monday) and 7 (Sunday).")
 
 
+class DuplicateDishCategoryError(ValidationError):
+    """Custom exception for duplicate dish category names in a menu."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Duplicate dish category: {name}. Category names must be unique within a menu.")
+
+
 class InvalidLatitudeError(ValidationError):
     """Custom exception for invalid latitude."""
 
@@ -39,6 +55,50 @@ class InvalidPhoneNumberError(ValidationError):
         super().__init__(f"Invalid phone number: {phone_number}. Phone number must be 10 digits.")
 
 
+class MissingPlaceSelectionError(ValidationError):
+    """Custom exception for bulk operations selecting no places."""
+
+    def __init__(self) -> None:
+        super().__init__("Missing place selection: give place IDs, bounds or filters to select the places.")
+
+
+class InexactPlaceSelectionError(ValidationError):
+    """Custom exception for destructive bulk operations selecting places by search queries."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "Inexact place selection: q and dish_q match places by similarity and cannot select places to delete.",
+        )
+
+
+class TooManyPlacesError(ValidationError):
+    """Custom exception for too many places."""
+
+    def __init__(self, count: int, max_count: int, operation: str) -> None:
+        super().__init__(f"Too many places: {count}. At most {max_count} places can be {operation} at once.")
+
+
+class TooManyDishesError(ValidationError):
+    """Custom exception for menus with too many dishes."""
+
+    def __init__(self, count: int, limit: int) -> None:
+        super().__init__(f"Too many dishes: {count}. A menu can have at most {limit} dishes.")
+
+
+class InvalidPriceRangeError(ValidationError):
+    """Custom exception for invalid price range."""
+
+    def __init__(self, min_price: Decimal, max_price: Decimal) -> None:
+        super().__init__(f"Invalid price range: minimum price {min_price} must not exceed maximum price {max_price}.")
+
+
+class InvalidPropertyFilterError(ValidationError):
+    """Custom exception for invalid property filter."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Invalid property filter: {name}. Expected prop.<key>=<value> with non-conflicting keys.")
+
+
 class InvalidSortColumnError(ValidationError):
     """Custom exception for invalid sort column."""
 
@@ -53,6 +113,13 @@ class InvalidTimeFormatError(ValidationError):
         super().__init__(f"Invalid time format: {time}. Expected format is HH:mm.")
 
 
+class InvalidTimezoneError(ValidationError):
+    """Custom exception for invalid timezone."""
+
+    def __init__(self, timezone: str | None) -> None:
+        super().__init__(f"Invalid timezone: {timezone}. Expected an IANA timezone name such as America/New_York.")
+
+
 class InvalidTimeOrderError(ValidationError):
     """Custom exception for invalid time order."""
 
@@ -0,0 +1,29 @@
+import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.constants import JobKind, JobStatus
+
+
+class JobResponse(BaseModel):
+    """Job response schema.
+
+    This schema is used for returning the status of a background job, with its progress and, once it
+    has finished, its result or error.
+    """
+
+    id: UUID
+    kind: JobKind
+    status: JobStatus
+    progress: int
+    total: int | None = None
+    result: dict | None = None
+    error: str | None = None
+    attempts: int
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None = None
+    finished_at: datetime.datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,134 @@
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.constants import MENU_IMPORT_MAX_DISHES
+from app.schemas.errors import DuplicateDishCategoryError, TooManyDishesError
+from app.schemas.places import Location
+
+
+class DishResponse(BaseModel):
+    """Dish response schema.
+
+    This schema is used to represent a dish in a menu, with its name in the requested language.
+    """
+
+    id: UUID
+    display_name: str
+    price: Decimal
+    properties: dict[str, Any] = Field(default_factory=dict)
+
+
+class DishCategoryResponse(BaseModel):
+    """Dish category response schema.
+
+    This schema is used to represent a category of a menu and its dishes, with names in the requested language.
+    """
+
+    id: UUID
+    display_name: str
+    dishes: list[DishResponse] = Field(default_factory=list)
+
+
+class MenuResponse(BaseModel):
+    """Menu response schema.
+
+    This schema is used to represent a menu with its categories, and the dishes not in any category.
+    """
+
+    id: UUID
+    categories: list[DishCategoryResponse] = Field(default_factory=list)
+    dishes: list[DishResponse] = Field(default_factory=list)
+
+
+class DishPlace(BaseModel):
+    """Dish place schema.
+
+    This schema is used to represent the place serving a dish, with its name in the requested language.
+    """
+
+    id: UUID
+    display_name: str
+    location: Location | None = None
+
+
+class DishSearchResult(DishResponse):
+    """Dish search result schema.
+
+    This schema is used to represent a dish matching a search, along with the place serving it.
+    """
+
+    place: DishPlace
+
+
+class DishImport(BaseModel):
+    """Dish import schema.
+
+    This schema is used to represent a dish in an imported menu.
+    """
+
+    name: str = Field(min_length=1)
+    name_zh: str = Field(min_length=1)
+    price: Decimal = Field(ge=0, max_digits=10, decimal_places=2)
+    properties: dict[str, Any] = Field(default_factory=dict)
+
+
+class DishCategoryImport(BaseModel):
+    """Dish category import schema.
+
+    This schema is used to represent a category and its dishes in an imported menu.
+    """
+
+    name: str = Field(min_length=1)
+    name_zh: str = Field(min_length=1)
+    dishes: list[DishImport] = Field(default_factory=list)
+
+
+class MenuImport(BaseModel):
+    """Menu import schema.
+
+    This schema is used to import a whole menu at once, with its categories and the dishes not in any category.
+    """
+
+    categories: list[DishCategoryImport] = Field(default_factory=list)
+    dishes: list[DishImport] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_menu(self) -> "MenuImport":
+        """Validate the menu.
+
+        Category names must be unique, so that merged categories can be matched by name, and the
+        number of dishes is capped.
+
+        Returns:
+            MenuImport: The validated menu.
+
+        Raises:
+            DuplicateDishCategoryError: If two categories have the same name.
+            TooManyDishesError: If the menu has more than MENU_IMPORT_MAX_DISHES dishes.
+
+        """
+        names = set()
+        for category in self.categories:
+            if category.name in names:
+                raise DuplicateDishCategoryError(category.name)
+            names.add(category.name)
+
+        count = len(self.dishes) + sum(len(category.dishes) for category in self.categories)
+        if count > MENU_IMPORT_MAX_DISHES:
+            raise TooManyDishesError(count, MENU_IMPORT_MAX_DISHES)
+
+        return self
+
+
+class MenuImportResponse(BaseModel):
+    """Menu import response schema.
+
+    This schema is used to report the menu a menu import was written to.
+    """
+
+    menu_id: UUID
+    categories: int
+    dishes: int
@@ -1,6 +1,10 @@
-from typing import Literal
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.errors import InvalidPriceRangeError
 
 
 class PaginationOptions(BaseModel):
@@ -23,6 +27,31 @@ class SortOptions(BaseModel):
     order: Literal["asc", "desc"] = "asc"
 
 
+class PriceRange(BaseModel):
+    """Price range schema.
+
+    This schema is used to filter by price in the API. Either bound may be omitted.
+    """
+
+    min_price: Decimal | None = Field(default=None, ge=0)
+    max_price: Decimal | None = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def validate_range(self) -> "PriceRange":
+        """Validate the price range.
+
+        Returns:
+            PriceRange: The validated price range.
+
+        Raises:
+            InvalidPriceRangeError: If the minimum price is greater than the maximum price.
+
+        """
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise InvalidPriceRangeError(self.min_price, self.max_price)
+        return self
+
+
 class FilterOptions(BaseModel):
     """Filter options schema.
 
@@ -30,3 +59,9 @@ class FilterOptions(BaseModel):
     """
 
     q: str | None = None
+    dish_q: str | None = None
+    price_range: PriceRange | None = None
+    # A time without a timezone is a wall-clock time at each place, otherwise an instant
+    open_at: datetime | None = None
+    # Properties the places must have, matched by containment
+    properties: dict[str, Any] | None = None
@@ -1,12 +1,26 @@
 import re
 from datetime import datetime
+from decimal import Decimal
 from typing import Any
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
-from app.constants import PHONE_NUMBER_REGEX, PlaceType
+from app.constants import (
+    DEFAULT_PLACE_TIMEZONE,
+    PHONE_NUMBER_REGEX,
+    PLACE_BATCH_GET_MAX_PLACES,
+    PLACE_BULK_DELETE_MAX_PLACES,
+    PLACE_BULK_UPSERT_MAX_PLACES,
+    PLACE_TAGS_BATCH_MAX_PLACES,
+    Language,
+    PlaceType,
+    PlaceUpsertStatus,
+)
 from app.schemas.errors import (
+    ConflictingTagIdsError,
+    InexactPlaceSelectionError,
     InvalidBoundsError,
     InvalidDayError,
     InvalidLatitudeError,
@@ -14,8 +28,15 @@ from app.schemas.errors import (
     InvalidPhoneNumberError,
     InvalidTimeFormatError,
     InvalidTimeOrderError,
+    InvalidTimezoneError,
+    MissingPlaceSelectionError,
+    TooManyPlacesError,
 )
+from app.schemas.options import FilterOptions
+from app.schemas.pagination import PaginatedResponse
 from app.schemas.tags import TagResponse
+from app.utils.i18n import localize
+from app.utils.timezones import timezone_at
 
 LATITUDE_LOWER_BOUND = -90
 LATITUDE_UPPER_BOUND = 90
@@ -255,6 +276,7 @@ class PlaceBase(BaseModel):
     phone_number: str | None = Field(default=None, examples=["1234567890"])
     website_url: str | None = None
     opening_hours: list[OpeningHours] = Field(default_factory=list)
+    timezone: str = Field(default=DEFAULT_PLACE_TIMEZONE, examples=["America/New_York"])
     properties: dict[str, Any] = Field(default_factory=dict)
 
     @field_validator("phone_number")
@@ -278,6 +300,33 @@ class PlaceBase(BaseModel):
             raise InvalidPhoneNumberError(v)
         return v
 
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v: str | None) -> str:
+        """Validate the timezone.
+
+        The timezone is the IANA name of the timezone the opening hours are in. A place always has one, so
+        an explicit null is rejected; leave the timezone out of an update to keep it.
+
+        Args:
+            v (str | None): The timezone to validate.
+
+        Returns:
+            str: The validated timezone.
+
+        Raises:
+            InvalidTimezoneError: If the timezone is null or not known.
+
+        """
+        if v is None:
+            raise InvalidTimezoneError(v)
+
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise InvalidTimezoneError(v) from e
+        return v
+
 
 class PlaceCreate(PlaceBase):
     """Place create schema.
@@ -288,6 +337,18 @@ class PlaceCreate(PlaceBase):
     location: Location | None = None
     tag_ids: list[UUID] = Field(default_factory=list)
 
+    @model_validator(mode="after")
+    def derive_timezone(self) -> "PlaceCreate":
+        """Derive the timezone from the location when it is not given.
+
+        Returns:
+            PlaceCreate: The place, in the timezone of its location unless another was given.
+
+        """
+        if "timezone" not in self.model_fields_set and self.location is not None:
+            self.timezone = timezone_at(self.location.latitude, self.location.longitude) or DEFAULT_PLACE_TIMEZONE
+        return self
+
 
 class PlaceUpdate(PlaceBase):
     """Place update schema.
@@ -298,10 +359,201 @@ class PlaceUpdate(PlaceBase):
     name: str | None = None
     name_zh: str | None = None
     type: PlaceType | None = None
+    timezone: str | None = None
     location: Location | None = None
+    tag_ids: list[UUID] | None = None
+
+
+class PlaceBulkUpsert(BaseModel):
+    """Place bulk upsert schema.
+
+    This schema is used to create or update many places at once, matched by their Google Maps Place ID.
+    """
+
+    places: list[PlaceCreate] = Field(default_factory=list)
+
+    @field_validator("places")
+    @classmethod
+    def validate_places(cls, v: list[PlaceCreate]) -> list[PlaceCreate]:
+        """Validate the number of places.
+
+        Args:
+            v (list[PlaceCreate]): The places to validate.
+
+        Returns:
+            list[PlaceCreate]: The validated places.
+
+        Raises:
+            TooManyPlacesError: If there are more than PLACE_BULK_UPSERT_MAX_PLACES places.
+
+        """
+        if len(v) > PLACE_BULK_UPSERT_MAX_PLACES:
+            raise TooManyPlacesError(len(v), PLACE_BULK_UPSERT_MAX_PLACES, "upserted")
+        return v
+
+
+class PlaceUpsertResult(BaseModel):
+    """Place upsert result schema.
+
+    This schema is used to report the outcome of a place of a bulk upsert, in the order the places were sent.
+    """
+
+    index: int
+    google_maps_place_id: str | None = None
+    id: UUID | None = None
+    status: PlaceUpsertStatus
+    error: str | None = None
+
+
+class PlaceBulkUpsertResponse(BaseModel):
+    """Place bulk upsert response schema.
+
+    This schema is used to report the outcome of a bulk upsert of places.
+    """
+
+    results: list[PlaceUpsertResult] = Field(default_factory=list)
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+
+
+class PlaceBulkDelete(BaseModel):
+    """Place bulk delete schema.
+
+    This schema is used to delete many places at once, selected by their IDs, by bounds and filters, or both.
+    """
+
+    ids: list[UUID] | None = None
+    bounds: LocationBounds | None = None
+    filters: FilterOptions | None = None
+
+    @field_validator("ids")
+    @classmethod
+    def validate_ids(cls, v: list[UUID] | None) -> list[UUID] | None:
+        """Validate the number of places.
+
+        Args:
+            v (list[UUID] | None): The place IDs to validate.
+
+        Returns:
+            list[UUID] | None: The validated place IDs.
+
+        Raises:
+            TooManyPlacesError: If there are more than PLACE_BULK_DELETE_MAX_PLACES places.
+
+        """
+        if v is not None and len(v) > PLACE_BULK_DELETE_MAX_PLACES:
+            raise TooManyPlacesError(len(v), PLACE_BULK_DELETE_MAX_PLACES, "deleted")
+        return v
+
+    @model_validator(mode="after")
+    @classmethod
+    def validate_selection(cls, values: "PlaceBulkDelete") -> "PlaceBulkDelete":
+        """Validate that the places are selected exactly, so that a bulk delete never deletes every place.
+
+        Args:
+            values (PlaceBulkDelete): The PlaceBulkDelete object to validate.
+
+        Returns:
+            PlaceBulkDelete: The validated PlaceBulkDelete object.
+
+        Raises:
+            InexactPlaceSelectionError: If the places are selected by a search query.
+            MissingPlaceSelectionError: If neither IDs, bounds nor non-empty filters are given.
+
+        """
+        filters = values.filters
+        if filters is not None and (filters.q is not None or filters.dish_q is not None):
+            raise InexactPlaceSelectionError
+        has_filters = filters is not None and (
+            filters.open_at
+            or filters.properties
+            or (filters.price_range and filters.price_range.model_dump(exclude_none=True))
+        )
+        if values.ids is None and values.bounds is None and not has_filters:
+            raise MissingPlaceSelectionError
+        return values
+
+
+class PlaceBulkDeleteResponse(BaseModel):
+    """Place bulk delete response schema.
+
+    This schema is used to report the number of places deleted.
+    """
+
+    deleted: int = 0
+
+
+class PlaceTagIds(BaseModel):
+    """Place tag IDs schema.
+
+    This schema is used to add tags to or remove tags from a place, leaving its other tags unchanged.
+    """
+
     tag_ids: list[UUID] = Field(default_factory=list)
 
 
+class PlaceTagsBatch(BaseModel):
+    """Place tags batch schema.
+
+    This schema is used to add tags to and remove tags from many places at once.
+    """
+
+    place_ids: list[UUID] = Field(default_factory=list)
+    add_tag_ids: list[UUID] = Field(default_factory=list)
+    remove_tag_ids: list[UUID] = Field(default_factory=list)
+
+    @field_validator("place_ids")
+    @classmethod
+    def validate_place_ids(cls, v: list[UUID]) -> list[UUID]:
+        """Validate the number of places.
+
+        Args:
+            v (list[UUID]): The place IDs to validate.
+
+        Returns:
+            list[UUID]: The validated place IDs.
+
+        Raises:
+            TooManyPlacesError: If there are more than PLACE_TAGS_BATCH_MAX_PLACES places.
+
+        """
+        if len(v) > PLACE_TAGS_BATCH_MAX_PLACES:
+            raise TooManyPlacesError(len(v), PLACE_TAGS_BATCH_MAX_PLACES, "tagged")
+        return v
+
+    @model_validator(mode="after")
+    @classmethod
+    def validate_tag_ids(cls, values: "PlaceTagsBatch") -> "PlaceTagsBatch":
+        """Validate that no tag is both added and removed.
+
+        Args:
+            values (PlaceTagsBatch): The PlaceTagsBatch object to validate.
+
+        Returns:
+            PlaceTagsBatch: The validated PlaceTagsBatch object.
+
+        Raises:
+            ConflictingTagIdsError: If a tag is both added and removed.
+
+        """
+        conflicting = set(values.add_tag_ids) & set(values.remove_tag_ids)
+        if conflicting:
+            raise ConflictingTagIdsError(sorted(conflicting))
+        return values
+
+
+class PlaceTagsChangeResponse(BaseModel):
+    """Place tags change response schema.
+
+    This schema is used to report the number of place tags added and removed, tags already in the
+    requested state not being counted.
+    """
+
+    added: int = 0
+    removed: int = 0
+
+
 class PlaceResponse(PlaceBase):
     """Place response schema.
 
@@ -313,11 +565,156 @@ class PlaceResponse(PlaceBase):
     updated_at: datetime
     location: Location | None = None
     tags: list[TagResponse] = Field(default_factory=list)
+    price_min: Decimal | None = None
+    price_median: Decimal | None = None
+    price_max: Decimal | None = None
+    dish_count: int | None = None
 
     class Config:
         from_attributes = True
 
 
+class MatchingDish(BaseModel):
+    """Matching dish schema.
+
+    This schema is used to represent the dish of a place best matching a dish query, with its name in the
+    requested language.
+    """
+
+    id: UUID
+    display_name: str
+    price: Decimal
+
+
+class LocalizedPlaceResponse(BaseModel):
+    """Localized place response schema.
+
+    This schema is used to represent a place in the response with a single name in the requested language.
+    """
+
+    id: UUID
+    display_name: str
+    type: PlaceType
+    address: str | None = None
+    google_maps_url: str | None = None
+    google_maps_place_id: str | None = None
+    phone_number: str | None = None
+    website_url: str | None = None
+    opening_hours: list[OpeningHours] = Field(default_factory=list)
+    timezone: str = DEFAULT_PLACE_TIMEZONE
+    properties: dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime
+    updated_at: datetime
+    location: Location | None = None
+    tags: list[TagResponse] = Field(default_factory=list)
+    price_min: Decimal | None = None
+    price_median: Decimal | None = None
+    price_max: Decimal | None = None
+    dish_count: int | None = None
+    best_dish: MatchingDish | None = None
+
+    @classmethod
+    def from_place(cls, place: Any, lang: Language) -> "LocalizedPlaceResponse":  # noqa: ANN401
+        """Create a localized response from a place.
+
+        Only the name column needed for the language is read, so the other one may be left unloaded.
+
+        Args:
+            place (Any): The place to create the response from.
+            lang (Language): The language to display the name in.
+
+        Returns:
+            LocalizedPlaceResponse: The localized place response.
+
+        """
+        name_zh = place.name_zh if lang == Language.ZH_CN else None
+        fields = {
+            field: getattr(place, field) for field in cls.model_fields if field not in {"display_name", "best_dish"}
+        }
+        return cls(display_name=localize(place.name, name_zh, lang), **fields)
+
+
+class PlaceBatchGet(BaseModel):
+    """Place batch get schema.
+
+    This schema is used to get many places by their IDs at once.
+    """
+
+    ids: list[UUID] = Field(default_factory=list)
+
+    @field_validator("ids")
+    @classmethod
+    def validate_ids(cls, v: list[UUID]) -> list[UUID]:
+        """Validate the number of places.
+
+        Args:
+            v (list[UUID]): The place IDs to validate.
+
+        Returns:
+            list[UUID]: The validated place IDs.
+
+        Raises:
+            TooManyPlacesError: If there are more than PLACE_BATCH_GET_MAX_PLACES places.
+
+        """
+        if len(v) > PLACE_BATCH_GET_MAX_PLACES:
+            raise TooManyPlacesError(len(v), PLACE_BATCH_GET_MAX_PLACES, "fetched")
+        return v
+
+
+class PlaceBatchGetResponse(BaseModel):
+    """Place batch get response schema.
+
+    This schema is used to return the places found, in the requested order, and the IDs of the places not found.
+    """
+
+    items: list[LocalizedPlaceResponse] | list[PlaceResponse] = Field(default_factory=list)
+    missing: list[UUID] = Field(default_factory=list)
+
+
+class TagFacet(BaseModel):
+    """Tag facet schema.
+
+    This schema is used to represent the number of matching places with a tag.
+    """
+
+    id: UUID
+    name: str
+    tag_type_id: UUID
+    count: int
+
+
+class TagTypeFacet(BaseModel):
+    """Tag type facet schema.
+
+    This schema is used to represent the number of matching places with any tag of a tag type.
+    """
+
+    id: UUID
+    name: str
+    count: int
+
+
+class PlaceFacets(BaseModel):
+    """Place facets schema.
+
+    This schema is used to represent the tag and tag type counts of the places matching a search.
+    """
+
+    tags: list[TagFacet] = Field(default_factory=list)
+    tag_types: list[TagTypeFacet] = Field(default_factory=list)
+    approximate: bool = False
+
+
+class PaginatedPlaceResponse(PaginatedResponse[LocalizedPlaceResponse]):
+    """Paginated place response schema.
+
+    This schema is used for paginated place search results, optionally with their facets.
+    """
+
+    facets: PlaceFacets | None = None
+
+
 class SimplePlaceResponse(BaseModel):
     """Simple place response schema.
 
@@ -332,3 +729,15 @@ class SimplePlaceResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PlaceSuggestion(BaseModel):
+    """Place suggestion schema.
+
+    This schema is used to represent a lightweight type-ahead suggestion for a place.
+    """
+
+    id: UUID
+    name: str
+    name_zh: str | None = None
+    location: Location | None = None
@@ -1,8 +1,9 @@
 from typing import Literal
 
-from sqlalchemy import Select, asc, desc, func, text
+from sqlalchemy import ColumnElement, Select, String, asc, desc, func, text
 
 from app.db.uow import DBUnitOfWork
+from app.schemas.places import LocationBounds
 
 
 def sort(stmt: Select, entity: type, sort_by: str, order: Literal["asc", "desc"]) -> Select:
@@ -21,9 +22,13 @@ def sort(stmt: Select, entity: type, sort_by: str, order: Literal["asc", "desc"]
     # Get the sort column from the entity
     sort_column = getattr(entity, sort_by)
 
-    # Apply case-insensitive sort
+    # Apply case-insensitive sort to text columns
+    if isinstance(sort_column.type, String):
+        sort_column = func.lower(sort_column)
+
+    # Keep missing values last in both orders
     return stmt.order_by(
-        desc(func.lower(sort_column)) if order == "desc" else asc(func.lower(sort_column)),
+        (desc(sort_column) if order == "desc" else asc(sort_column)).nulls_last(),
     )
 
 
@@ -52,3 +57,25 @@ async def with_similarity_threshold(db: DBUnitOfWork, threshold: float = 0.3) ->
 
     """
     await db.execute(text(f"SET pg_trgm.similarity_threshold = {threshold}"))
+
+
+def within_bounds(column: ColumnElement, bounds: LocationBounds) -> ColumnElement[bool]:
+    """Get a condition matching the geometries of a column that intersect bounds.
+
+    Args:
+        column (ColumnElement): The geometry column.
+        bounds (LocationBounds): The bounds.
+
+    Returns:
+        ColumnElement[bool]: The condition, which can use the spatial index of the column.
+
+    """
+    return column.op("&&")(
+        func.ST_MakeEnvelope(
+            bounds.sw_lng,
+            bounds.sw_lat,
+            bounds.ne_lng,
+            bounds.ne_lat,
+            4326,
+        ),
+    )
@@ -0,0 +1,175 @@
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Float, cast, func, or_, select
+
+from app.constants import PLACE_SEARCH_SIMILARITY_THRESHOLD, Language
+from app.db.uow import DBUnitOfWork
+from app.models.food import Dish, Menu
+from app.models.place import Place
+from app.schemas.menus import DishPlace, DishResponse, DishSearchResult
+from app.schemas.options import PaginationOptions, PriceRange
+from app.schemas.places import Location, LocationBounds
+from app.services.common import paginate, with_similarity_threshold, within_bounds
+from app.utils.i18n import localize
+from app.utils.text import contains_cjk
+
+
+def dish_match(q: str) -> ColumnElement[bool]:
+    """Get a condition matching the dishes whose name matches a query.
+
+    Args:
+        q (str): The query to match dish names against.
+
+    Returns:
+        ColumnElement[bool]: The condition, which can use the trigram indexes on dish names.
+
+    """
+    if contains_cjk(q):
+        # pg_trgm yields few usable trigrams for CJK text, so look for the query as a substring instead
+        return Dish.name_zh.contains(q, autoescape=True)
+
+    return or_(Dish.name.op("%")(q), Dish.name_zh.op("%")(q))
+
+
+def dish_rank(q: str) -> ColumnElement[float]:
+    """Get the ranking of dishes matching a query, lower being better.
+
+    Args:
+        q (str): The query the dishes were matched against.
+
+    Returns:
+        ColumnElement[float]: The trigram distance of the name, or the length of the Chinese name for CJK queries.
+
+    """
+    if contains_cjk(q):
+        return cast(func.length(Dish.name_zh), Float)
+
+    return cast(Dish.name.op("<->")(q), Float)
+
+
+async def best_matching_dishes(
+    db: DBUnitOfWork,
+    place_ids: list[UUID],
+    q: str,
+    lang: Language = Language.EN_US,
+) -> dict[UUID, DishResponse]:
+    """Get the dish best matching a query for each of several places.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_ids (list[UUID]): The IDs of the places.
+        q (str): The query to match dish names against.
+        lang (Language): The language to display names in. Defaults to English.
+
+    Returns:
+        dict[UUID, DishResponse]: The best matching dish of each place with a matching dish, cheapest
+        first among equally good matches.
+
+    """
+    if not place_ids:
+        return {}
+
+    columns = [Menu.place_id, Dish.id, Dish.name, Dish.price, Dish.properties]
+    if lang == Language.ZH_CN:
+        columns.append(Dish.name_zh)
+
+    stmt = (
+        select(*columns)
+        .join(Menu, Menu.id == Dish.menu_id)
+        .where(Menu.place_id.in_(place_ids), dish_match(q))
+        .distinct(Menu.place_id)
+        .order_by(Menu.place_id, dish_rank(q), Dish.price, Dish.id)
+    )
+
+    return {
+        row.place_id: DishResponse(
+            id=row.id,
+            display_name=localize(row.name, getattr(row, "name_zh", None), lang),
+            price=row.price,
+            properties=row.properties,
+        )
+        for row in (await db.execute(stmt)).all()
+    }
+
+
+async def search_dishes(  # noqa: PLR0913, PLR0917
+    db: DBUnitOfWork,
+    q: str,
+    bounds: LocationBounds | None = None,
+    price_range: PriceRange | None = None,
+    pagination_options: PaginationOptions | None = None,
+    lang: Language = Language.EN_US,
+) -> tuple[list[DishSearchResult], int]:
+    """Search dishes by name, along with the places serving them.
+
+    Dishes and their places are returned by a single query joining dishes, menus and places.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        q (str): The query to match dish names against.
+        bounds (LocationBounds | None): The bounds the places must be within. Defaults to None.
+        price_range (PriceRange | None): The price range of the dishes. Defaults to None.
+        pagination_options (PaginationOptions | None): The pagination options. Defaults to None.
+        lang (Language): The language to display names in. Defaults to English.
+
+    Returns:
+        tuple[list[DishSearchResult], int]: A tuple containing the matching dishes, best matches first,
+        and the total count of matching dishes.
+
+    """
+    columns = [
+        Dish.id,
+        Dish.name,
+        Dish.price,
+        Dish.properties,
+        Place.id.label("place_id"),
+        Place.name.label("place_name"),
+        func.ST_Y(Place.location_geom).label("latitude"),
+        func.ST_X(Place.location_geom).label("longitude"),
+    ]
+    if lang == Language.ZH_CN:
+        columns += [Dish.name_zh, Place.name_zh.label("place_name_zh")]
+
+    stmt = select(*columns).join(Menu, Menu.id == Dish.menu_id).join(Place, Place.id == Menu.place_id)
+
+    if not contains_cjk(q):
+        await with_similarity_threshold(db, PLACE_SEARCH_SIMILARITY_THRESHOLD)
+    stmt = stmt.where(dish_match(q)).order_by(dish_rank(q))
+
+    if bounds:
+        stmt = stmt.where(within_bounds(Place.location_geom, bounds))
+
+    if price_range and price_range.min_price is not None:
+        stmt = stmt.where(Dish.price >= price_range.min_price)
+    if price_range and price_range.max_price is not None:
+        stmt = stmt.where(Dish.price <= price_range.max_price)
+
+    # Cheaper dishes first among equally good matches
+    stmt = stmt.order_by(Dish.price, Dish.id)
+
+    total = await db.get_count(stmt)
+
+    if pagination_options:
+        stmt = paginate(stmt, pagination_options.page, pagination_options.page_size)
+
+    results = []
+    for row in (await db.execute(stmt)).all():
+        location = None
+        if row.latitude is not None and row.longitude is not None:
+            location = Location(latitude=row.latitude, longitude=row.longitude)
+
+        results.append(
+            DishSearchResult(
+                id=row.id,
+                display_name=localize(row.name, getattr(row, "name_zh", None), lang),
+                price=row.price,
+                properties=row.properties,
+                place=DishPlace(
+                    id=row.place_id,
+                    display_name=localize(row.place_name, getattr(row, "place_name_zh", None), lang),
+                    location=location,
+                ),
+            ),
+        )
+
+    return results, total
@@ -0,0 +1,182 @@
+from uuid import UUID
+
+from sqlalchemy import Float, Select, delete, func, literal, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app.constants import PLACE_DUPLICATE_MAX_DISTANCE, PLACE_DUPLICATE_SIMILARITY_THRESHOLD
+from app.db.uow import DBUnitOfWork
+from app.models.associations import place_tag_association
+from app.models.food import Menu
+from app.models.place import Place
+from app.schemas.duplicates import DuplicateCluster, DuplicatePair, PlaceMergeResponse
+from app.services.errors import ObjectNotFoundError, ValidationError
+
+# Metres per degree of latitude, and the smallest cosine of latitude used to widen the search in longitude
+_METRES_PER_DEGREE = 111_320
+_MIN_LATITUDE_COSINE = 0.01
+
+
+def _duplicate_pairs(max_distance: float, min_similarity: float) -> Select:
+    """Get the query of the likely duplicate pairs of places.
+
+    Each place is joined with the places of the same type within the distance, found with the spatial index
+    of location_geom from a search box in degrees, widened in longitude for the latitude of the place. The
+    pairs are then kept if their distance on the sphere is within the distance and their names are similar.
+
+    Args:
+        max_distance (float): The maximum distance between duplicates, in metres.
+        min_similarity (float): The minimum trigram similarity of the names, or of the Chinese names, of duplicates.
+
+    Returns:
+        Select: The query of the pairs, each pair once with the smallest ID first, with their distance and similarity.
+
+    """
+    place = aliased(Place, name="place")
+    other = aliased(Place, name="other")
+
+    degrees = literal(max_distance, Float) / (
+        _METRES_PER_DEGREE * func.greatest(func.cos(func.radians(func.ST_Y(place.location_geom))), _MIN_LATITUDE_COSINE)
+    )
+    distance = func.ST_DistanceSphere(place.location_geom, other.location_geom)
+    similarity = func.greatest(
+        func.similarity(place.name, other.name),
+        func.coalesce(func.similarity(place.name_zh, other.name_zh), 0),
+    )
+
+    return (
+        select(
+            place.id.label("place_id"),
+            other.id.label("duplicate_id"),
+            distance.label("distance"),
+            similarity.label("similarity"),
+        )
+        .join(
+            other,
+            (place.id < other.id)
+            & (place.type == other.type)
+            & func.ST_DWithin(other.location_geom, place.location_geom, degrees),
+        )
+        .where(distance <= max_distance, similarity >= min_similarity)
+    )
+
+
+def _cluster(pairs: list[DuplicatePair]) -> list[DuplicateCluster]:
+    """Group pairs of duplicates into clusters of places linked by pairs.
+
+    Args:
+        pairs (list[DuplicatePair]): The pairs.
+
+    Returns:
+        list[DuplicateCluster]: The clusters, most similar first.
+
+    """
+    parents: dict[UUID, UUID] = {}
+
+    def find(place_id: UUID) -> UUID:
+        parents.setdefault(place_id, place_id)
+        while parents[place_id] != place_id:
+            parents[place_id] = parents[parents[place_id]]
+            place_id = parents[place_id]
+        return place_id
+
+    for pair in pairs:
+        parents[find(pair.duplicate_id)] = find(pair.place_id)
+
+    clusters: dict[UUID, DuplicateCluster] = {}
+    for pair in pairs:
+        cluster = clusters.setdefault(find(pair.place_id), DuplicateCluster(score=0))
+        cluster.pairs.append(pair)
+        cluster.score = max(cluster.score, pair.similarity)
+    for place_id in parents:
+        clusters[find(place_id)].place_ids.append(place_id)
+
+    for cluster in clusters.values():
+        cluster.place_ids.sort()
+    return sorted(clusters.values(), key=lambda cluster: (-cluster.score, -len(cluster.place_ids)))
+
+
+async def find_duplicate_clusters(
+    db: DBUnitOfWork,
+    max_distance: float = PLACE_DUPLICATE_MAX_DISTANCE,
+    min_similarity: float = PLACE_DUPLICATE_SIMILARITY_THRESHOLD,
+) -> list[DuplicateCluster]:
+    """Find clusters of places likely to be duplicates across all places.
+
+    The pairs are found by a single spatial self-join, streamed from a server-side cursor, and grouped into
+    clusters of places linked by pairs.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        max_distance (float): The maximum distance between duplicates, in metres. Defaults to
+            PLACE_DUPLICATE_MAX_DISTANCE.
+        min_similarity (float): The minimum trigram similarity of the names of duplicates. Defaults to
+            PLACE_DUPLICATE_SIMILARITY_THRESHOLD.
+
+    Returns:
+        list[DuplicateCluster]: The clusters, most similar first.
+
+    """
+    pairs = [
+        DuplicatePair.model_validate(row, from_attributes=True)
+        async for row in db.stream(_duplicate_pairs(max_distance, min_similarity))
+    ]
+    return _cluster(pairs)
+
+
+async def merge_places(db: DBUnitOfWork, place_id: UUID, duplicate_ids: list[UUID]) -> PlaceMergeResponse:
+    """Merge duplicates into a place.
+
+    The tags of the duplicates are added to the place and their menus moved to it, then the duplicates are
+    deleted, each with a single statement and in one transaction.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_id (UUID): The ID of the place to keep.
+        duplicate_ids (list[UUID]): The IDs of the places to merge into it.
+
+    Returns:
+        PlaceMergeResponse: The number of duplicates merged, and of tags and menus moved to the place.
+
+    Raises:
+        ObjectNotFoundError: If the place or a duplicate is not found.
+        SelfMergeError: If the place is one of its duplicates.
+        ValidationError: If the places could not be merged.
+
+    """
+    duplicate_ids = list(dict.fromkeys(duplicate_ids))
+    if place_id in duplicate_ids:
+        raise SelfMergeError(place_id)
+
+    found = set((await db.execute(select(Place.id).where(Place.id.in_([place_id, *duplicate_ids])))).scalars())
+    for missing_id in (place_id, *duplicate_ids):
+        if missing_id not in found:
+            raise ObjectNotFoundError(Place.__name__, missing_id)
+
+    try:
+        tags = await db.execute(
+            postgresql.insert(place_tag_association)
+            .from_select(
+                ["place_id", "tag_id"],
+                select(literal(place_id), place_tag_association.c.tag_id)
+                .where(place_tag_association.c.place_id.in_(duplicate_ids))
+                .distinct(),
+            )
+            .on_conflict_do_nothing(),
+        )
+        menus = await db.execute(update(Menu).where(Menu.place_id.in_(duplicate_ids)).values(place_id=place_id))
+        # The tags of the duplicates are deleted by the ON DELETE CASCADE of their foreign key
+        merged = await db.execute(delete(Place).where(Place.id.in_(duplicate_ids)))
+        await db.commit()
+    except IntegrityError as e:
+        raise ValidationError from e
+
+    return PlaceMergeResponse(place_id=place_id, merged=merged.rowcount, tags=tags.rowcount, menus=menus.rowcount)
+
+
+class SelfMergeError(ValidationError):
+    """Custom error for a place merged into itself."""
+
+    def __init__(self, place_id: UUID) -> None:
+        super().__init__(f"Cannot merge place {place_id} into itself")
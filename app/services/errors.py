@@ -28,3 +28,18 @@ class ObjectNotFoundError(CustomError):
     def __init__(self, object_type: str, object_id: str) -> None:
         message = f"Object not found: {object_type}(id={object_id})"
         super().__init__(message)
+
+
+class ServiceUnavailableError(CustomError):
+    """Exception raised when a request is shed because the service is overloaded."""
+
+    def __init__(self, message: str = "Service unavailable", retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(CustomError):
+    """Exception raised when a request runs out of time before it is done using the database."""
+
+    def __init__(self, message: str = "Request deadline exceeded") -> None:
+        super().__init__(message)
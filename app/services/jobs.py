@@ -0,0 +1,412 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import timedelta
+from functools import partial
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.duplicates as duplicates_service
+import app.services.places as places_service
+from app.constants import JOB_HEARTBEAT_INTERVAL, JOB_MAX_ATTEMPTS, JOB_STALE_AFTER, JobKind, JobStatus
+from app.db.uow import DBUnitOfWork
+from app.models.job import Job
+from app.schemas.duplicates import DuplicateSearch, DuplicateSearchResponse
+from app.schemas.jobs import JobResponse
+from app.schemas.places import PlaceBulkDelete, PlaceBulkUpsert
+from app.services.errors import CustomError, ObjectNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Called by a job with the units of work done and, when known, their total
+ProgressReporter = Callable[[int, int | None], Awaitable[None]]
+# Runs a job from its payload in its own unit of work, returning its result
+JobHandler = Callable[[DBUnitOfWork, dict, ProgressReporter], Awaitable[BaseModel | None]]
+
+
+async def enqueue_job(db: DBUnitOfWork, kind: JobKind, payload: BaseModel) -> JobResponse:
+    """Queue a job to be run in the background.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        kind (JobKind): The kind of the job.
+        payload (BaseModel): The payload of the job, handed to its handler.
+
+    Returns:
+        JobResponse: The queued job.
+
+    """
+    result = await db.execute(insert(Job).values(kind=kind, payload=payload.model_dump(mode="json")).returning(Job))
+    job = result.scalar_one()
+    await db.commit()
+    return JobResponse.model_validate(job)
+
+
+async def get_job(db: DBUnitOfWork, job_id: UUID) -> JobResponse:
+    """Get a job by ID.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+
+    Returns:
+        JobResponse: The job, with its progress and, once finished, its result or error.
+
+    Raises:
+        ObjectNotFoundError: If the job is not found.
+
+    """
+    job = await db.get(Job, job_id)
+    if not job:
+        raise ObjectNotFoundError(Job.__name__, job_id)
+
+    return JobResponse.model_validate(job)
+
+
+async def claim_job(db: DBUnitOfWork, worker: str) -> Job | None:
+    """Claim the oldest job waiting to be run.
+
+    A job is waiting when it is queued, or when it is running without a recent heartbeat, its worker
+    having stopped. The job is locked with FOR UPDATE SKIP LOCKED, so that concurrent workers claim
+    different jobs without waiting for each other. Abandoned jobs started JOB_MAX_ATTEMPTS times are
+    failed instead of being claimed again.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        worker (str): The name of the worker claiming the job.
+
+    Returns:
+        Job | None: The claimed job, now running, or None if no job is waiting.
+
+    """
+    abandoned = (Job.status == JobStatus.RUNNING) & (Job.heartbeat_at < func.now() - timedelta(seconds=JOB_STALE_AFTER))
+    await db.execute(
+        update(Job)
+        .where(abandoned, Job.attempts >= JOB_MAX_ATTEMPTS)
+        .values(
+            status=JobStatus.FAILED,
+            error=f"Job abandoned after {JOB_MAX_ATTEMPTS} attempts",
+            finished_at=func.now(),
+        ),
+    )
+
+    waiting = (
+        select(Job.id)
+        .where(
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            (Job.status == JobStatus.QUEUED) | abandoned,
+        )
+        .order_by(Job.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == waiting)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            worker=worker,
+            progress=0,
+            started_at=func.now(),
+            heartbeat_at=func.now(),
+        )
+        .returning(Job),
+    )
+    job = result.scalar_one_or_none()
+    await db.commit()
+    return job
+
+
+def _owned_by(job_id: UUID, worker: str) -> ColumnElement[bool]:
+    # A job is only updated by the worker running it, as another worker claims it again once it is abandoned
+    return (Job.id == job_id) & (Job.worker == worker) & (Job.status == JobStatus.RUNNING)
+
+
+async def report_job_progress(
+    db: DBUnitOfWork,
+    job_id: UUID,
+    worker: str,
+    progress: int,
+    total: int | None = None,
+) -> bool:
+    """Record the progress of a running job, which is also a heartbeat.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+        worker (str): The name of the worker running the job.
+        progress (int): The units of work done.
+        total (int | None): The total units of work, if known. Defaults to None, which keeps the total.
+
+    Returns:
+        bool: True if the job is still run by the worker, False if another worker claimed it again.
+
+    """
+    values = {"progress": progress, "heartbeat_at": func.now()}
+    if total is not None:
+        values["total"] = total
+    result = await db.execute(update(Job).where(_owned_by(job_id, worker)).values(**values))
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def heartbeat_job(db: DBUnitOfWork, job_id: UUID, worker: str) -> bool:
+    """Record that a running job is still being run.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+        worker (str): The name of the worker running the job.
+
+    Returns:
+        bool: True if the job is still run by the worker, False if another worker claimed it again.
+
+    """
+    result = await db.execute(update(Job).where(_owned_by(job_id, worker)).values(heartbeat_at=func.now()))
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def finish_job(db: DBUnitOfWork, job_id: UUID, worker: str, result: dict | None) -> bool:
+    """Record that a job has succeeded.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+        worker (str): The name of the worker running the job.
+        result (dict | None): The result of the job.
+
+    Returns:
+        bool: True if the job was run by the worker, False if another worker claimed it again.
+
+    """
+    updated = await db.execute(
+        update(Job)
+        .where(_owned_by(job_id, worker))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            progress=func.coalesce(Job.total, Job.progress),
+            finished_at=func.now(),
+        ),
+    )
+    await db.commit()
+    return updated.rowcount > 0
+
+
+async def fail_job(db: DBUnitOfWork, job_id: UUID, worker: str, error: str) -> bool:
+    """Record that a job has failed.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+        worker (str): The name of the worker running the job.
+        error (str): The error of the job.
+
+    Returns:
+        bool: True if the job was run by the worker, False if another worker claimed it again.
+
+    """
+    result = await db.execute(
+        update(Job)
+        .where(_owned_by(job_id, worker))
+        .values(status=JobStatus.FAILED, error=error, finished_at=func.now()),
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def release_job(db: DBUnitOfWork, job_id: UUID, worker: str) -> bool:
+    """Queue a running job again, its worker stopping before it has finished.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        job_id (UUID): The ID of the job.
+        worker (str): The name of the worker running the job.
+
+    Returns:
+        bool: True if the job was run by the worker, False if another worker claimed it again.
+
+    """
+    result = await db.execute(
+        update(Job)
+        .where(_owned_by(job_id, worker))
+        .values(status=JobStatus.QUEUED, attempts=Job.attempts - 1, worker=None, heartbeat_at=None),
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def _run_place_bulk_upsert(db: DBUnitOfWork, payload: dict, report: ProgressReporter) -> BaseModel:
+    place_bulk_upsert = PlaceBulkUpsert.model_validate(payload)
+    await report(0, len(place_bulk_upsert.places))
+    return await places_service.bulk_upsert_places(db=db, places=place_bulk_upsert.places, report=report)
+
+
+async def _run_place_bulk_delete(db: DBUnitOfWork, payload: dict, _report: ProgressReporter) -> BaseModel:
+    place_bulk_delete = PlaceBulkDelete.model_validate(payload)
+    return await places_service.bulk_delete_places(
+        db=db,
+        place_ids=place_bulk_delete.ids,
+        bounds=place_bulk_delete.bounds,
+        filter_options=place_bulk_delete.filters,
+    )
+
+
+async def _run_place_duplicate_search(db: DBUnitOfWork, payload: dict, _report: ProgressReporter) -> BaseModel:
+    duplicate_search = DuplicateSearch.model_validate(payload)
+    clusters = await duplicates_service.find_duplicate_clusters(
+        db=db,
+        max_distance=duplicate_search.max_distance,
+        min_similarity=duplicate_search.min_similarity,
+    )
+    return DuplicateSearchResponse(clusters=clusters)
+
+
+JOB_HANDLERS: dict[JobKind, JobHandler] = {
+    JobKind.PLACE_BULK_UPSERT: _run_place_bulk_upsert,
+    JobKind.PLACE_BULK_DELETE: _run_place_bulk_delete,
+    JobKind.PLACE_DUPLICATE_SEARCH: _run_place_duplicate_search,
+}
+
+
+class JobOwnershipLostError(Exception):
+    """The job was claimed again by another worker, its own having stopped sending heartbeats for too long."""
+
+
+class JobRunner:
+    """Postgres-backed background job runner.
+
+    This class runs a fixed number of workers, each claiming the oldest waiting job from the jobs table
+    and running it with its handler, so that no more jobs than that are run at once by a process. Any
+    number of processes may run workers against the same table. A running job sends heartbeats, so that
+    it is run again by another worker when its own stops without releasing it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        handlers: Mapping[JobKind, JobHandler] = JOB_HANDLERS,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """Initialize the job runner.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): A callable that returns an AsyncSession.
+            handlers (Mapping[JobKind, JobHandler]): The handler of each kind of job. Defaults to JOB_HANDLERS.
+            concurrency (int): The number of jobs run at once. Defaults to 2.
+            poll_interval (float): Seconds to wait before looking for jobs again when none is waiting.
+
+        """
+        self._session_factory = session_factory
+        self._handlers = handlers
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._claims = itertools.count(1)
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the workers."""
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        """Stop the workers, queueing the jobs they are running again."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def run_next(self) -> bool:
+        """Claim and run the oldest waiting job.
+
+        Each claim is made under a name of its own, so that a worker that stalled for too long and whose job was
+        claimed again, even in the same process, stops running it instead of recording its outcome.
+
+        Returns:
+            bool: True if a job was run, False if no job was waiting.
+
+        Raises:
+            CancelledError: If the runner is stopped while running the job, which is queued again.
+
+        """
+        worker = f"{self._worker}:{next(self._claims)}"
+        async with DBUnitOfWork(self._session_factory) as db:
+            job = await claim_job(db, worker)
+        if job is None:
+            return False
+
+        work = asyncio.create_task(self._run(job, worker))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, worker, work))
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                await self._record(release_job, job.id, worker)
+                raise
+            # Cancelled by the heartbeat, the job having been claimed again
+            logger.warning("Stopped job %s, claimed again by another worker", job.id)
+        except JobOwnershipLostError:
+            logger.warning("Stopped job %s, claimed again by another worker", job.id)
+        except CustomError as e:
+            await self._record_outcome(fail_job, job.id, worker, e.message)
+        except Exception:
+            logger.exception("Failed to run job %s of kind %s", job.id, job.kind)
+            await self._record_outcome(fail_job, job.id, worker, "Internal error")
+        else:
+            await self._record_outcome(finish_job, job.id, worker, result.model_dump(mode="json") if result else None)
+        finally:
+            heartbeat.cancel()
+            work.cancel()
+        return True
+
+    async def _run(self, job: Job, worker: str) -> BaseModel | None:
+        async with DBUnitOfWork(self._session_factory) as db:
+            return await self._handlers[job.kind](db, job.payload, partial(self._report, job.id, worker))
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                ran = await self.run_next()
+            except Exception:
+                logger.exception("Failed to run a job")
+                ran = False
+            if not ran:
+                await asyncio.sleep(self._poll_interval)
+
+    async def _heartbeat(self, job_id: UUID, worker: str, work: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            try:
+                owned = await self._record(heartbeat_job, job_id, worker)
+            except Exception:
+                logger.exception("Failed to send a heartbeat for job %s", job_id)
+                continue
+            if not owned:
+                work.cancel()
+                return
+
+    async def _report(self, job_id: UUID, worker: str, progress: int, total: int | None = None) -> None:
+        if not await self._record(report_job_progress, job_id, worker, progress, total):
+            raise JobOwnershipLostError
+
+    async def _record_outcome(self, update_job: Callable[..., Awaitable[bool]], job_id: UUID, *args: object) -> None:
+        if not await self._record(update_job, job_id, *args):
+            logger.warning("Dropped the outcome of job %s, claimed again by another worker", job_id)
+
+    async def _record(self, update_job: Callable[..., Awaitable[bool]], *args: object) -> bool:
+        # Job updates are committed in their own unit of work, to be seen while the job runs
+        async with DBUnitOfWork(self._session_factory) as db:
+            return await update_job(db, *args)
@@ -0,0 +1,171 @@
+import hashlib
+from uuid import UUID
+
+from sqlalchemy import String, Uuid, column, delete, func, insert, select, true, update, values
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.exc import IntegrityError
+
+from app.constants import MENU_SNAPSHOTS_DEFER_SETTING, Language, MenuImportMode
+from app.db.uow import DBUnitOfWork
+from app.models.food import Dish, DishCategory, Menu, MenuSnapshot
+from app.models.place import Place
+from app.schemas.menus import MenuImport, MenuImportResponse
+from app.services.errors import ObjectNotFoundError, ValidationError
+
+EMPTY_MENU_DOCUMENT = "[]"
+
+
+async def get_menu_snapshot(db: DBUnitOfWork, place_id: UUID, lang: Language) -> MenuSnapshot:
+    """Get the rendered menus of a place, with their categories and dishes.
+
+    The document is read from the snapshot kept up to date by database triggers, in a single
+    primary key lookup.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_id (UUID): The ID of the place.
+        lang (Language): The language to display names in.
+
+    Returns:
+        MenuSnapshot: The snapshot, whose document is a JSON list of menus, oldest first, with
+        categories and dishes ordered by name.
+
+    Raises:
+        ObjectNotFoundError: If the place is not found.
+
+    """
+    stmt = select(MenuSnapshot).where(MenuSnapshot.place_id == place_id, MenuSnapshot.lang == lang)
+    snapshot = (await db.execute(stmt)).scalar_one_or_none()
+    if snapshot:
+        return snapshot
+
+    # Places whose menus never changed have no snapshot
+    if (await db.execute(select(Place.id).where(Place.id == place_id))).scalar_one_or_none() is None:
+        raise ObjectNotFoundError(Place.__name__, place_id)
+
+    return MenuSnapshot(
+        place_id=place_id,
+        lang=lang,
+        document=EMPTY_MENU_DOCUMENT,
+        etag=hashlib.sha256(EMPTY_MENU_DOCUMENT.encode()).hexdigest(),
+    )
+
+
+async def _write_place_menu(
+    db: DBUnitOfWork,
+    place_id: UUID,
+    menu_import: MenuImport,
+    mode: MenuImportMode,
+) -> tuple[UUID, int]:
+    menu_id = None
+    category_ids: dict[str, UUID] = {}
+    if mode == MenuImportMode.MERGE:
+        menu_id = (
+            await db.execute(
+                select(Menu.id)
+                .where(Menu.place_id == place_id)
+                .order_by(Menu.created_at.desc(), Menu.id.desc())
+                .limit(1),
+            )
+        ).scalar_one_or_none()
+    else:
+        # Categories and dishes are deleted by the ON DELETE CASCADE of their foreign keys
+        await db.execute(delete(Menu).where(Menu.place_id == place_id))
+
+    if menu_id is None:
+        menu_id = (await db.execute(insert(Menu).values(place_id=place_id).returning(Menu.id))).scalar_one()
+    else:
+        result = await db.execute(
+            select(DishCategory.name, DishCategory.id, DishCategory.name_zh).where(DishCategory.menu_id == menu_id),
+        )
+        existing = {name: (category_id, name_zh) for name, category_id, name_zh in result.all()}
+        category_ids = {name: category_id for name, (category_id, _) in existing.items()}
+
+        # The existing categories imported again take their imported Chinese name, in a single UPDATE
+        renamed = [
+            (existing[category.name][0], category.name_zh)
+            for category in menu_import.categories
+            if category.name in existing and existing[category.name][1] != category.name_zh
+        ]
+        if renamed:
+            names = values(column("id", Uuid), column("name_zh", String), name="names").data(renamed)
+            await db.execute(
+                update(DishCategory).where(DishCategory.id == names.c.id).values(name_zh=names.c.name_zh),
+            )
+
+        dish_names = [dish.name for dish in menu_import.dishes] + [
+            dish.name for category in menu_import.categories for dish in category.dishes
+        ]
+        if dish_names:
+            await db.execute(delete(Dish).where(Dish.menu_id == menu_id, Dish.name.in_(dish_names)))
+
+    new_categories = [
+        {"menu_id": menu_id, "name": category.name, "name_zh": category.name_zh}
+        for category in menu_import.categories
+        if category.name not in category_ids
+    ]
+    if new_categories:
+        result = await db.execute(
+            insert(DishCategory).values(new_categories).returning(DishCategory.name, DishCategory.id),
+        )
+        category_ids.update(result.all())
+
+    dishes = [{"menu_id": menu_id, "category_id": None, **dish.model_dump()} for dish in menu_import.dishes] + [
+        {"menu_id": menu_id, "category_id": category_ids[category.name], **dish.model_dump()}
+        for category in menu_import.categories
+        for dish in category.dishes
+    ]
+    if dishes:
+        await db.execute(insert(Dish).values(dishes))
+
+    return menu_id, len(dishes)
+
+
+async def import_place_menu(
+    db: DBUnitOfWork,
+    place_id: UUID,
+    menu_import: MenuImport,
+    mode: MenuImportMode = MenuImportMode.REPLACE,
+) -> MenuImportResponse:
+    """Import a whole menu for a place in one transaction.
+
+    The menu, its categories and its dishes are each written with a single multi-row INSERT,
+    whatever the number of dishes.
+
+    The menu snapshots of the place are rendered once, after all the writes, rather than by the
+    triggers of each statement.
+
+    In replace mode, the existing menus of the place are deleted, along with their categories
+    and dishes, and the imported menu becomes the only menu of the place. In merge mode, the
+    imported menu is merged into the latest menu of the place: categories are matched by name,
+    taking their imported Chinese name, and imported dishes replace the dishes with the same name.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_id (UUID): The ID of the place.
+        menu_import (MenuImport): The menu to import.
+        mode (MenuImportMode): How to combine the menu with the existing menus. Defaults to replace.
+
+    Returns:
+        MenuImportResponse: The menu the import was written to.
+
+    Raises:
+        ObjectNotFoundError: If the place is not found.
+        ValidationError: If the menu could not be written.
+
+    """
+    if (await db.execute(select(Place.id).where(Place.id == place_id))).scalar_one_or_none() is None:
+        raise ObjectNotFoundError(Place.__name__, place_id)
+
+    # Constraints are checked as each statement runs, so they are violated by the writes as well as the commit
+    try:
+        # The snapshot triggers would render the menu again after each write; it is rendered once instead
+        await db.execute(select(func.set_config(MENU_SNAPSHOTS_DEFER_SETTING, "on", true())))
+        menu_id, dishes = await _write_place_menu(db, place_id, menu_import, mode)
+        await db.execute(select(func.set_config(MENU_SNAPSHOTS_DEFER_SETTING, "off", true())))
+        await db.execute(select(func.refresh_menu_snapshots(array([place_id]))))
+        await db.commit()
+    except IntegrityError as e:
+        raise ValidationError from e
+
+    return MenuImportResponse(menu_id=menu_id, categories=len(menu_import.categories), dishes=dishes)
@@ -1,28 +1,100 @@
+import json
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from functools import partial
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Float, cast, func, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Float,
+    Integer,
+    Row,
+    Select,
+    any_,
+    cast,
+    delete,
+    desc,
+    distinct,
+    extract,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
-
-from app.constants import PLACE_SEARCH_SIMILARITY_THRESHOLD
-from app.db.uow import DBUnitOfWork
+from sqlalchemy.orm import aliased, defer
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.constants import (
+    PLACE_BULK_UPSERT_CHUNK_SIZE,
+    PLACE_FACET_CANDIDATE_LIMIT,
+    PLACE_SEARCH_SIMILARITY_THRESHOLD,
+    PLACE_SEARCH_WEIGHTS,
+    Language,
+    PlaceUpsertStatus,
+)
+from app.db.uow import DBUnitOfWork, is_deadline_exceeded
+from app.models.associations import place_tag_association
+from app.models.food import Dish, Menu
 from app.models.place import Place
-from app.models.tag import Tag
-from app.schemas.errors import InvalidSortColumnError
+from app.models.tag import Tag, TagType
+from app.schemas.errors import InexactPlaceSelectionError, InvalidSortColumnError
 from app.schemas.options import FilterOptions, PaginationOptions, SortOptions
-from app.schemas.places import LocationBounds, PlaceCreate, PlaceResponse, PlaceUpdate
-from app.services.common import paginate, sort, with_similarity_threshold
+from app.schemas.places import (
+    LocalizedPlaceResponse,
+    Location,
+    LocationBounds,
+    MatchingDish,
+    PlaceBatchGetResponse,
+    PlaceBulkDeleteResponse,
+    PlaceBulkUpsertResponse,
+    PlaceCreate,
+    PlaceFacets,
+    PlaceResponse,
+    PlaceTagsBatch,
+    PlaceTagsChangeResponse,
+    PlaceUpdate,
+    PlaceUpsertResult,
+    TagFacet,
+    TagTypeFacet,
+)
+from app.services.common import paginate, sort, with_similarity_threshold, within_bounds
+from app.services.dishes import best_matching_dishes, dish_match
 from app.services.errors import (
     ObjectNotFoundError,
     ValidationError,
 )
+from app.utils.opening_hours import MINUTES_PER_DAY, minute_of_week
+from app.utils.single_flight import SingleFlight
+from app.utils.text import contains_cjk, pinyin_query, zh_query_tokens
+
+# Concurrent calls of list_places with the same parameters, sharing the result of the first
+_list_places_flight = SingleFlight("list_places", is_own_error=is_deadline_exceeded)
 
+_TAG_GROUPING = 1
+_TAG_TYPE_GROUPING = 2
+_TOTAL_GROUPING = 3
 
-async def _get_place_by_id(db: DBUnitOfWork, place_id: UUID) -> Place:
+
+async def _get_place_by_id(
+    db: DBUnitOfWork,
+    place_id: UUID,
+    options: list[ExecutableOption] | None = None,
+) -> Place:
     """Get a place by its ID.
 
     Args:
         db (DBUnitOfWork): The database unit of work.
         place_id (UUID): The ID of the place to retrieve.
+        options (list[ExecutableOption] | None): Loader options for the place. Defaults to None.
 
     Returns:
         Place: The place.
@@ -31,7 +103,7 @@ async def _get_place_by_id(db: DBUnitOfWork, place_id: UUID) -> Place:
         ObjectNotFoundError: If the place is not found.
 
     """
-    place = await db.get(Place, place_id)
+    place = await db.get(Place, place_id, options=options or [])
 
     if not place:
         raise ObjectNotFoundError(Place.__name__, place_id)
@@ -67,84 +139,342 @@ async def _get_tags_by_ids(db: DBUnitOfWork, tag_ids: list[UUID]) -> list[Tag]:
     return await db.get_all(stmt)
 
 
-async def _assign_tags_to_place(
-    db: DBUnitOfWork,
-    place: Place,
-    tag_ids: list[UUID],
-) -> None:
+async def _get_valid_tags(db: DBUnitOfWork, tag_ids: list[UUID]) -> list[Tag]:
+    if not tag_ids:
+        return []
+
     tags = await _get_tags_by_ids(db, tag_ids)
     _validate_tags(tags, tag_ids)
-    place.tags = tags
+    return tags
+
+
+async def _get_place_tags(db: DBUnitOfWork, place_id: UUID) -> list[Tag]:
+    stmt = (
+        select(Tag)
+        .join(place_tag_association, place_tag_association.c.tag_id == Tag.id)
+        .where(place_tag_association.c.place_id == place_id)
+    )
+    return await db.get_all(stmt)
+
+
+async def _write_place_tags(db: DBUnitOfWork, place_id: UUID, tags: list[Tag], *, replace: bool) -> None:
+    if replace:
+        await db.execute(delete(place_tag_association).where(place_tag_association.c.place_id == place_id))
+    if tags:
+        await db.execute(
+            insert(place_tag_association).values([{"place_id": place_id, "tag_id": tag.id} for tag in tags]),
+        )
+
+
+def _column_values(data: dict[str, Any]) -> dict[str, Any]:
+    """Get the column values of a place from its schema fields.
+
+    The fields are set on a transient place, so that the columns the model derives on write, such as
+    the search columns of name_zh, are included.
+
+    Args:
+        data (dict[str, Any]): The fields of the place.
+
+    Returns:
+        dict[str, Any]: The values of the columns set by the fields.
+
+    """
+    place = Place(**data)
+    return {key: value for key, value in inspect(place).dict.items() if key in Place.__table__.columns}
+
+
+def _returning_columns() -> list[ColumnElement]:
+    """Get the columns a write returns to build its response.
+
+    Returns:
+        list[ColumnElement]: The columns of the place response, with the location as latitude and longitude.
+
+    """
+    return [
+        *(Place.__table__.columns[field] for field in PlaceResponse.model_fields if field in Place.__table__.columns),
+        func.ST_Y(Place.location_geom).label("latitude"),
+        func.ST_X(Place.location_geom).label("longitude"),
+    ]
+
+
+def _to_written_response(row: Row, tags: list[Tag]) -> PlaceResponse:
+    """Convert a row returned by a write to a response.
+
+    Args:
+        row (Row): The row, with the columns of _returning_columns.
+        tags (list[Tag]): The tags of the place.
+
+    Returns:
+        PlaceResponse: The place response.
+
+    """
+    location = None
+    if row.latitude is not None and row.longitude is not None:
+        location = Location(latitude=row.latitude, longitude=row.longitude)
+
+    return PlaceResponse.model_validate({**row._asdict(), "location": location, "tags": tags}, from_attributes=True)
+
+
+def _load_options(lang: Language | None) -> list[ExecutableOption]:
+    """Get the loader options for places returned in a language.
+
+    Args:
+        lang (Language | None): The language of the response, or None for a response with every name.
+
+    Returns:
+        list[ExecutableOption]: Options leaving name_zh unloaded when only English names are returned.
+
+    """
+    if lang == Language.EN_US:
+        return [defer(Place.name_zh, raiseload=True)]
+
+    return []
+
+
+def _to_response(place: Place, lang: Language | None) -> PlaceResponse | LocalizedPlaceResponse:
+    """Convert a place to a response.
+
+    Args:
+        place (Place): The place to convert.
+        lang (Language | None): The language of the response, or None for a response with every name.
+
+    Returns:
+        PlaceResponse | LocalizedPlaceResponse: The localized response if a language is given,
+        otherwise the full response.
+
+    """
+    if lang is None:
+        return PlaceResponse.model_validate(place)
+
+    return LocalizedPlaceResponse.from_place(place, lang)
+
+
+def _any_of(column: ColumnElement[UUID], ids: list[UUID]) -> ColumnElement[bool]:
+    # A single array parameter, whatever the number of IDs
+    return column == any_(literal(ids, postgresql.ARRAY(column.type)))
+
+
+def _distance(column: ColumnElement[str], q: str) -> ColumnElement[float]:
+    """Get the trigram distance between a column and a query, treating missing values as no match.
+
+    Args:
+        column (ColumnElement[str]): The column to compare.
+        q (str): The query to compare against.
+
+    Returns:
+        ColumnElement[float]: The trigram distance, between 0 (identical) and 1 (nothing in common).
+
+    """
+    return func.coalesce(cast(column.op("<->")(q), Float), 1.0)
+
+
+def _open_at(open_at: datetime) -> ColumnElement[bool]:
+    """Get the condition of the places open at a time, in the local time of each place.
 
+    A wall-clock time is the same minute of the week at every place. An instant is converted to the local time of
+    each distinct timezone rather than of each place, the timezones being found by a loose scan of their index, so
+    that the places of each timezone are found from the GiST index on (timezone, opening_minutes).
 
-async def list_places(
+    Args:
+        open_at (datetime): The time, either a wall-clock time without a timezone or an instant.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+
+    """
+    if open_at.tzinfo is None:
+        return Place.opening_minutes.contains(
+            literal(minute_of_week(open_at.isoweekday(), open_at.hour * 60 + open_at.minute), Integer),
+        )
+
+    next_place = aliased(Place, name="next_place")
+    zones = select(func.min(Place.timezone).label("timezone")).cte("zones", recursive=True)
+    next_zone = select(func.min(next_place.timezone)).where(next_place.timezone > zones.c.timezone).scalar_subquery()
+    zones = zones.union_all(select(next_zone).where(zones.c.timezone.is_not(None)))
+
+    local_time = func.timezone(zones.c.timezone, literal(open_at, DateTime(timezone=True)))
+    minute = cast(
+        (extract("isodow", local_time) - 1) * MINUTES_PER_DAY
+        + extract("hour", local_time) * 60
+        + extract("minute", local_time),
+        Integer,
+    )
+    open_place = aliased(Place, name="open_place")
+    return Place.id.in_(
+        select(open_place.id).join(
+            zones,
+            (open_place.timezone == zones.c.timezone) & open_place.opening_minutes.contains(minute),
+        ),
+    )
+
+
+def _query_match(q: str) -> ColumnElement[bool]:
+    """Get the condition of the places matching a search query.
+
+    Args:
+        q (str): The search query.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+
+    """
+    if contains_cjk(q):
+        # pg_trgm yields few usable trigrams for CJK text, so match the bigram tokens of name_zh instead
+        return Place.name_zh_tokens.contains(zh_query_tokens(q))
+
+    matches = [Place.name.op("%")(q), Place.name_zh.op("%")(q), Place.address.op("%")(q)]
+    # Latin queries may also be pinyin for a Chinese name, matched against the precomputed transliteration.
+    # A query without letters or digits, such as punctuation, has no pinyin, whose prefix would match any.
+    if q_pinyin := pinyin_query(q):
+        matches.extend(
+            (
+                Place.name_zh_pinyin.op("%")(q_pinyin),
+                Place.name_zh_pinyin.startswith(q_pinyin, autoescape=True),
+                Place.name_zh_pinyin_initials.startswith(q_pinyin, autoescape=True),
+            ),
+        )
+    return or_(*matches)
+
+
+async def _filter_places(
+    db: DBUnitOfWork,
+    stmt: Select,
+    bounds: LocationBounds | None,
+    filter_options: FilterOptions | None,
+) -> Select:
+    """Restrict a places query to the places within bounds and matching the filter query.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        stmt (Select): The query to restrict.
+        bounds (LocationBounds | None): The bounds for filtering places.
+        filter_options (FilterOptions | None): The filter options.
+
+    Returns:
+        Select: The restricted query.
+
+    """
+    # Add boundaries to the statement
+    if bounds:
+        await with_similarity_threshold(db, PLACE_SEARCH_SIMILARITY_THRESHOLD)
+        stmt = stmt.where(within_bounds(Place.location_geom, bounds))
+
+    # Add a filtering query to the statement
+    if filter_options and filter_options.q:
+        stmt = stmt.where(_query_match(filter_options.q))
+
+    # Filter on the precomputed median dish price, which needs no join with dishes
+    if filter_options and filter_options.price_range:
+        if filter_options.price_range.min_price is not None:
+            stmt = stmt.where(Place.price_median >= filter_options.price_range.min_price)
+        if filter_options.price_range.max_price is not None:
+            stmt = stmt.where(Place.price_median <= filter_options.price_range.max_price)
+
+    # Keep the places serving at least one matching dish, as a semi-join through their menus
+    if filter_options and filter_options.dish_q:
+        stmt = stmt.where(
+            select(Dish.id)
+            .join(Menu, Menu.id == Dish.menu_id)
+            .where(Menu.place_id == Place.id, dish_match(filter_options.dish_q))
+            .exists(),
+        )
+
+    # Containment can use the jsonb_path_ops GIN index on properties
+    if filter_options and filter_options.properties:
+        stmt = stmt.where(Place.properties.contains(filter_options.properties))
+
+    # Keep the places open at the given time, from their precomputed minute-of-week ranges
+    if filter_options and filter_options.open_at:
+        stmt = stmt.where(_open_at(filter_options.open_at))
+
+    return stmt
+
+
+async def list_places(  # noqa: PLR0913, PLR0917
     db: DBUnitOfWork,
     bounds: LocationBounds | None = None,
     sort_options: SortOptions | None = None,
     filter_options: FilterOptions | None = None,
     pagination_options: PaginationOptions | None = None,
-) -> tuple[list[PlaceResponse], int]:
+    lang: Language | None = None,
+    include_best_dish: bool = False,  # noqa: FBT001, FBT002
+) -> tuple[list[PlaceResponse] | list[LocalizedPlaceResponse], int]:
     """List places with optional bounds filtering.
 
+    Identical concurrent calls, such as those of every client opening the same default viewport, are
+    coalesced: the first one runs the queries, and the others share its result.
+
     Args:
         db (DBUnitOfWork): The database unit of work.
         bounds (LocationBounds): The bounds for filtering places.
         sort_options (SortOptions, optional): The sort options. Defaults to None.
         filter_options (FilterOptions): The filter options.
         pagination_options (PaginationOptions): The pagination options.
+        lang (Language | None): The language to localize names and search ranking for. Defaults to None,
+            which returns every name and ranks for English.
+        include_best_dish (bool): Whether to include the dish best matching the dish query in localized
+            responses. Defaults to False.
 
     Returns:
-        tuple[list[PlaceResponse], int]: A tuple containing a list of place responses
-        and the total count of places.
+        tuple[list[PlaceResponse] | list[LocalizedPlaceResponse], int]: A tuple containing a list of place
+        responses and the total count of places.
 
     Raises:
         InvalidSortColumnError: If the sort column is invalid.
 
     """
-    # Start with a base statement
-    stmt = select(Place).join(Place.tags, isouter=True)
-
-    # Add boundaries to the statement
-    if bounds:
-        await with_similarity_threshold(db, PLACE_SEARCH_SIMILARITY_THRESHOLD)
-        stmt = stmt.where(
-            Place.location_geom.op("&&")(
-                func.ST_MakeEnvelope(
-                    bounds.sw_lng,
-                    bounds.sw_lat,
-                    bounds.ne_lng,
-                    bounds.ne_lat,
-                    4326,
-                ),
-            ),
-        )
-
-    # Add a filtering query to the statement
-    if filter_options:
+    if sort_options and not hasattr(Place, sort_options.sort_by):
+        raise InvalidSortColumnError(sort_options.sort_by)
+
+    key = json.dumps(
+        [
+            bounds.model_dump(mode="json") if bounds else None,
+            sort_options.model_dump(mode="json") if sort_options else None,
+            filter_options.model_dump(mode="json") if filter_options else None,
+            pagination_options.model_dump(mode="json") if pagination_options else None,
+            lang,
+            include_best_dish,
+        ],
+        sort_keys=True,
+    )
+    return await _list_places_flight.do(
+        key,
+        partial(_list_places, db, bounds, sort_options, filter_options, pagination_options, lang, include_best_dish),
+    )
+
+
+async def _list_places(  # noqa: PLR0913, PLR0917
+    db: DBUnitOfWork,
+    bounds: LocationBounds | None,
+    sort_options: SortOptions | None,
+    filter_options: FilterOptions | None,
+    pagination_options: PaginationOptions | None,
+    lang: Language | None,
+    include_best_dish: bool,  # noqa: FBT001
+) -> tuple[list[PlaceResponse] | list[LocalizedPlaceResponse], int]:
+    stmt = await _filter_places(db, select(Place).options(*_load_options(lang)), bounds, filter_options)
+
+    # Only apply text search ordering if no explicit sort is requested
+    if filter_options and filter_options.q and not sort_options:
         q = filter_options.q
-        stmt = stmt.where(
-            or_(
-                Place.name.op("%")(q),
-                Place.name_zh.op("%")(q),
-                Place.address.op("%")(q),
-            ),
-        )
-        # Only apply text search ordering if no explicit sort is requested
-        if not sort_options:
-            stmt = stmt.order_by(
-                cast(Place.name.op("<->")(q), Float)
-                + cast(Place.name_zh.op("<->")(q), Float) * 1.5
-                + cast(Place.address.op("<->")(q), Float) * 2,
+        if contains_cjk(q):
+            stmt = stmt.order_by(func.cardinality(Place.name_zh_tokens))
+        else:
+            weights = PLACE_SEARCH_WEIGHTS[lang or Language.EN_US]
+            distance = (
+                _distance(Place.name, q) * weights["name"]
+                + _distance(Place.name_zh, q) * weights["name_zh"]
+                + _distance(Place.address, q) * weights["address"]
             )
+            if q_pinyin := pinyin_query(q):
+                distance += _distance(Place.name_zh_pinyin, q_pinyin) * weights["name_zh_pinyin"]
+            stmt = stmt.order_by(distance)
 
     # Get the total count after filtering
     total = await db.get_count(stmt)
 
     # Add a sorting query to the statement
     if sort_options:
-        if not hasattr(Place, sort_options.sort_by):
-            raise InvalidSortColumnError(sort_options.sort_by)
-
         stmt = sort(stmt, Place, sort_options.sort_by, sort_options.order)
 
     # Add a pagination query to the statement
@@ -153,14 +483,90 @@ async def list_places(
 
     # Execute the statement
     items = await db.get_all(stmt)
-    items = [PlaceResponse.model_validate(item) if item else None for item in items]
+    items = [_to_response(item, lang) if item else None for item in items]
+
+    if include_best_dish and lang and filter_options and filter_options.dish_q:
+        best_dishes = await best_matching_dishes(db, [item.id for item in items], filter_options.dish_q, lang)
+        for item in items:
+            dish = best_dishes.get(item.id)
+            if dish:
+                item.best_dish = MatchingDish(id=dish.id, display_name=dish.display_name, price=dish.price)
 
     return items, total
 
 
+async def list_place_facets(
+    db: DBUnitOfWork,
+    bounds: LocationBounds | None = None,
+    filter_options: FilterOptions | None = None,
+) -> PlaceFacets:
+    """Count the places matching a search per tag and per tag type.
+
+    The counts are computed in a single grouped query over the same places as list_places. Only
+    the first PLACE_FACET_CANDIDATE_LIMIT matching places are counted, so that wide viewports stay
+    cheap, in which case the counts are flagged as approximate.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        bounds (LocationBounds | None): The bounds for filtering places.
+        filter_options (FilterOptions | None): The filter options.
+
+    Returns:
+        PlaceFacets: The tag and tag type counts.
+
+    """
+    candidates = (
+        (await _filter_places(db, select(Place.id), bounds, filter_options))
+        .limit(PLACE_FACET_CANDIDATE_LIMIT + 1)
+        .subquery()
+    )
+
+    # GROUPING() tells the grouping sets apart: 1 for tags, 2 for tag types and 3 for all candidates
+    grouping = func.grouping(Tag.id, TagType.id).label("grouping")
+    stmt = (
+        select(
+            grouping,
+            Tag.id.label("tag_id"),
+            Tag.name.label("tag_name"),
+            Tag.tag_type_id,
+            TagType.id.label("type_id"),
+            TagType.name.label("tag_type_name"),
+            func.count(distinct(candidates.c.id)).label("count"),
+        )
+        .select_from(candidates)
+        .join(place_tag_association, place_tag_association.c.place_id == candidates.c.id, isouter=True)
+        .join(Tag, Tag.id == place_tag_association.c.tag_id, isouter=True)
+        .join(TagType, TagType.id == Tag.tag_type_id, isouter=True)
+        .group_by(
+            func.grouping_sets(
+                tuple_(Tag.id, Tag.name, Tag.tag_type_id),
+                tuple_(TagType.id, TagType.name),
+                tuple_(),
+            ),
+        )
+        .order_by(grouping, desc("count"))
+    )
+
+    facets = PlaceFacets()
+    for row in (await db.execute(stmt)).all():
+        if row.grouping == _TAG_GROUPING and row.tag_id is not None:
+            facets.tags.append(
+                TagFacet(id=row.tag_id, name=row.tag_name, tag_type_id=row.tag_type_id, count=row.count),
+            )
+        elif row.grouping == _TAG_TYPE_GROUPING and row.type_id is not None:
+            facets.tag_types.append(TagTypeFacet(id=row.type_id, name=row.tag_type_name, count=row.count))
+        elif row.grouping == _TOTAL_GROUPING:
+            facets.approximate = row.count > PLACE_FACET_CANDIDATE_LIMIT
+
+    return facets
+
+
 async def create_place(db: DBUnitOfWork, place_create: PlaceCreate) -> PlaceResponse:
     """Create a new place.
 
+    The response is built from the row returned by the INSERT and the tags already loaded to validate
+    them, so nothing is read back after the commit.
+
     Args:
         db (DBUnitOfWork): The database unit of work.
         place_create (PlaceCreate): The place creation data.
@@ -173,37 +579,73 @@ async def create_place(db: DBUnitOfWork, place_create: PlaceCreate) -> PlaceResp
         ValidationError: If there is a validation error.
 
     """
-    place = Place(**place_create.model_dump(exclude={"tag_ids"}))
-    await _assign_tags_to_place(db, place, place_create.tag_ids)
-    await db.add(place)
+    tags = await _get_valid_tags(db, place_create.tag_ids)
+    values = _column_values(place_create.model_dump(exclude={"tag_ids"}))
 
     try:
+        row = (await db.execute(insert(Place).values(values).returning(*_returning_columns()))).one()
+        await _write_place_tags(db, row.id, tags, replace=False)
         await db.commit()
     except IntegrityError as e:
-        if f"Key (google_maps_place_id)=({place.google_maps_place_id}) already exists" in str(e):
-            raise DuplicateGoogleMapsPlaceIdError(place.google_maps_place_id) from e
+        if f"Key (google_maps_place_id)=({place_create.google_maps_place_id}) already exists" in str(e):
+            raise DuplicateGoogleMapsPlaceIdError(place_create.google_maps_place_id) from e
 
         raise ValidationError from e
 
-    await db.refresh(place)
-
-    return PlaceResponse.model_validate(place)
+    return _to_written_response(row, tags)
 
 
-async def get_place(db: DBUnitOfWork, place_id: UUID) -> PlaceResponse:
+async def get_place(
+    db: DBUnitOfWork,
+    place_id: UUID,
+    lang: Language | None = None,
+) -> PlaceResponse | LocalizedPlaceResponse:
     """Get a place by its ID.
 
     Args:
         db (DBUnitOfWork): The database unit of work.
         place_id (UUID): The ID of the place to retrieve.
+        lang (Language | None): The language to localize the name in. Defaults to None, which returns every name.
 
     Returns:
-        PlaceResponse: The place response.
+        PlaceResponse | LocalizedPlaceResponse: The place response.
+
+    """
+    place = await _get_place_by_id(db, place_id, _load_options(lang))
+
+    return _to_response(place, lang)
+
+
+async def get_places(
+    db: DBUnitOfWork,
+    place_ids: list[UUID],
+    lang: Language | None = None,
+) -> PlaceBatchGetResponse:
+    """Get many places by their IDs at once.
+
+    The places are read with a single query, their tags with a single selectin load, and are returned
+    in the requested order, each once.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_ids (list[UUID]): The IDs of the places to retrieve.
+        lang (Language | None): The language to localize the names in. Defaults to None, which returns every name.
+
+    Returns:
+        PlaceBatchGetResponse: The places found, and the IDs of the places not found.
 
     """
-    place = await _get_place_by_id(db, place_id)
+    place_ids = list(dict.fromkeys(place_ids))
+    if not place_ids:
+        return PlaceBatchGetResponse()
+
+    stmt = select(Place).options(*_load_options(lang)).where(_any_of(Place.id, place_ids))
+    places = {place.id: place for place in await db.get_all(stmt)}
 
-    return PlaceResponse.model_validate(place)
+    return PlaceBatchGetResponse(
+        items=[_to_response(places[place_id], lang) for place_id in place_ids if place_id in places],
+        missing=[place_id for place_id in place_ids if place_id not in places],
+    )
 
 
 async def update_place(
@@ -213,6 +655,10 @@ async def update_place(
 ) -> PlaceResponse:
     """Update a place by its ID.
 
+    The place is updated without being loaded first, and the response is built from the row returned by
+    the UPDATE and the tags already loaded to validate them. The tags of the place are replaced only if
+    tag IDs are given; use add_place_tags and remove_place_tags to change some of them.
+
     Args:
         db (DBUnitOfWork): The database unit of work.
         place_id (UUID): The ID of the place to update.
@@ -223,44 +669,399 @@ async def update_place(
 
     Raises:
         DuplicateGoogleMapsPlaceIdError: If the Google Maps Place ID already exists.
+        ObjectNotFoundError: If the place is not found.
         ValidationError: If there is a validation error.
 
     """
-    place = await _get_place_by_id(db, place_id)
+    replace_tags = place_update.tag_ids is not None
+    tags = await _get_valid_tags(db, place_update.tag_ids) if replace_tags else []
+    values = _column_values(place_update.model_dump(exclude_unset=True, exclude={"tag_ids"}))
+
+    try:
+        stmt = update(Place).where(Place.id == place_id).values(values).returning(*_returning_columns())
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            raise ObjectNotFoundError(Place.__name__, place_id)
+
+        if replace_tags:
+            await _write_place_tags(db, place_id, tags, replace=True)
+        else:
+            tags = await _get_place_tags(db, place_id)
+        await db.commit()
+    except IntegrityError as e:
+        if f"Key (google_maps_place_id)=({place_update.google_maps_place_id}) already exists" in str(e):
+            raise DuplicateGoogleMapsPlaceIdError(place_update.google_maps_place_id) from e
+
+        raise ValidationError from e
+
+    return _to_written_response(row, tags)
+
+
+# Columns written by a bulk upsert, including the search and opening hours columns derived on write
+_BULK_UPSERT_COLUMNS = (
+    "name",
+    "name_zh",
+    "name_zh_tokens",
+    "name_zh_pinyin",
+    "name_zh_pinyin_initials",
+    "type",
+    "address",
+    "location_geom",
+    "google_maps_url",
+    "google_maps_place_id",
+    "phone_number",
+    "website_url",
+    "opening_hours",
+    "opening_minutes",
+    "timezone",
+    "properties",
+)
+
 
-    place.update(place_update)
-    await _assign_tags_to_place(db, place, place_update.tag_ids)
-    await db.add(place)
+def _validate_bulk_upsert(places: list[PlaceCreate], known_tag_ids: set[UUID]) -> dict[int, str]:
+    """Find the places of a bulk upsert that cannot be written.
 
+    Args:
+        places (list[PlaceCreate]): The places to upsert.
+        known_tag_ids (set[UUID]): The IDs of the existing tags among the tags of the places.
+
+    Returns:
+        dict[int, str]: The error of each invalid place, by index.
+
+    """
+    errors = {}
+    seen = set()
+    for index, place in enumerate(places):
+        unknown_tag_ids = [tag_id for tag_id in place.tag_ids if tag_id not in known_tag_ids]
+        if not place.google_maps_place_id:
+            errors[index] = str(MissingGoogleMapsPlaceIdError())
+        elif place.google_maps_place_id in seen:
+            # ON CONFLICT cannot update the same row twice in one statement
+            errors[index] = str(DuplicateGoogleMapsPlaceIdError(place.google_maps_place_id))
+        elif unknown_tag_ids:
+            errors[index] = str(InvalidTagIdError(unknown_tag_ids))
+        seen.add(place.google_maps_place_id)
+
+    return errors
+
+
+def _bulk_upsert_statement(rows: list[dict[str, Any]]) -> postgresql.Insert:
+    stmt = postgresql.insert(Place).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Place.google_maps_place_id],
+        set_={column: stmt.excluded[column] for column in _BULK_UPSERT_COLUMNS} | {"updated_at": func.now()},
+    ).returning(
+        Place.id,
+        Place.google_maps_place_id,
+        # xmax is only zero for rows inserted by this transaction
+        (literal_column("xmax") == 0).label("inserted"),
+    )
+
+
+async def _write_bulk_upsert(
+    db: DBUnitOfWork,
+    places: list[PlaceCreate],
+    rows: list[dict[str, Any]],
+    errors: dict[int, str],
+    report: Callable[[int, int | None], Awaitable[None]] | None,
+) -> dict[str, Row]:
+    upserted = {}
+    # Constraints the conflict target does not cover are violated by the upsert itself, not only by the commit
     try:
+        for start in range(0, len(rows), PLACE_BULK_UPSERT_CHUNK_SIZE):
+            stmt = _bulk_upsert_statement(rows[start : start + PLACE_BULK_UPSERT_CHUNK_SIZE])
+            upserted.update({row.google_maps_place_id: row for row in (await db.execute(stmt)).all()})
+            if report:
+                await report(len(errors) + len(upserted), len(places))
+
+        place_ids = [row.id for row in upserted.values()]
+        place_tags = [
+            {"place_id": upserted[place.google_maps_place_id].id, "tag_id": tag_id}
+            for index, place in enumerate(places)
+            if index not in errors
+            for tag_id in dict.fromkeys(place.tag_ids)
+        ]
+        await db.execute(delete(place_tag_association).where(place_tag_association.c.place_id.in_(place_ids)))
+        if place_tags:
+            await db.execute(insert(place_tag_association).values(place_tags))
         await db.commit()
     except IntegrityError as e:
-        if f"Key (google_maps_place_id)=({place.google_maps_place_id}) already exists" in str(e):
-            raise DuplicateGoogleMapsPlaceIdError(place.google_maps_place_id) from e
+        raise ValidationError from e
 
+    return upserted
+
+
+async def bulk_upsert_places(
+    db: DBUnitOfWork,
+    places: list[PlaceCreate],
+    report: Callable[[int, int | None], Awaitable[None]] | None = None,
+) -> PlaceBulkUpsertResponse:
+    """Create or update many places at once, matched by their Google Maps Place ID.
+
+    The valid places are written with an INSERT ... ON CONFLICT (google_maps_place_id) DO UPDATE for every
+    PLACE_BULK_UPSERT_CHUNK_SIZE places, and their tags are replaced with a single DELETE and a single
+    multi-row INSERT, all in one transaction. Places without a Google Maps Place ID, repeating one of an
+    earlier place or with unknown tags are reported as failed and skipped, and a ValidationError is raised
+    if the other places could not be written.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        places (list[PlaceCreate]): The places to upsert.
+        report (Callable[[int, int | None], Awaitable[None]] | None): Called with the number of places
+            done and their total after each chunk. Defaults to None.
+
+    Returns:
+        PlaceBulkUpsertResponse: The outcome of each place, in order.
+
+    """
+    tag_ids = {tag_id for place in places for tag_id in place.tag_ids}
+    known_tag_ids = set((await db.execute(select(Tag.id).where(Tag.id.in_(tag_ids)))).scalars()) if tag_ids else set()
+    errors = _validate_bulk_upsert(places, known_tag_ids)
+
+    rows = []
+    for index, place_create in enumerate(places):
+        if index in errors:
+            continue
+        # The model derives the search and opening hours columns, as it does for a single place
+        place = Place(**place_create.model_dump(exclude={"tag_ids"}))
+        rows.append({column: getattr(place, column) for column in _BULK_UPSERT_COLUMNS})
+
+    upserted = await _write_bulk_upsert(db, places, rows, errors, report) if rows else {}
+
+    response = PlaceBulkUpsertResponse()
+    for index, place in enumerate(places):
+        if index in errors:
+            status = PlaceUpsertStatus.FAILED
+            place_id = None
+            response.failed += 1
+        elif upserted[place.google_maps_place_id].inserted:
+            status = PlaceUpsertStatus.CREATED
+            place_id = upserted[place.google_maps_place_id].id
+            response.created += 1
+        else:
+            status = PlaceUpsertStatus.UPDATED
+            place_id = upserted[place.google_maps_place_id].id
+            response.updated += 1
+
+        response.results.append(
+            PlaceUpsertResult(
+                index=index,
+                google_maps_place_id=place.google_maps_place_id,
+                id=place_id,
+                status=status,
+                error=errors.get(index),
+            ),
+        )
+
+    return response
+
+
+async def _find_missing_place_id(db: DBUnitOfWork, place_ids: list[UUID]) -> UUID | None:
+    found = set((await db.execute(select(Place.id).where(_any_of(Place.id, place_ids)))).scalars())
+    return next((place_id for place_id in place_ids if place_id not in found), None)
+
+
+async def _tags_exist(db: DBUnitOfWork, tag_ids: list[UUID]) -> bool:
+    found = set((await db.execute(select(Tag.id).where(_any_of(Tag.id, tag_ids)))).scalars())
+    return found == set(tag_ids)
+
+
+async def _insert_place_tags(db: DBUnitOfWork, place_ids: list[UUID], tag_ids: list[UUID]) -> int:
+    if not place_ids or not tag_ids:
+        return 0
+
+    stmt = (
+        postgresql.insert(place_tag_association)
+        .from_select(
+            ["place_id", "tag_id"],
+            select(Place.id, Tag.id).where(_any_of(Place.id, place_ids), _any_of(Tag.id, tag_ids)),
+        )
+        .on_conflict_do_nothing()
+    )
+    return (await db.execute(stmt)).rowcount
+
+
+async def _delete_place_tags(db: DBUnitOfWork, place_ids: list[UUID], tag_ids: list[UUID]) -> int:
+    if not place_ids or not tag_ids:
+        return 0
+
+    stmt = delete(place_tag_association).where(
+        _any_of(place_tag_association.c.place_id, place_ids),
+        _any_of(place_tag_association.c.tag_id, tag_ids),
+    )
+    return (await db.execute(stmt)).rowcount
+
+
+async def _change_place_tags(
+    db: DBUnitOfWork,
+    place_ids: list[UUID],
+    add_tag_ids: list[UUID],
+    remove_tag_ids: list[UUID],
+) -> PlaceTagsChangeResponse:
+    try:
+        removed = await _delete_place_tags(db, place_ids, remove_tag_ids)
+        added = await _insert_place_tags(db, place_ids, add_tag_ids)
+        await db.commit()
+    except IntegrityError as e:
         raise ValidationError from e
 
-    await db.refresh(place)
+    return PlaceTagsChangeResponse(added=added, removed=removed)
 
-    return PlaceResponse.model_validate(place)
+
+async def add_place_tags(db: DBUnitOfWork, place_id: UUID, tag_ids: list[UUID]) -> PlaceTagsChangeResponse:
+    """Add tags to a place, leaving its other tags unchanged.
+
+    The tags are added with a single INSERT ... ON CONFLICT DO NOTHING, without loading the tags of the
+    place, so tags the place already has are skipped.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_id (UUID): The ID of the place.
+        tag_ids (list[UUID]): The IDs of the tags to add.
+
+    Returns:
+        PlaceTagsChangeResponse: The number of tags added.
+
+    Raises:
+        InvalidTagIdError: If a tag is not found.
+        ObjectNotFoundError: If the place is not found.
+
+    """
+    if await _find_missing_place_id(db, [place_id]):
+        raise ObjectNotFoundError(Place.__name__, place_id)
+    if tag_ids and not await _tags_exist(db, tag_ids):
+        raise InvalidTagIdError(tag_ids)
+
+    return await _change_place_tags(db, [place_id], tag_ids, [])
+
+
+async def remove_place_tags(db: DBUnitOfWork, place_id: UUID, tag_ids: list[UUID]) -> PlaceTagsChangeResponse:
+    """Remove tags from a place, leaving its other tags unchanged.
+
+    The tags are removed with a single DELETE, tags the place does not have being ignored.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_id (UUID): The ID of the place.
+        tag_ids (list[UUID]): The IDs of the tags to remove.
+
+    Returns:
+        PlaceTagsChangeResponse: The number of tags removed.
+
+    Raises:
+        ObjectNotFoundError: If the place is not found.
+
+    """
+    if await _find_missing_place_id(db, [place_id]):
+        raise ObjectNotFoundError(Place.__name__, place_id)
+
+    return await _change_place_tags(db, [place_id], [], tag_ids)
+
+
+async def update_places_tags(db: DBUnitOfWork, batch: PlaceTagsBatch) -> PlaceTagsChangeResponse:
+    """Add tags to and remove tags from many places at once.
+
+    Whatever the number of places and tags, the tags are removed with a single DELETE and added with a
+    single INSERT ... ON CONFLICT DO NOTHING, in one transaction.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        batch (PlaceTagsBatch): The places and the tags to add and remove.
+
+    Returns:
+        PlaceTagsChangeResponse: The number of place tags added and removed.
+
+    Raises:
+        InvalidTagIdError: If a tag to add is not found.
+        ObjectNotFoundError: If a place is not found.
+
+    """
+    if not batch.place_ids:
+        return PlaceTagsChangeResponse()
+
+    missing_place_id = await _find_missing_place_id(db, batch.place_ids)
+    if missing_place_id:
+        raise ObjectNotFoundError(Place.__name__, missing_place_id)
+    if batch.add_tag_ids and not await _tags_exist(db, batch.add_tag_ids):
+        raise InvalidTagIdError(batch.add_tag_ids)
+
+    return await _change_place_tags(db, batch.place_ids, batch.add_tag_ids, batch.remove_tag_ids)
 
 
 async def delete_place(db: DBUnitOfWork, place_id: UUID) -> None:
     """Delete a place by its ID.
 
+    The place is deleted without being loaded, its tags, menus and menu snapshots being deleted by the
+    ON DELETE CASCADE of their foreign keys.
+
     Args:
         db (DBUnitOfWork): The database unit of work.
         place_id (UUID): The ID of the place to delete.
 
+    Raises:
+        ObjectNotFoundError: If the place is not found.
+
     """
-    place = await _get_place_by_id(db, place_id)
+    result = await db.execute(delete(Place).where(Place.id == place_id))
+    if result.rowcount == 0:
+        raise ObjectNotFoundError(Place.__name__, place_id)
 
-    await db.delete(place)
     await db.commit()
 
 
+async def bulk_delete_places(
+    db: DBUnitOfWork,
+    place_ids: list[UUID] | None = None,
+    bounds: LocationBounds | None = None,
+    filter_options: FilterOptions | None = None,
+) -> PlaceBulkDeleteResponse:
+    """Delete many places at once, selected by their IDs, by bounds and filters, or both.
+
+    The places are deleted with a single DELETE, whatever their number, their tags, menus and menu
+    snapshots being deleted by the ON DELETE CASCADE of their foreign keys. Only exact filters select
+    places, never the similarity and prefix matches of the search queries.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        place_ids (list[UUID] | None): The IDs of the places to delete. Defaults to None, which selects
+            the places by bounds and filters only.
+        bounds (LocationBounds | None): The bounds of the places to delete. Defaults to None.
+        filter_options (FilterOptions | None): The filters of the places to delete. Defaults to None.
+
+    Returns:
+        PlaceBulkDeleteResponse: The number of places deleted.
+
+    Raises:
+        InexactPlaceSelectionError: If the places are selected by a search query.
+        ValidationError: If the places could not be deleted.
+
+    """
+    if filter_options and (filter_options.q is not None or filter_options.dish_q is not None):
+        raise InexactPlaceSelectionError
+
+    selected = select(Place.id)
+    if place_ids is not None:
+        selected = selected.where(_any_of(Place.id, place_ids))
+    selected = await _filter_places(db, selected, bounds, filter_options)
+
+    try:
+        result = await db.execute(delete(Place).where(Place.id.in_(selected)))
+        await db.commit()
+    except IntegrityError as e:
+        raise ValidationError from e
+
+    return PlaceBulkDeleteResponse(deleted=result.rowcount)
+
+
 class DuplicateGoogleMapsPlaceIdError(ValidationError):
     """Custom error for duplicate Google Maps Place ID."""
 
     def __init__(self, google_maps_place_id: UUID) -> None:
         super().__init__(f"Duplicate Google Maps Place ID: {google_maps_place_id}")
+
+
+class MissingGoogleMapsPlaceIdError(ValidationError):
+    """Custom error for a missing Google Maps Place ID."""
+
+    def __init__(self) -> None:
+        super().__init__("Missing Google Maps Place ID: places are matched by their Google Maps Place ID")
@@ -0,0 +1,354 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.db import get_async_session_maker
+from app.db.uow import DBUnitOfWork
+from app.models.associations import place_tag_association
+from app.models.place import Place
+from app.models.tag import Tag
+from app.schemas.places import Location, PlaceSuggestion
+from app.utils.text import normalize_zh
+
+SUGGESTION_MAX_PREFIX_LENGTH = 12
+SUGGESTION_NGRAM_SIZE = 3
+SUGGESTION_NGRAM_MIN_OVERLAP = 0.5
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(value: str | None) -> list[str]:
+    """Split a string into normalized word tokens.
+
+    Args:
+        value (str | None): The string to tokenize.
+
+    Returns:
+        list[str]: The normalized tokens.
+
+    """
+    if not value:
+        return []
+
+    return _TOKEN_PATTERN.findall(normalize_zh(value))
+
+
+def ngrams(token: str, size: int = SUGGESTION_NGRAM_SIZE) -> set[str]:
+    """Get the padded n-grams of a token, in the same way pg_trgm pads words.
+
+    Args:
+        token (str): The token to split.
+        size (int): The n-gram size.
+
+    Returns:
+        set[str]: The n-grams of the token.
+
+    """
+    padded = f"{' ' * (size - 1)}{token} "
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+class PlaceSuggestionIndex:
+    """In-memory prefix and n-gram index over place names and tag names.
+
+    Every place occupies an integer slot, and the posting lists map each term prefix and each
+    term n-gram to the set of slots containing it. Prefix lookups answer type-ahead queries,
+    while n-gram overlap catches typos and infix matches.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._slots: dict[UUID, int] = {}
+        self._free_slots: list[int] = []
+        self._entries: list[PlaceSuggestion | None] = []
+        self._name_terms: list[frozenset[str]] = []
+        self._tag_terms: list[frozenset[str]] = []
+        self._prefixes: defaultdict[str, set[int]] = defaultdict(set)
+        self._ngrams: defaultdict[str, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        """Get the number of indexed places.
+
+        Returns:
+            int: The number of indexed places.
+
+        """
+        return len(self._slots)
+
+    def upsert(
+        self,
+        entry: PlaceSuggestion,
+        tag_names: list[str] | None = None,
+        aliases: list[str | None] | None = None,
+    ) -> None:
+        """Add a place to the index, replacing any previous version of it.
+
+        Args:
+            entry (PlaceSuggestion): The suggestion to return for the place.
+            tag_names (list[str] | None): The names of the tags assigned to the place.
+            aliases (list[str | None] | None): Other spellings of the name, such as its pinyin.
+
+        """
+        self.remove(entry.id)
+
+        name_terms = frozenset(
+            tokenize(entry.name)
+            + tokenize(entry.name_zh)
+            + [term for alias in aliases or [] for term in tokenize(alias)],
+        )
+        tag_terms = frozenset(term for tag_name in tag_names or [] for term in tokenize(tag_name))
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._entries[slot] = entry
+            self._name_terms[slot] = name_terms
+            self._tag_terms[slot] = tag_terms
+        else:
+            slot = len(self._entries)
+            self._entries.append(entry)
+            self._name_terms.append(name_terms)
+            self._tag_terms.append(tag_terms)
+
+        self._slots[entry.id] = slot
+        for term in name_terms | tag_terms:
+            for key in self._term_keys(term):
+                self._prefixes[key].add(slot)
+            for gram in ngrams(term):
+                self._ngrams[gram].add(slot)
+
+    def remove(self, place_id: UUID) -> None:
+        """Remove a place from the index.
+
+        Args:
+            place_id (UUID): The ID of the place to remove.
+
+        """
+        slot = self._slots.pop(place_id, None)
+        if slot is None:
+            return
+
+        for term in self._name_terms[slot] | self._tag_terms[slot]:
+            for key in self._term_keys(term):
+                self._discard(self._prefixes, key, slot)
+            for gram in ngrams(term):
+                self._discard(self._ngrams, gram, slot)
+
+        self._entries[slot] = None
+        self._name_terms[slot] = frozenset()
+        self._tag_terms[slot] = frozenset()
+        self._free_slots.append(slot)
+
+    def search(self, q: str, limit: int = 10) -> list[PlaceSuggestion]:
+        """Search the index.
+
+        Every query token must match a name or tag term of the place, either as a prefix or
+        through n-gram overlap. Results are ranked by how closely the tokens match.
+
+        Args:
+            q (str): The query string.
+            limit (int): The maximum number of suggestions to return.
+
+        Returns:
+            list[PlaceSuggestion]: The best matching suggestions.
+
+        """
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+
+        candidates: set[int] | None = None
+        for token in tokens:
+            matched = self._match(token)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return []
+
+        phrase = normalize_zh(q).strip()
+        best = heapq.nsmallest(
+            limit,
+            candidates,
+            key=lambda slot: (-self._score(slot, tokens, phrase), self._entries[slot].name),
+        )
+        return [self._entries[slot] for slot in best]
+
+    def _match(self, token: str) -> set[int]:
+        matched = set(self._prefixes.get(token[:SUGGESTION_MAX_PREFIX_LENGTH], ()))
+        if len(token) > SUGGESTION_MAX_PREFIX_LENGTH:
+            matched = {slot for slot in matched if self._has_prefix(slot, token)}
+
+        if len(token) >= SUGGESTION_NGRAM_SIZE:
+            grams = ngrams(token)
+            overlap = Counter(slot for gram in grams for slot in self._ngrams.get(gram, ()))
+            threshold = math.ceil(len(grams) * SUGGESTION_NGRAM_MIN_OVERLAP)
+            matched.update(slot for slot, count in overlap.items() if count >= threshold)
+
+        return matched
+
+    def _has_prefix(self, slot: int, token: str) -> bool:
+        return any(term.startswith(token) for term in self._name_terms[slot] | self._tag_terms[slot])
+
+    def _score(self, slot: int, tokens: list[str], phrase: str) -> float:
+        score = 0.0
+        for token in tokens:
+            name_score = max((self._term_score(term, token) for term in self._name_terms[slot]), default=0.0)
+            tag_score = max((self._term_score(term, token) for term in self._tag_terms[slot]), default=0.0)
+            score += max(name_score, tag_score * 0.5)
+
+        if normalize_zh(self._entries[slot].name).startswith(phrase):
+            score += 1.0
+
+        return score / len(tokens)
+
+    @staticmethod
+    def _term_score(term: str, token: str) -> float:
+        if term == token:
+            return 1.0
+        if term.startswith(token):
+            return 0.75
+
+        term_grams = ngrams(term)
+        token_grams = ngrams(token)
+        return 0.5 * len(term_grams & token_grams) / len(term_grams | token_grams)
+
+    @staticmethod
+    def _term_keys(term: str) -> list[str]:
+        return [term[:length] for length in range(1, min(len(term), SUGGESTION_MAX_PREFIX_LENGTH) + 1)]
+
+    @staticmethod
+    def _discard(postings: defaultdict[str, set[int]], key: str, slot: int) -> None:
+        slots = postings.get(key)
+        if slots is None:
+            return
+
+        slots.discard(slot)
+        if not slots:
+            del postings[key]
+
+
+_suggestion_index = PlaceSuggestionIndex()
+# The places refreshed during each build of the index in progress
+_rebuild_refreshes: list[set[UUID]] = []
+
+
+def get_suggestion_index() -> PlaceSuggestionIndex:
+    """Get the process-wide suggestion index.
+
+    Returns:
+        PlaceSuggestionIndex: The suggestion index.
+
+    """
+    return _suggestion_index
+
+
+async def load_place_suggestions(
+    db: DBUnitOfWork,
+    index: PlaceSuggestionIndex,
+    place_ids: list[UUID] | None = None,
+) -> None:
+    """Load places into a suggestion index.
+
+    Args:
+        db (DBUnitOfWork): The database unit of work.
+        index (PlaceSuggestionIndex): The index to load the places into.
+        place_ids (list[UUID] | None): The places to load. Loads every place when None. Places that
+            no longer exist are removed from the index.
+
+    """
+    places_stmt = select(
+        Place.id,
+        Place.name,
+        Place.name_zh,
+        Place.name_zh_pinyin,
+        Place.name_zh_pinyin_initials,
+        func.ST_Y(Place.location_geom).label("latitude"),
+        func.ST_X(Place.location_geom).label("longitude"),
+    )
+    tags_stmt = select(place_tag_association.c.place_id, Tag.name).join(
+        Tag,
+        Tag.id == place_tag_association.c.tag_id,
+    )
+
+    if place_ids is not None:
+        places_stmt = places_stmt.where(Place.id.in_(place_ids))
+        tags_stmt = tags_stmt.where(place_tag_association.c.place_id.in_(place_ids))
+
+    tag_names: defaultdict[UUID, list[str]] = defaultdict(list)
+    for place_id, tag_name in (await db.execute(tags_stmt)).all():
+        tag_names[place_id].append(tag_name)
+
+    found = set()
+    for row in (await db.execute(places_stmt)).all():
+        location = None
+        if row.latitude is not None and row.longitude is not None:
+            location = Location(latitude=row.latitude, longitude=row.longitude)
+
+        index.upsert(
+            PlaceSuggestion(id=row.id, name=row.name, name_zh=row.name_zh, location=location),
+            tag_names[row.id],
+            [row.name_zh_pinyin, row.name_zh_pinyin_initials],
+        )
+        found.add(row.id)
+
+    for place_id in set(place_ids or []) - found:
+        index.remove(place_id)
+
+
+async def build_suggestion_index() -> None:
+    """Build the suggestion index from scratch and swap it in.
+
+    The new index is built on the side, so that suggestions keep being served from the old
+    index until the new one is complete. Places refreshed in the meantime may have been read
+    before they changed, so they are loaded again into the new index before it is swapped in.
+    """
+    global _suggestion_index  # noqa: PLW0603
+
+    index = PlaceSuggestionIndex()
+    refreshed: set[UUID] = set()
+    _rebuild_refreshes.append(refreshed)
+    try:
+        async with DBUnitOfWork(get_async_session_maker()) as db:
+            await load_place_suggestions(db, index)
+            while refreshed:
+                place_ids = list(refreshed)
+                refreshed.clear()
+                await load_place_suggestions(db, index, place_ids)
+
+            # Swapped in without awaiting after the last replay, so that no refresh is missed
+            _suggestion_index = index
+    finally:
+        _rebuild_refreshes.remove(refreshed)
+
+
+async def refresh_place_suggestions(payloads: set[str]) -> None:
+    """Refresh the suggestion index for places reported as changed.
+
+    The places are also recorded for the indexes being built, which replay them.
+
+    Args:
+        payloads (set[str]): The IDs of the changed places, as sent on the change channel.
+
+    """
+    place_ids = [UUID(payload) for payload in payloads]
+    for refreshed in _rebuild_refreshes:
+        refreshed.update(place_ids)
+
+    async with DBUnitOfWork(get_async_session_maker()) as db:
+        await load_place_suggestions(db, _suggestion_index, place_ids)
+
+
+def suggest_places(q: str, limit: int = 10) -> list[PlaceSuggestion]:
+    """Suggest places for a type-ahead query.
+
+    Args:
+        q (str): The query string.
+        limit (int): The maximum number of suggestions to return.
+
+    Returns:
+        list[PlaceSuggestion]: The suggested places.
+
+    """
+    return _suggestion_index.search(q, limit)
@@ -46,9 +46,47 @@ class Settings(BaseSettings):
             f"postgresql+asyncpg://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def db_dsn(self) -> str:
+        """Get the plain database DSN for direct asyncpg connections.
+
+        Returns:
+            str: The database DSN.
+
+        """
+        return f"postgresql://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+    # Connections of the pool of each process, which, less those reserved for background jobs and the suggestion
+    # index, also bound the requests using the database at once
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    # Requests waiting for a connection beyond the pool, and seconds they wait before being rejected
+    db_admission_queue_size: int = 100
+    db_admission_queue_timeout: float = 2.0
+
+    # Seconds a request may use the database for, by default, for searches and for admin requests
+    request_timeout: float = 5.0
+    search_request_timeout: float = 3.0
+    admin_request_timeout: float = 60.0
+
+    # Requests each client can burst, refilled at this many per second, per process or shared through the database
+    rate_limit_capacity: int = 60
+    rate_limit_refill_rate: float = 10.0
+    rate_limit_backend: Literal["memory", "postgres"] = "memory"
+
+    # Connections of the pool dedicated to rate limits shared through the database, and seconds a request waits
+    # for one before falling back to the rate limits of its process
+    rate_limit_db_pool_size: int = 2
+    rate_limit_db_pool_timeout: float = 0.5
+
     cors_allow_origins: Annotated[str | None, str_to_list] = "*"
     place_search_similarity_threshold: float | None = None
 
+    # Number of background jobs run at once by each process, none being run by a process with 0
+    job_concurrency: int = 2
+    job_poll_interval: float = 1.0
+
     aws_region: str
     aws_auth_domain: str
     aws_cognito_client_id: str
@@ -0,0 +1,95 @@
+import asyncio
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import Counter
+
+CANCELLED = Counter(
+    "weat_requests_cancelled_total",
+    "Requests cancelled because their client disconnected before the response was sent.",
+)
+
+
+class CancelOnDisconnectMiddleware:
+    """Middleware cancelling requests whose client disconnects before the response is sent.
+
+    The application runs in its own task while the messages of the request are read ahead of it, so that a
+    disconnect is seen while the application is busy, such as waiting for a query. The task is then cancelled,
+    which has asyncpg ask Postgres to cancel the running query rather than let it run for nobody. Requests
+    whose response was sent are not cancelled, so that their background tasks still run.
+
+    At most one message is read ahead of the application, so that the body of a request is not buffered in
+    memory before the application reads it; a disconnect is seen once the application has read the body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The application.
+
+        """
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run an HTTP request, cancelling it if its client disconnects first.
+
+        Args:
+            scope (Scope): The scope of the request.
+            receive (Receive): Receives the messages of the request.
+            send (Send): Sends the messages of the response.
+
+        Raises:
+            CancelledError: If the request itself is cancelled.
+
+        """
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        response_sent = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_sent
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_sent = True
+            await send(message)
+
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+        async def receive_read_ahead() -> Message:
+            # The disconnect is not queued if the application had not read the message before it yet
+            if messages.empty() and disconnected.done():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        app_task = asyncio.create_task(self._app(scope, receive_read_ahead, send_tracking))
+        disconnected = asyncio.create_task(self._read_until_disconnect(receive, messages))
+        try:
+            await asyncio.wait((app_task, disconnected), return_when=asyncio.FIRST_COMPLETED)
+            if not app_task.done():
+                # Raises the error of receiving, if any, rather than taking it for a disconnect
+                disconnected.result()
+                if not response_sent:
+                    CANCELLED.inc()
+                    app_task.cancel()
+            try:
+                await app_task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+        finally:
+            disconnected.cancel()
+            app_task.cancel()
+
+    @staticmethod
+    async def _read_until_disconnect(receive: Receive, messages: asyncio.Queue[Message]) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                # Wakes the application if it is waiting for a message, without waiting for it to read one
+                if not messages.full():
+                    messages.put_nowait(message)
+                return
+            # Waits for the application to read the previous message, so that the body is not buffered
+            await messages.put(message)
@@ -0,0 +1,46 @@
+import hashlib
+
+
+def make_etag(content: bytes) -> str:
+    """Make a strong ETag for a response body.
+
+    Args:
+        content (bytes): The response body.
+
+    Returns:
+        str: The quoted ETag.
+
+    """
+    return quote_etag(hashlib.sha256(content).hexdigest())
+
+
+def quote_etag(tag: str) -> str:
+    """Quote an opaque tag for use as a strong ETag.
+
+    Args:
+        tag (str): The opaque tag, such as a content hash.
+
+    Returns:
+        str: The quoted ETag.
+
+    """
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an If-None-Match header matches an ETag.
+
+    Args:
+        if_none_match (str | None): The If-None-Match header value, if any.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client already has the current representation.
+
+    """
+    if not if_none_match:
+        return False
+
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
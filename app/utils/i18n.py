@@ -0,0 +1,19 @@
+from app.constants import Language
+
+
+def localize(name: str, name_zh: str | None, lang: Language) -> str:
+    """Pick the name to display in a language.
+
+    Args:
+        name (str): The English name.
+        name_zh (str | None): The Chinese name, if any.
+        lang (Language): The requested language.
+
+    Returns:
+        str: The Chinese name for Chinese requests when there is one, otherwise the English name.
+
+    """
+    if lang == Language.ZH_CN and name_zh:
+        return name_zh
+
+    return name
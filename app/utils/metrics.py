@@ -0,0 +1,116 @@
+from collections.abc import Callable
+
+# Every metric created, in the order they were created, rendered by render_metrics
+_registry: list["Counter | Gauge"] = []
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels.
+
+    Counters are kept in memory per process and rendered in the Prometheus text format, so that each
+    worker process is scraped as its own instance.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        """Initialize and register the counter.
+
+        Args:
+            name (str): The name of the counter.
+            description (str): The description of the counter.
+            labels (tuple[str, ...]): The names of the labels of the counter. Defaults to none.
+
+        """
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount (float): The amount to add. Defaults to 1.
+            **labels (str): The value of each label of the counter.
+
+        """
+        key = tuple(labels[label] for label in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the value of the counter.
+
+        Args:
+            **labels (str): The value of each label of the counter.
+
+        Returns:
+            float: The value, 0 if never incremented.
+
+        """
+        return self._values.get(tuple(labels[label] for label in self.labels), 0)
+
+    def samples(self) -> list[tuple[tuple[str, ...], float]]:
+        """Get the values of the counter.
+
+        Returns:
+            list[tuple[tuple[str, ...], float]]: The label values and value of each sample.
+
+        """
+        return sorted(self._values.items())
+
+
+class Gauge(Counter):
+    """Value that goes up and down, optionally read from a callback when rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, function: Callable[[], float] | None = None) -> None:
+        """Initialize and register the gauge.
+
+        Args:
+            name (str): The name of the gauge.
+            description (str): The description of the gauge.
+            function (Callable[[], float] | None): Called for the value of the gauge. Defaults to None,
+                which uses the value set.
+
+        """
+        super().__init__(name, description)
+        self._function = function
+
+    def set(self, value: float) -> None:
+        """Set the value of the gauge.
+
+        Args:
+            value (float): The value.
+
+        """
+        self._values[()] = value
+
+    def samples(self) -> list[tuple[tuple[str, ...], float]]:
+        """Get the value of the gauge.
+
+        Returns:
+            list[tuple[tuple[str, ...], float]]: The single sample, without labels.
+
+        """
+        if self._function:
+            return [((), self._function())]
+        return [((), self._values.get((), 0))]
+
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: The metrics.
+
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend((f"# HELP {metric.name} {metric.description}", f"# TYPE {metric.name} {metric.kind}"))
+        for key, value in metric.samples():
+            labels = ",".join(f'{label}="{label_value}"' for label, label_value in zip(metric.labels, key, strict=True))
+            lines.append(f"{metric.name}{{{labels}}} {value:g}" if labels else f"{metric.name} {value:g}")
+    return "\n".join(lines) + "\n"
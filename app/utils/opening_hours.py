@@ -0,0 +1,52 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def minute_of_day(time: str) -> int:
+    """Get the minute of the day of a time.
+
+    Args:
+        time (str): The time, in HH:mm format.
+
+    Returns:
+        int: The number of minutes since midnight.
+
+    """
+    hours, minutes = time.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def minute_of_week(day: int, minute: int) -> int:
+    """Get the minute of the week of a minute of a day.
+
+    Args:
+        day (int): The day of the week, from 1 (Monday) to 7 (Sunday).
+        minute (int): The minute of the day.
+
+    Returns:
+        int: The number of minutes since midnight on Monday.
+
+    """
+    return (day - 1) * MINUTES_PER_DAY + minute
+
+
+def opening_minute_ranges(opening_hours: Iterable[Mapping[str, Any]]) -> list[tuple[int, int]]:
+    """Normalize opening hours into minute-of-week ranges.
+
+    Args:
+        opening_hours (Iterable[Mapping[str, Any]]): The opening hours, as validated by the OpeningHours schema.
+
+    Returns:
+        list[tuple[int, int]]: The half-open ranges of minutes of the week the place is open, in order.
+
+    """
+    return sorted(
+        (
+            minute_of_week(hours["day"], minute_of_day(hours["open"])),
+            minute_of_week(hours["day"], minute_of_day(hours["close"])),
+        )
+        for hours in opening_hours
+    )
@@ -0,0 +1,243 @@
+import json
+import math
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import NamedTuple, Protocol
+
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.constants import (
+    RATE_LIMIT_MAX_BUCKETS,
+    RATE_LIMIT_ROUTE_COSTS,
+    RATE_LIMIT_SEARCH_COST,
+    SEARCH_QUERY_PARAMS,
+)
+from app.utils.metrics import Counter
+
+ALLOWED = Counter("weat_rate_limit_allowed_total", "Requests within the rate limit of their client.")
+LIMITED = Counter("weat_rate_limit_limited_total", "Requests rejected for exceeding the rate limit of their client.")
+
+
+class RateLimit(NamedTuple):
+    """Outcome of taking tokens from the bucket of a client."""
+
+    allowed: bool
+    # Whole tokens left in the bucket
+    remaining: int
+    # Seconds until the bucket is full again
+    reset: int
+    # Seconds until the request would be allowed, 0 if it was
+    retry_after: int
+
+
+class RateLimitBackend(Protocol):
+    """Store of the token buckets of the clients."""
+
+    capacity: int
+
+    async def take(self, key: str, cost: int) -> RateLimit:
+        """Take tokens from the bucket of a client, if it holds enough.
+
+        Args:
+            key (str): The key of the client.
+            cost (int): The number of tokens taken by the request.
+
+        Returns:
+            RateLimit: Whether the request is allowed, and the state of the bucket.
+
+        """
+
+
+def rate_limit(tokens: float, cost: int, capacity: int, refill_rate: float, *, allowed: bool) -> RateLimit:
+    """Describe the state of a bucket once tokens were taken from it.
+
+    Args:
+        tokens (float): The tokens left in the bucket.
+        cost (int): The number of tokens taken by the request.
+        capacity (int): The number of tokens of a full bucket.
+        refill_rate (float): The number of tokens added to the bucket per second.
+        allowed (bool): Whether the tokens were taken.
+
+    Returns:
+        RateLimit: Whether the request is allowed, and the state of the bucket.
+
+    """
+    return RateLimit(
+        allowed=allowed,
+        remaining=math.floor(tokens),
+        reset=math.ceil((capacity - tokens) / refill_rate),
+        retry_after=0 if allowed else math.ceil((min(cost, capacity) - tokens) / refill_rate),
+    )
+
+
+class MemoryRateLimitBackend:
+    """Token buckets kept in the memory of the process.
+
+    Each bucket is a pair of its tokens and the time they were counted, refilled when tokens are next taken
+    from it. Buckets are read and written without awaiting in between, so no lock is needed on the event
+    loop. Buckets idle long enough to be full are forgotten once there are too many.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        max_buckets: int = RATE_LIMIT_MAX_BUCKETS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the in-memory backend.
+
+        Args:
+            capacity (int): The number of tokens of a full bucket, which is the burst allowed to a client.
+            refill_rate (float): The number of tokens added to a bucket per second.
+            max_buckets (int): The number of buckets beyond which full buckets are forgotten.
+            clock (Callable[[], float]): Returns the current time in seconds. Defaults to time.monotonic.
+
+        """
+        self.capacity = capacity
+        self._refill_rate = refill_rate
+        self._max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._prune_above = max_buckets
+
+    async def take(self, key: str, cost: int) -> RateLimit:
+        """Take tokens from the bucket of a client, if it holds enough.
+
+        Args:
+            key (str): The key of the client.
+            cost (int): The number of tokens taken by the request.
+
+        Returns:
+            RateLimit: Whether the request is allowed, and the state of the bucket.
+
+        """
+        now = self._clock()
+        tokens, counted_at = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - counted_at) * self._refill_rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+
+        if len(self._buckets) > self._prune_above:
+            self.prune()
+        return rate_limit(tokens, cost, self.capacity, self._refill_rate, allowed=allowed)
+
+    def prune(self) -> None:
+        """Forget the buckets idle long enough to be full again."""
+        now = self._clock()
+        self._buckets = {
+            key: (tokens, counted_at)
+            for key, (tokens, counted_at) in self._buckets.items()
+            if tokens + (now - counted_at) * self._refill_rate < self.capacity
+        }
+        # Pruning again only once the buckets have doubled keeps it amortized when most buckets are in use
+        self._prune_above = max(self._max_buckets, 2 * len(self._buckets))
+
+
+def request_cost(method: str, path: str, query_params: QueryParams) -> int:
+    """Get the number of tokens taken by a request from the rate limit of its client.
+
+    Args:
+        method (str): The method of the request.
+        path (str): The path of the request.
+        query_params (QueryParams): The query parameters of the request.
+
+    Returns:
+        int: RATE_LIMIT_SEARCH_COST for searches, the cost of the route in RATE_LIMIT_ROUTE_COSTS, or 1.
+
+    """
+    if method == "GET" and SEARCH_QUERY_PARAMS.intersection(query_params):
+        return RATE_LIMIT_SEARCH_COST
+    return RATE_LIMIT_ROUTE_COSTS.get((method, path), 1)
+
+
+def client_key(scope: Scope) -> str:
+    """Get the key of the rate limit of the client of a request.
+
+    Clients are told apart by their address, as set by the proxy headers. Tokens are only verified by the
+    routes, after the rate limit is taken, so keying admin requests by the subject of their token would let a
+    client dodge its limit with a new subject on every request.
+
+    Args:
+        scope (Scope): The scope of the request.
+
+    Returns:
+        str: The key of the client.
+
+    """
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Middleware rate limiting each client with a token bucket.
+
+    Each request takes tokens from the bucket of its client according to its cost, and is rejected with
+    429 Too Many Requests when the bucket does not hold enough. The state of the bucket is sent in the
+    RateLimit-Limit, RateLimit-Remaining and RateLimit-Reset headers of every response. The middleware must
+    come after the proxy headers middleware, so that clients are told apart by their own address.
+    """
+
+    def __init__(self, app: ASGIApp, backend: RateLimitBackend) -> None:
+        """Initialize the rate limit middleware.
+
+        Args:
+            app (ASGIApp): The application.
+            backend (RateLimitBackend): The store of the token buckets.
+
+        """
+        self._app = app
+        self._backend = backend
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Rate limit an HTTP request, then pass it on to the application if allowed.
+
+        Args:
+            scope (Scope): The scope of the request.
+            receive (Receive): Receives the messages of the request.
+            send (Send): Sends the messages of the response.
+
+        """
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self._app(scope, receive, send)
+            return
+
+        cost = request_cost(scope["method"], scope["path"], QueryParams(scope["query_string"]))
+        limit = await self._backend.take(client_key(scope), cost)
+        rate_limit_headers = [
+            (b"ratelimit-limit", str(self._backend.capacity).encode()),
+            (b"ratelimit-remaining", str(limit.remaining).encode()),
+            (b"ratelimit-reset", str(limit.reset).encode()),
+        ]
+
+        if not limit.allowed:
+            LIMITED.inc()
+            body = json.dumps({"detail": "Too many requests"}).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": HTTPStatus.TOO_MANY_REQUESTS,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(limit.retry_after).encode()),
+                        *rate_limit_headers,
+                    ],
+                },
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        ALLOWED.inc()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *rate_limit_headers]
+            await send(message)
+
+        await self._app(scope, receive, send_with_headers)
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.utils.metrics import Counter
+
+T = TypeVar("T")
+
+CALLS = Counter(
+    "weat_single_flight_calls_total",
+    "Calls of coalesced functions, by function and by whether they ran it or shared the result of another.",
+    labels=("name", "role"),
+)
+
+
+class _LeaderCancelledError(Exception):
+    """The call whose result was shared was cancelled, or failed for itself only, before it finished."""
+
+
+class SingleFlight:
+    """Coalescing of identical concurrent calls.
+
+    The first call with a key runs its function, and the calls with the same key made while it runs await
+    its result instead of running their own. When the first call is cancelled, such as when its client goes
+    away, or fails with an error of its own, such as its deadline passing, the calls waiting for it run their
+    own function instead.
+    """
+
+    def __init__(self, name: str, is_own_error: Callable[[Exception], bool] = lambda _error: False) -> None:
+        """Initialize the coalescing of the calls of a function.
+
+        Args:
+            name (str): The name of the function, used in metrics.
+            is_own_error (Callable[[Exception], bool]): Returns whether an error is specific to the call that
+                raised it, rather than shared with the calls awaiting its result. Defaults to no error.
+
+        """
+        self._name = name
+        self._is_own_error = is_own_error
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """Run a function, or await the result of the call with the same key already running it.
+
+        Args:
+            key (Hashable): The key of the call, identical for calls returning the same result.
+            function (Callable[[], Awaitable[T]]): The function.
+
+        Returns:
+            T: The result of the function.
+
+        Raises:
+            CancelledError: If the call is cancelled while running its function, in which case the calls
+                awaiting its result run their own function.
+
+        """
+        while (running := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.shield(running)
+            except _LeaderCancelledError:
+                # The first of the calls waiting for it to see it gone runs its function for the others
+                continue
+            CALLS.inc(name=self._name, role="follower")
+            return result
+
+        CALLS.inc(name=self._name, role="leader")
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelledError())
+            raise
+        except Exception as e:
+            future.set_exception(_LeaderCancelledError() if self._is_own_error(e) else e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            # Retrieved, so that a future nobody awaited does not log its exception
+            if future.done() and not future.cancelled():
+                future.exception()
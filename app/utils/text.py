@@ -0,0 +1,137 @@
+import re
+import unicodedata
+
+from opencc import OpenCC
+from pypinyin import Style, lazy_pinyin
+
+# Kana, CJK Unified Ideographs Extension A, CJK Unified Ideographs and CJK Compatibility Ideographs
+_CJK_CHARACTERS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_CJK_PATTERN = re.compile(f"[{_CJK_CHARACTERS}]")
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_CHARACTERS}]+|[^\W{_CJK_CHARACTERS}]+")
+_NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-z0-9]+")
+
+_traditional_to_simplified = OpenCC("t2s")
+
+
+def contains_cjk(value: str | None) -> bool:
+    """Check whether a string contains any CJK characters.
+
+    Args:
+        value (str | None): The string to check.
+
+    Returns:
+        bool: True if the string contains at least one CJK character.
+
+    """
+    return bool(value) and _CJK_PATTERN.search(value) is not None
+
+
+def normalize_zh(value: str) -> str:
+    """Normalize Chinese text for searching.
+
+    Full-width characters are folded to their half-width forms, traditional characters are
+    converted to simplified ones, and the result is case-folded.
+
+    Args:
+        value (str): The text to normalize.
+
+    Returns:
+        str: The normalized text.
+
+    """
+    return _traditional_to_simplified.convert(unicodedata.normalize("NFKC", value)).casefold()
+
+
+def _cjk_bigrams(run: str) -> list[str]:
+    return [run[i : i + 2] for i in range(len(run) - 1)]
+
+
+def zh_search_tokens(value: str | None) -> list[str]:
+    """Get the tokens to index for a Chinese name.
+
+    CJK runs contribute every character and every pair of adjacent characters, so that both
+    single-character and longer queries can be answered by array containment. Other words are
+    kept whole.
+
+    Args:
+        value (str | None): The name to tokenize.
+
+    Returns:
+        list[str]: The sorted, unique tokens.
+
+    """
+    if not value:
+        return []
+
+    tokens = set()
+    for run in _TOKEN_PATTERN.findall(normalize_zh(value)):
+        if contains_cjk(run):
+            tokens.update(run)
+            tokens.update(_cjk_bigrams(run))
+        else:
+            tokens.add(run)
+
+    return sorted(tokens)
+
+
+def zh_query_tokens(q: str) -> list[str]:
+    """Get the tokens a Chinese name must contain to match a query.
+
+    CJK runs are split into pairs of adjacent characters, except single characters which are
+    kept as they are. Other words are kept whole.
+
+    Args:
+        q (str): The query to tokenize.
+
+    Returns:
+        list[str]: The sorted, unique tokens.
+
+    """
+    tokens = set()
+    for run in _TOKEN_PATTERN.findall(normalize_zh(q)):
+        if contains_cjk(run) and len(run) > 1:
+            tokens.update(_cjk_bigrams(run))
+        else:
+            tokens.add(run)
+
+    return sorted(tokens)
+
+
+def _compact(value: str) -> str:
+    return _NON_ALPHANUMERIC_PATTERN.sub("", value.casefold())
+
+
+def to_pinyin(value: str | None) -> tuple[str | None, str | None]:
+    """Transliterate a Chinese name into pinyin.
+
+    Syllables are joined without tones or separators, so that "小笼包" becomes "xiaolongbao"
+    with the initials "xlb". Characters without a pinyin reading are kept as they are.
+
+    Args:
+        value (str | None): The name to transliterate.
+
+    Returns:
+        tuple[str | None, str | None]: The full pinyin and the pinyin initials, or None for both
+        if the name is empty.
+
+    """
+    if not value:
+        return None, None
+
+    normalized = normalize_zh(value)
+    full = _compact("".join(lazy_pinyin(normalized)))
+    initials = _compact("".join(lazy_pinyin(normalized, style=Style.FIRST_LETTER)))
+    return full or None, initials or None
+
+
+def pinyin_query(q: str) -> str:
+    """Normalize a query for matching against transliterated pinyin.
+
+    Args:
+        q (str): The query to normalize.
+
+    Returns:
+        str: The query without case, spaces or punctuation, e.g. "Xiao Long Bao" becomes "xiaolongbao".
+
+    """
+    return _compact(unicodedata.normalize("NFKC", q))
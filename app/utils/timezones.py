@@ -0,0 +1,23 @@
+from functools import cache
+
+from timezonefinder import TimezoneFinder
+
+
+@cache
+def _timezone_finder() -> TimezoneFinder:
+    # Loaded once, on first use, as it reads the timezone boundaries
+    return TimezoneFinder()
+
+
+def timezone_at(latitude: float, longitude: float) -> str | None:
+    """Get the timezone of a location.
+
+    Args:
+        latitude (float): The latitude of the location.
+        longitude (float): The longitude of the location.
+
+    Returns:
+        str | None: The IANA name of the timezone, or None if the location is in no known timezone.
+
+    """
+    return _timezone_finder().timezone_at(lat=latitude, lng=longitude)
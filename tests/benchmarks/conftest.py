@@ -0,0 +1,6 @@
+from tests.models.conftest import (  # noqa: F401
+    setup_test_db,
+    test_async_sessionmaker,
+    test_engine,
+    test_uow,
+)
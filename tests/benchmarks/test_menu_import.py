@@ -0,0 +1,83 @@
+import logging
+import time
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.constants import PlaceType
+from app.models.food import Dish, Menu
+from app.models.place import Place
+from app.schemas.menus import DishCategoryImport, DishImport, MenuImport
+from app.services.menus import import_place_menu
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.db.uow import DBUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COUNT = 10
+DISHES_PER_CATEGORY = 50
+
+
+def make_menu_import() -> MenuImport:
+    return MenuImport(
+        categories=[
+            DishCategoryImport(
+                name=f"Category {i}",
+                name_zh=f"类别 {i}",
+                dishes=[
+                    DishImport(
+                        name=f"Dish {i}-{j}",
+                        name_zh=f"菜 {i}-{j}",
+                        price=Decimal("12.50"),
+                        properties={"spicy": j % 2 == 0},
+                    )
+                    for j in range(DISHES_PER_CATEGORY)
+                ],
+            )
+            for i in range(CATEGORY_COUNT)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.benchmark
+async def test_import_500_dish_menu(test_engine: "AsyncEngine", test_uow: "DBUnitOfWork") -> None:
+    """Test that a 500-dish menu is imported with a constant number of statements."""
+    place = Place(id=uuid.uuid4(), name="Benchmark Restaurant", type=PlaceType.FOOD)
+    await test_uow.add(place)
+    await test_uow.commit()
+
+    menu_import = make_menu_import()
+    statements = []
+
+    def count_statement(*args: object) -> None:
+        statements.append(args[2])
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        started = time.perf_counter()
+        response = await import_place_menu(test_uow, place.id, menu_import)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    dish_count = CATEGORY_COUNT * DISHES_PER_CATEGORY
+    logger.info("Imported %d dishes in %.1f ms (%.0f dishes/s)", dish_count, elapsed * 1000, dish_count / elapsed)
+
+    assert response.dishes == dish_count
+    # Place check, delete, menu, categories and dishes, whatever the number of dishes
+    assert len(statements) <= 5
+
+    # Importing again replaces the menu
+    await import_place_menu(test_uow, place.id, menu_import)
+    menus = (await test_uow.execute(select(func.count()).where(Menu.place_id == place.id))).scalar_one()
+    dishes = (await test_uow.execute(select(func.count()).where(Dish.menu_id == response.menu_id))).scalar_one()
+    assert menus == 1
+    assert dishes == 0
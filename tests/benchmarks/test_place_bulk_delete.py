@@ -0,0 +1,96 @@
+import logging
+import time
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import event, func, insert, literal, select
+
+from app.constants import PLACE_BULK_DELETE_MAX_PLACES, PlaceType
+from app.models.associations import place_tag_association
+from app.models.food import Dish, Menu, MenuSnapshot
+from app.models.place import Place
+from app.models.tag import Tag, TagType
+from app.services.places import bulk_delete_places
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.db.uow import DBUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+async def count(test_uow: "DBUnitOfWork", stmt: object) -> int:
+    return (await test_uow.execute(stmt)).scalar_one()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.benchmark
+async def test_bulk_delete_places(test_engine: "AsyncEngine", test_uow: "DBUnitOfWork") -> None:
+    """Test that places are deleted with their tags and menus in a single statement."""
+    tag_type = TagType(id=uuid.uuid4(), name="Benchmark", place_type=PlaceType.FOOD)
+    tag = Tag(id=uuid.uuid4(), name="Doomed", tag_type_id=tag_type.id)
+    await test_uow.add(tag_type)
+    await test_uow.add(tag)
+
+    # Set-based setup: the places, one tag and one menu with a dish each
+    n = func.generate_series(1, PLACE_BULK_DELETE_MAX_PLACES).table_valued("n")
+    result = await test_uow.execute(
+        insert(Place)
+        .from_select(["name", "type"], select(literal("Doomed Place ") + n.c.n.cast(Place.name.type), literal("FOOD")))
+        .returning(Place.id),
+    )
+    place_ids = list(result.scalars())
+    await test_uow.execute(
+        insert(place_tag_association).from_select(
+            ["place_id", "tag_id"],
+            select(Place.id, literal(tag.id)).where(Place.id.in_(place_ids)),
+        ),
+    )
+    await test_uow.execute(insert(Menu).from_select(["place_id"], select(Place.id).where(Place.id.in_(place_ids))))
+    await test_uow.execute(
+        insert(Dish).from_select(
+            ["menu_id", "name", "name_zh", "price", "properties"],
+            select(
+                Menu.id,
+                literal("Tea"),
+                literal("茶"),
+                literal(Decimal("2.00")),
+                literal({}, Dish.properties.type),
+            ).where(Menu.place_id.in_(place_ids)),
+        ),
+    )
+    await test_uow.commit()
+    snapshots = select(func.count()).select_from(MenuSnapshot).where(MenuSnapshot.place_id.in_(place_ids))
+    assert await count(test_uow, snapshots) > 0
+
+    statements = []
+
+    def count_statement(*args: object) -> None:
+        statements.append(args[2])
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        started = time.perf_counter()
+        response = await bulk_delete_places(test_uow, place_ids=place_ids)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    logger.info(
+        "Deleted %d places in %.1f ms (%.0f places/s)",
+        len(place_ids),
+        elapsed * 1000,
+        len(place_ids) / elapsed,
+    )
+
+    assert response.deleted == PLACE_BULK_DELETE_MAX_PLACES
+    # A single DELETE, the tags, menus, dishes and snapshots following by cascade
+    assert len(statements) == 1
+    assert await count(test_uow, select(func.count()).where(Place.id.in_(place_ids))) == 0
+    assert await count(test_uow, select(func.count()).where(place_tag_association.c.tag_id == tag.id)) == 0
+    assert await count(test_uow, select(func.count()).where(Menu.place_id.in_(place_ids))) == 0
+    assert await count(test_uow, snapshots) == 0
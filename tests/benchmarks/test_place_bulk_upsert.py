@@ -0,0 +1,64 @@
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.constants import PLACE_BULK_UPSERT_MAX_PLACES, PlaceType, PlaceUpsertStatus
+from app.models.place import Place
+from app.schemas.places import Location, PlaceCreate
+from app.services.places import bulk_upsert_places
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.db.uow import DBUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+def make_places(name: str) -> list[PlaceCreate]:
+    return [
+        PlaceCreate(
+            name=f"{name} {i}",
+            name_zh=f"地方 {i}",
+            type=PlaceType.FOOD,
+            google_maps_place_id=f"benchmark-{i}",
+            location=Location(latitude=37.7 + i / 10000, longitude=-122.4),
+            opening_hours=[{"day": 1 + i % 7, "open": "08:00", "close": "20:00"}],
+            properties={"has_parking": i % 2 == 0},
+        )
+        for i in range(PLACE_BULK_UPSERT_MAX_PLACES)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.benchmark
+async def test_bulk_upsert_places(test_engine: "AsyncEngine", test_uow: "DBUnitOfWork") -> None:
+    """Test that a full batch of places is upserted with a constant number of statements."""
+    statements = []
+
+    def count_statement(*args: object) -> None:
+        statements.append(args[2])
+
+    for name, status in [("Place", PlaceUpsertStatus.CREATED), ("Renamed Place", PlaceUpsertStatus.UPDATED)]:
+        places = make_places(name)
+        statements.clear()
+        event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            started = time.perf_counter()
+            response = await bulk_upsert_places(test_uow, places)
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+        logger.info("Upserted %d places in %.1f ms (%.0f places/s)", len(places), elapsed * 1000, len(places) / elapsed)
+
+        assert {result.status for result in response.results} == {status}
+        # Tag deletion and the upsert, whatever the number of places
+        assert len(statements) <= 3
+
+    names = (await test_uow.execute(select(func.count()).where(Place.name.startswith("Renamed Place")))).scalar_one()
+    assert names == PLACE_BULK_UPSERT_MAX_PLACES
@@ -0,0 +1,101 @@
+import json
+import logging
+import uuid
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+
+from app.constants import PlaceType
+from app.db.loader import SUPERSEDED_ERROR, load_places, read_ndjson
+from app.models.associations import place_tag_association
+from app.models.food import Dish, MenuSnapshot
+from app.models.place import Place
+from app.models.tag import Tag, TagType
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.db.uow import DBUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+PLACE_COUNT = 10_000
+DISHES_PER_PLACE = 5
+
+
+def make_lines(run_id: str, tag_name: str) -> list[str]:
+    lines = [
+        json.dumps(
+            {
+                "google_maps_place_id": f"{run_id}-{i}",
+                "name": f"Place {i}",
+                "name_zh": f"地方 {i}",
+                "type": "food",
+                "latitude": 37.7 + i / 100000,
+                "longitude": -122.4,
+                "opening_hours": [{"day": 1 + i % 7, "open": "08:00", "close": "20:00"}],
+                "properties": {"has_parking": i % 2 == 0},
+                "tags": [tag_name],
+                "menu": {
+                    "categories": [
+                        {
+                            "name": "Mains",
+                            "name_zh": "主菜",
+                            "dishes": [
+                                {"name": f"Dish {j}", "name_zh": f"菜 {j}", "price": 10 + j}
+                                for j in range(DISHES_PER_PLACE)
+                            ],
+                        },
+                    ],
+                },
+            },
+            ensure_ascii=False,
+        )
+        for i in range(PLACE_COUNT)
+    ]
+    return [
+        *lines,
+        json.dumps({"google_maps_place_id": f"{run_id}-0", "name": "Place 0", "type": "food"}),
+        json.dumps({"google_maps_place_id": f"{run_id}-x", "name": "Unknown Tag", "type": "food", "tags": ["?"]}),
+        json.dumps({"name": "No Key", "type": "food"}),
+        "not json",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.benchmark
+async def test_load_places(test_engine: "AsyncEngine", test_uow: "DBUnitOfWork") -> None:
+    """Test that places, tags and menus are loaded in bulk, and invalid rows are reported."""
+    run_id = uuid.uuid4().hex
+    tag_type = TagType(id=uuid.uuid4(), name=f"Cuisine {run_id}", place_type=PlaceType.FOOD)
+    tag = Tag(id=uuid.uuid4(), name=f"Sichuan {run_id}", tag_type_id=tag_type.id)
+    await test_uow.add(tag_type)
+    await test_uow.add(tag)
+    await test_uow.commit()
+
+    async with test_engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        report = await load_places(raw_connection.driver_connection, read_ndjson(make_lines(run_id, tag.name)))
+
+    logger.info("Loaded %d rows in %.1f s (%.0f rows/s)", report.rows, report.seconds, report.rows_per_second)
+
+    # The last line for a place wins, so the first line is superseded
+    assert (report.created, report.updated, report.menus) == (PLACE_COUNT, 0, PLACE_COUNT - 1)
+    assert report.dishes == (PLACE_COUNT - 1) * DISHES_PER_PLACE
+    assert {rejected.error: rejected.count for rejected in report.rejected} == {
+        SUPERSEDED_ERROR: 1,
+        "unknown tag": 1,
+        "missing google_maps_place_id": 1,
+        "invalid JSON": 1,
+    }
+
+    place_ids = select(Place.id).where(Place.google_maps_place_id.startswith(run_id))
+    tagged = select(func.count()).where(place_tag_association.c.place_id.in_(place_ids))
+    assert (await test_uow.execute(tagged)).scalar_one() == PLACE_COUNT - 1
+    dishes = select(func.count(Dish.id)).where(Dish.name == "Dish 0")
+    assert (await test_uow.execute(dishes)).scalar_one() >= PLACE_COUNT - 1
+    # The snapshots are rendered once after the merge, in every language
+    snapshots = select(func.count()).where(MenuSnapshot.place_id.in_(place_ids), MenuSnapshot.document != "[]")
+    assert (await test_uow.execute(snapshots)).scalar_one() == (PLACE_COUNT - 1) * 2
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+
+from app.constants import AdmissionPriority
+from app.db.admission import AdmissionController, request_capacity
+from app.db.uow import DBUnitOfWork
+from app.services.errors import ServiceUnavailableError
+
+
+async def hold(controller: AdmissionController, priority: AdmissionPriority, order: list[str], name: str) -> None:
+    async with controller.admit(priority):
+        order.append(name)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_admits_by_priority() -> None:
+    controller = AdmissionController(capacity=1, queue_size=10, queue_timeout=1)
+    order: list[str] = []
+
+    async with controller.admit():
+        tasks = [
+            asyncio.create_task(hold(controller, AdmissionPriority.LOW, order, "search")),
+            asyncio.create_task(hold(controller, AdmissionPriority.NORMAL, order, "get")),
+            asyncio.create_task(hold(controller, AdmissionPriority.HIGH, order, "write")),
+        ]
+        await asyncio.sleep(0)
+        assert (controller.in_flight, controller.queue_depth) == (1, 3)
+
+    await asyncio.gather(*tasks)
+
+    assert order == ["write", "get", "search"]
+    assert (controller.in_flight, controller.queue_depth) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_rejects_when_queue_is_full() -> None:
+    controller = AdmissionController(capacity=1, queue_size=1, queue_timeout=1)
+
+    async with controller.admit():
+        waiting = asyncio.create_task(hold(controller, AdmissionPriority.NORMAL, [], "waiting"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            async with controller.admit():
+                pass
+        assert exc_info.value.retry_after == 1
+
+    await waiting
+    assert (controller.in_flight, controller.queue_depth) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_rejects_after_queue_timeout() -> None:
+    controller = AdmissionController(capacity=1, queue_size=10, queue_timeout=0.01)
+
+    async with controller.admit():
+        with pytest.raises(ServiceUnavailableError):
+            async with controller.admit():
+                pass
+        assert controller.queue_depth == 0
+
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_controller_cancelled_while_waiting() -> None:
+    controller = AdmissionController(capacity=1, queue_size=10, queue_timeout=1)
+
+    async with controller.admit():
+        waiting = asyncio.create_task(hold(controller, AdmissionPriority.NORMAL, [], "waiting"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert controller.queue_depth == 0
+
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_is_admitted_when_first_used() -> None:
+    controller = AdmissionController(capacity=1, queue_size=10, queue_timeout=1)
+
+    async with DBUnitOfWork(AsyncMock, admission=controller.admit) as db:
+        assert controller.in_flight == 0
+        await db.execute(select(1))
+        await db.execute(select(1))
+        assert controller.in_flight == 1
+
+    assert controller.in_flight == 0
+
+
+@pytest.mark.parametrize(
+    ("pool_size", "max_overflow", "job_concurrency", "capacity"),
+    [(5, 10, 2, 7), (5, 10, 0, 13), (2, 0, 2, 1)],
+)
+def test_request_capacity_reserves_background_connections(
+    pool_size: int,
+    max_overflow: int,
+    job_concurrency: int,
+    capacity: int,
+) -> None:
+    assert request_capacity(pool_size, max_overflow, job_concurrency) == capacity
@@ -0,0 +1,55 @@
+import json
+
+from app.db.loader import INVALID_JSON_ERROR, STAGING_COLUMNS, read_csv, read_ndjson
+
+
+def as_dict(record: tuple) -> dict:
+    assert len(record) == len(STAGING_COLUMNS)
+    return dict(zip(STAGING_COLUMNS, record, strict=True))
+
+
+def test_read_ndjson() -> None:
+    place = {
+        "google_maps_place_id": "abc",
+        "name": "Noodle House",
+        "name_zh": "面馆",
+        "type": "food",
+        "location": {"latitude": 37.77, "longitude": -122.42},
+        "opening_hours": [{"day": 1, "open": "08:00", "close": "20:00"}],
+        "properties": {"has_parking": True},
+        "tags": ["Sichuan"],
+        "menu": {"dishes": [{"name": "Tea", "name_zh": "茶", "price": 2}]},
+    }
+
+    [record, invalid] = read_ndjson([json.dumps(place, ensure_ascii=False), "", "not json"])
+
+    record = as_dict(record)
+    assert record["line"] == 1
+    assert record["type"] == "FOOD"
+    assert (record["latitude"], record["longitude"]) == ("37.77", "-122.42")
+    assert record["name_zh_tokens"]
+    assert record["name_zh_pinyin"] is not None
+    assert json.loads(record["tags"]) == ["Sichuan"]
+    assert json.loads(record["menu"]) == place["menu"]
+    assert record["error"] is None
+
+    invalid = as_dict(invalid)
+    assert invalid["line"] == 3
+    assert invalid["error"] == INVALID_JSON_ERROR
+
+
+def test_read_csv() -> None:
+    lines = [
+        "google_maps_place_id,name,type,latitude,longitude,properties,tags\n",
+        'abc,Noodle House,food,37.77,-122.42,"{""has_parking"": true}",Sichuan; Noodles\n',
+        "def,Tea House,food,,,,\n",
+    ]
+
+    [record, empty] = [as_dict(record) for record in read_csv(lines)]
+
+    assert record["line"] == 2
+    assert record["properties"] == '{"has_parking": true}'
+    assert json.loads(record["tags"]) == ["Sichuan", "Noodles"]
+    # Empty cells are missing values, and an empty tags cell clears the tags
+    assert (empty["latitude"], empty["properties"]) == (None, None)
+    assert empty["tags"] == "[]"
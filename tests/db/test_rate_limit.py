@@ -0,0 +1,18 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.rate_limit import PostgresRateLimitBackend
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_falls_back_when_the_pool_is_busy() -> None:
+    session = AsyncMock()
+    session.execute.side_effect = PoolTimeoutError
+    backend = PostgresRateLimitBackend(5, 1.0, lambda: lambda: session)
+
+    limit = await backend.take("ip:10.0.0.1", 2)
+
+    assert (limit.allowed, limit.remaining) == (True, 3)
+    session.rollback.assert_awaited_once()
@@ -0,0 +1,57 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import PG_QUERY_CANCELED
+from app.db.uow import DBUnitOfWork, is_deadline_exceeded
+from app.services.errors import DeadlineExceededError
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_fails_past_its_deadline() -> None:
+    async with DBUnitOfWork(AsyncSession, deadline=time.monotonic() - 1) as db:
+        with pytest.raises(DeadlineExceededError):
+            await db.execute(select(1))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("time_left", "statement_timeout"), [(2.5, 2500), (0.0001, 1), (-1, 1)])
+async def test_unit_of_work_sets_statement_timeout_of_time_left(
+    mocker: MockerFixture,
+    time_left: float,
+    statement_timeout: int,
+) -> None:
+    mocker.patch("app.db.uow.time.monotonic", return_value=100.0)
+    connection = MagicMock()
+
+    async with DBUnitOfWork(AsyncSession, deadline=100.0 + time_left) as db:
+        session = db._session.sync_session  # noqa: SLF001
+        session.dispatch.after_begin(session, session.get_transaction(), connection)
+
+    connection.exec_driver_sql.assert_called_once_with(f"SET LOCAL statement_timeout = {statement_timeout}")
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_past_its_deadline() -> None:
+    session = AsyncMock()
+
+    async with DBUnitOfWork(lambda: session) as db:
+        db._deadline = time.monotonic() - 1  # noqa: SLF001
+        await db.commit()
+
+    session.commit.assert_awaited_once()
+
+
+def test_is_deadline_exceeded() -> None:
+    canceled = DBAPIError("SELECT pg_sleep(5)", None, MagicMock(sqlstate=PG_QUERY_CANCELED))
+    failed = DBAPIError("SELECT 1", None, MagicMock(sqlstate="23505"))
+
+    assert is_deadline_exceeded(DeadlineExceededError())
+    assert is_deadline_exceeded(canceled)
+    assert not is_deadline_exceeded(failed)
+    assert not is_deadline_exceeded(ValueError())
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 
 class MockDBUoW:
@@ -8,6 +8,7 @@ class MockDBUoW:
         self.refresh = AsyncMock()
         self.delete = AsyncMock()
         self.execute = AsyncMock()
+        self.stream = MagicMock()
         self.get = AsyncMock()
         self.get_all = AsyncMock()
         self.get_count = AsyncMock()
@@ -0,0 +1,76 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.constants import JobKind, JobStatus
+from app.db.admission import AdmissionController, request_capacity
+from app.db.uow import DBUnitOfWork
+from app.models.job import Job
+from app.schemas.places import PlaceBulkDelete
+from app.services.jobs import JobRunner, ProgressReporter, claim_job, enqueue_job, finish_job, get_job
+from app.settings import settings
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_jobs_are_claimed_once(test_async_sessionmaker: "async_sessionmaker", test_uow: DBUnitOfWork) -> None:
+    """Test that a job locked by a worker is skipped by the others, which claim the next job."""
+    first = await enqueue_job(test_uow, JobKind.PLACE_BULK_DELETE, PlaceBulkDelete(ids=[]))
+    second = await enqueue_job(test_uow, JobKind.PLACE_BULK_DELETE, PlaceBulkDelete(ids=[]))
+
+    async with DBUnitOfWork(test_async_sessionmaker) as locking:
+        # Another worker holds the lock of the first job, in the middle of claiming it
+        await locking.execute(select(Job.id).where(Job.id == first.id).with_for_update())
+
+        async with DBUnitOfWork(test_async_sessionmaker) as worker:
+            claimed = await claim_job(worker, "worker")
+
+    assert claimed.id == second.id
+    assert (claimed.status, claimed.attempts, claimed.worker) == (JobStatus.RUNNING, 1, "worker")
+
+    # Only the worker that claimed the job records its outcome
+    assert not await finish_job(test_uow, second.id, "other worker", {"deleted": 1})
+    assert await finish_job(test_uow, second.id, "worker", {"deleted": 0})
+    async with DBUnitOfWork(test_async_sessionmaker) as db:
+        job = await get_job(db, second.id)
+    assert (job.status, job.result) == (JobStatus.SUCCEEDED, {"deleted": 0})
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_admitted_requests_get_connections_while_a_job_runs(test_uow: DBUnitOfWork) -> None:
+    """Test that the connections of a running job are reserved, so that admitted requests never wait for the pool."""
+    pool_size = 8
+    engine = create_async_engine(settings.db_url, pool_size=pool_size, max_overflow=0, pool_timeout=1)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    controller = AdmissionController(request_capacity(pool_size, 0, 1), queue_size=100, queue_timeout=10)
+    running, release = asyncio.Event(), asyncio.Event()
+
+    async def hold(db: DBUnitOfWork, _payload: dict, report: ProgressReporter) -> "BaseModel | None":
+        # The job holds its own connection while reporting its progress with another
+        await db.execute(select(1))
+        await report(0, 1)
+        running.set()
+        await release.wait()
+
+    async def request() -> None:
+        async with DBUnitOfWork(session_maker, admission=controller.admit) as db:
+            await db.execute(select(func.pg_sleep(0.2)))
+
+    await enqueue_job(test_uow, JobKind.PLACE_BULK_DELETE, PlaceBulkDelete(ids=[]))
+    runner = JobRunner(session_maker, dict.fromkeys(JobKind, hold), concurrency=1, poll_interval=0.01)
+    await runner.start()
+    try:
+        await asyncio.wait_for(running.wait(), timeout=5)
+        # Twice as many requests as admitted at once, none of which times out waiting for the pool
+        await asyncio.gather(*(request() for _ in range(2 * request_capacity(pool_size, 0, 1))))
+    finally:
+        release.set()
+        await runner.stop()
+        await engine.dispose()
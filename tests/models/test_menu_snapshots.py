@@ -0,0 +1,79 @@
+import hashlib
+import json
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import delete, func, insert, select, text, update
+
+from app.constants import Language, MenuImportMode, PlaceType
+from app.models.food import Dish, Menu
+from app.models.place import Place
+from app.schemas.menus import DishCategoryImport, DishImport, MenuImport
+from app.services.menus import get_menu_snapshot, import_place_menu
+
+if TYPE_CHECKING:
+    from app.db.uow import DBUnitOfWork
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_menu_snapshots_follow_menus(test_uow: "DBUnitOfWork") -> None:
+    """Test that the menu snapshots of a place are maintained as its menus change."""
+    place = Place(id=uuid.uuid4(), name="Test Restaurant", type=PlaceType.FOOD)
+    await test_uow.add(place)
+    await test_uow.commit()
+
+    snapshot = await get_menu_snapshot(test_uow, place.id, Language.EN_US)
+    assert snapshot.document == "[]"
+
+    menu_import = MenuImport(
+        categories=[
+            DishCategoryImport(
+                name="Noodles",
+                name_zh="面",
+                dishes=[DishImport(name="Dan Dan Noodles", name_zh="担担面", price=Decimal("12.50"))],
+            ),
+        ],
+        dishes=[DishImport(name="Tea", name_zh="茶", price=Decimal("2.00"))],
+    )
+    result = await import_place_menu(test_uow, place.id, menu_import, MenuImportMode.REPLACE)
+
+    snapshot = await get_menu_snapshot(test_uow, place.id, Language.ZH_CN)
+    [menu] = json.loads(snapshot.document)
+    assert menu["id"] == str(result.menu_id)
+    assert [category["display_name"] for category in menu["categories"]] == ["面"]
+    assert [dish["display_name"] for dish in menu["categories"][0]["dishes"]] == ["担担面"]
+    assert [dish["display_name"] for dish in menu["dishes"]] == ["茶"]
+    assert snapshot.etag == hashlib.sha256(snapshot.document.encode()).hexdigest()
+
+    etag = snapshot.etag
+    await test_uow.execute(update(Dish).where(Dish.menu_id == result.menu_id).values(price=Decimal(3)))
+    await test_uow.commit()
+    assert (await get_menu_snapshot(test_uow, place.id, Language.ZH_CN)).etag != etag
+
+    await test_uow.execute(delete(Dish).where(Dish.menu_id == result.menu_id))
+    await test_uow.commit()
+    [menu] = json.loads((await get_menu_snapshot(test_uow, place.id, Language.EN_US)).document)
+    assert menu["categories"][0]["dishes"] == []
+    assert menu["dishes"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_menu_snapshots_take_bounded_locks(test_uow: "DBUnitOfWork") -> None:
+    """Test that refreshing the snapshots of many places takes a bounded number of advisory locks."""
+    places = [{"name": f"Test Restaurant {i}", "type": PlaceType.FOOD} for i in range(5000)]
+    place_ids = (await test_uow.execute(insert(Place).values(places).returning(Place.id))).scalars().all()
+    await test_uow.execute(insert(Menu).values([{"place_id": place_id} for place_id in place_ids]))
+
+    locks = await test_uow.execute(
+        select(func.count())
+        .select_from(text("pg_locks"))
+        .where(
+            text("locktype = 'advisory' AND pid = pg_backend_pid()"),
+        ),
+    )
+    assert locks.scalar() <= 1024
+    assert len(await test_uow.get_all(select(Menu.id).where(Menu.place_id.in_(place_ids)))) == 5000
@@ -0,0 +1,63 @@
+import uuid
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+
+from app.constants import PlaceType
+from app.models.associations import place_tag_association
+from app.models.food import Menu
+from app.models.place import Place
+from app.models.tag import Tag, TagType
+from app.services.duplicates import find_duplicate_clusters, merge_places
+
+if TYPE_CHECKING:
+    from app.db.uow import DBUnitOfWork
+
+
+def make_place(name: str, name_zh: str | None, latitude: float, longitude: float) -> Place:
+    return Place(
+        id=uuid.uuid4(),
+        name=name,
+        name_zh=name_zh,
+        type=PlaceType.FOOD,
+        location={"latitude": latitude, "longitude": longitude},
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_duplicate_places_are_found_and_merged(test_uow: "DBUnitOfWork") -> None:
+    """Test that nearby places with similar names are clustered, then merged with their tags and menus."""
+    place = make_place("Golden Dragon Noodle House", "金龙面馆", 37.7749, -122.4194)
+    # About 10 metres away, with a slightly different name
+    duplicate = make_place("Golden Dragon Noodles", None, 37.77499, -122.4194)
+    # About 10 metres away, with only the same Chinese name
+    chinese_duplicate = make_place("Gold Dragon", "金龙面馆", 37.7749, -122.41951)
+    # Same name, but about 1 km away
+    far = make_place("Golden Dragon Noodle House", "金龙面馆", 37.7839, -122.4194)
+    # Next door, but a different place
+    neighbour = make_place("Blue Bottle Coffee", None, 37.77491, -122.4194)
+
+    tag_type = TagType(id=uuid.uuid4(), name="Cuisine", place_type=PlaceType.FOOD)
+    tag = Tag(id=uuid.uuid4(), name="Noodles", tag_type=tag_type)
+    duplicate.tags = [tag]
+    menu = Menu(id=uuid.uuid4(), place=chinese_duplicate)
+    for instance in (place, duplicate, chinese_duplicate, far, neighbour, tag_type, tag, menu):
+        await test_uow.add(instance)
+    await test_uow.commit()
+
+    clusters = await find_duplicate_clusters(test_uow, max_distance=50, min_similarity=0.5)
+    [cluster] = [cluster for cluster in clusters if place.id in cluster.place_ids]
+    assert set(cluster.place_ids) == {place.id, duplicate.id, chinese_duplicate.id}
+    assert all(pair.distance < 50 for pair in cluster.pairs)
+
+    response = await merge_places(test_uow, place.id, [duplicate.id, chinese_duplicate.id])
+    assert (response.merged, response.tags, response.menus) == (2, 1, 1)
+
+    remaining = select(func.count()).where(Place.id.in_([duplicate.id, chinese_duplicate.id]))
+    assert (await test_uow.execute(remaining)).scalar_one() == 0
+    tags = select(place_tag_association.c.tag_id).where(place_tag_association.c.place_id == place.id)
+    assert (await test_uow.execute(tags)).scalars().all() == [tag.id]
+    menus = select(func.count()).where(Menu.place_id == place.id)
+    assert (await test_uow.execute(menus)).scalar_one() == 1
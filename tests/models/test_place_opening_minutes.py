@@ -0,0 +1,42 @@
+import datetime
+import uuid
+from typing import TYPE_CHECKING
+
+import pytest
+
+from app.constants import PlaceType
+from app.models.place import Place
+from app.schemas.options import FilterOptions
+from app.services.places import list_places
+
+if TYPE_CHECKING:
+    from app.db.uow import DBUnitOfWork
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_places_open_at_an_instant_in_their_timezone(test_uow: "DBUnitOfWork") -> None:
+    """Test that places are found open at an instant from the opening hours in their own timezone."""
+    # Open from 9am to 5pm on Mondays, in their local time
+    opening_hours = [{"day": 1, "open": "09:00", "close": "17:00"}]
+    places = {
+        timezone: Place(
+            id=uuid.uuid4(),
+            name=f"Test Restaurant {timezone}",
+            type=PlaceType.FOOD,
+            opening_hours=opening_hours,
+            timezone=timezone,
+        )
+        for timezone in ("UTC", "America/Los_Angeles", "Asia/Shanghai")
+    }
+    for place in places.values():
+        await test_uow.add(place)
+    await test_uow.commit()
+
+    # Monday at 10am in Los Angeles, which is 5pm UTC and 1am on Tuesday in Shanghai
+    open_at = datetime.datetime(2026, 10, 19, 17, 0, tzinfo=datetime.UTC)
+    items, _ = await list_places(test_uow, filter_options=FilterOptions(open_at=open_at))
+
+    assert {item.id for item in items} & {place.id for place in places.values()} == {
+        places["America/Los_Angeles"].id,
+    }
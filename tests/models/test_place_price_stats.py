@@ -0,0 +1,89 @@
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import delete, func, select, text, update
+
+from app.constants import PlaceType
+from app.models.food import Dish, Menu
+from app.models.place import Place
+
+if TYPE_CHECKING:
+    from app.db.uow import DBUnitOfWork
+
+
+async def get_price_stats(test_uow: "DBUnitOfWork", place_id: uuid.UUID) -> tuple:
+    stmt = select(Place.price_min, Place.price_median, Place.price_max, Place.dish_count).where(Place.id == place_id)
+    return (await test_uow.execute(stmt)).one()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_price_stats_follow_dishes(test_uow: "DBUnitOfWork") -> None:
+    """Test that the price stats of a place are maintained as its dishes change."""
+    place = Place(id=uuid.uuid4(), name="Test Restaurant", type=PlaceType.FOOD)
+    menu = Menu(id=uuid.uuid4(), place_id=place.id)
+    await test_uow.add(place)
+    await test_uow.add(menu)
+    await test_uow.commit()
+
+    assert await get_price_stats(test_uow, place.id) == (None, None, None, 0)
+
+    await test_uow.execute(
+        Dish.__table__.insert().values(
+            [
+                {"menu_id": menu.id, "name": name, "name_zh": name, "price": price, "properties": {}}
+                for name, price in [("Tea", Decimal("2.00")), ("Noodles", Decimal("12.00")), ("Fish", Decimal("30.00"))]
+            ],
+        ),
+    )
+    await test_uow.commit()
+    assert await get_price_stats(test_uow, place.id) == (Decimal("2.00"), Decimal("12.00"), Decimal("30.00"), 3)
+
+    await test_uow.execute(update(Dish).where(Dish.name == "Fish", Dish.menu_id == menu.id).values(price=Decimal(40)))
+    await test_uow.commit()
+    assert await get_price_stats(test_uow, place.id) == (Decimal("2.00"), Decimal("12.00"), Decimal("40.00"), 3)
+
+    await test_uow.execute(delete(Dish).where(Dish.name == "Tea", Dish.menu_id == menu.id))
+    await test_uow.commit()
+    assert await get_price_stats(test_uow, place.id) == (Decimal("12.00"), Decimal("26.00"), Decimal("40.00"), 2)
+
+    # Dishes deleted along with their menu
+    await test_uow.execute(delete(Menu).where(Menu.id == menu.id))
+    await test_uow.commit()
+    assert await get_price_stats(test_uow, place.id) == (None, None, None, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_price_stats_are_computed_under_a_lock(test_uow: "DBUnitOfWork") -> None:
+    """Test that writing dishes locks the price stats of their place until commit."""
+    place = Place(id=uuid.uuid4(), name="Test Restaurant", type=PlaceType.FOOD)
+    menu = Menu(id=uuid.uuid4(), place_id=place.id)
+    await test_uow.add(place)
+    await test_uow.add(menu)
+    await test_uow.commit()
+
+    await test_uow.execute(
+        Dish.__table__.insert().values(
+            menu_id=menu.id,
+            name="Tea",
+            name_zh="Tea",
+            price=Decimal("2.00"),
+            properties={},
+        ),
+    )
+
+    locks = await test_uow.execute(
+        select(func.count())
+        .select_from(text("pg_locks"))
+        .where(
+            text(
+                "locktype = 'advisory' AND pid = pg_backend_pid() "
+                "AND classid = hashtext('place_price_stats')::oid "
+                "AND objid = (hashtextextended(:place_id, 0) & 1023)::oid",
+            ).bindparams(place_id=str(place.id)),
+        ),
+    )
+    assert locks.scalar() == 1
@@ -0,0 +1,106 @@
+import uuid
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import event, select
+
+from app.constants import PlaceType
+from app.models.associations import place_tag_association
+from app.models.tag import Tag, TagType
+from app.schemas.places import Location, PlaceCreate, PlaceTagsBatch, PlaceUpdate
+from app.services.places import (
+    add_place_tags,
+    create_place,
+    remove_place_tags,
+    update_place,
+    update_places_tags,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.db.uow import DBUnitOfWork
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_place_writes_return_without_refresh(test_engine: "AsyncEngine", test_uow: "DBUnitOfWork") -> None:
+    """Test that a place is created and updated with a fixed number of statements."""
+    tag_type = TagType(id=uuid.uuid4(), name="Cuisine", place_type=PlaceType.FOOD)
+    tag = Tag(id=uuid.uuid4(), name="Sichuan", tag_type_id=tag_type.id)
+    await test_uow.add(tag_type)
+    await test_uow.add(tag)
+    await test_uow.commit()
+
+    statements = []
+
+    def count_statement(*args: object) -> None:
+        statements.append(args[2])
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        created = await create_place(
+            test_uow,
+            PlaceCreate(
+                name="Test Restaurant",
+                type="food",
+                location=Location(latitude=2.0, longitude=1.0),
+                tag_ids=[tag.id],
+            ),
+        )
+        # Tags and their tag types, the place, and its tags
+        assert len(statements) == 4
+
+        statements.clear()
+        updated = await update_place(test_uow, created.id, PlaceUpdate(name="Renamed", tag_ids=[]))
+        # The place, and the deletion of its tags
+        assert len(statements) == 2
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert created.location == Location(latitude=2.0, longitude=1.0)
+    assert [created_tag.tag_type_name for created_tag in created.tags] == ["Cuisine"]
+    assert updated.name == "Renamed"
+    assert updated.location == created.location
+    assert updated.created_at == created.created_at
+    assert updated.updated_at >= created.updated_at
+    assert updated.tags == []
+
+    stmt = select(place_tag_association.c.tag_id).where(place_tag_association.c.place_id == created.id)
+    assert (await test_uow.execute(stmt)).all() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_place_tags_are_added_and_removed(test_uow: "DBUnitOfWork") -> None:
+    """Test that tags are added to and removed from places without replacing their other tags."""
+    tag_type = TagType(id=uuid.uuid4(), name="Dietary", place_type=PlaceType.FOOD)
+    tags = [Tag(id=uuid.uuid4(), name=name, tag_type_id=tag_type.id) for name in ("Vegan", "Halal", "Kosher")]
+    await test_uow.add(tag_type)
+    for tag in tags:
+        await test_uow.add(tag)
+    await test_uow.commit()
+
+    vegan, halal, kosher = (tag.id for tag in tags)
+    place = await create_place(test_uow, PlaceCreate(name="Test Restaurant", type="food", tag_ids=[vegan]))
+    other = await create_place(test_uow, PlaceCreate(name="Other Restaurant", type="food"))
+
+    async def tag_ids(place_id: uuid.UUID) -> set[uuid.UUID]:
+        stmt = select(place_tag_association.c.tag_id).where(place_tag_association.c.place_id == place_id)
+        return set((await test_uow.execute(stmt)).scalars())
+
+    assert (await add_place_tags(test_uow, place.id, [vegan, halal])).added == 1
+    assert await tag_ids(place.id) == {vegan, halal}
+
+    # Updating a place without tag IDs keeps its tags
+    await update_place(test_uow, place.id, PlaceUpdate(name="Renamed"))
+    assert await tag_ids(place.id) == {vegan, halal}
+
+    assert (await remove_place_tags(test_uow, place.id, [vegan, kosher])).removed == 1
+    assert await tag_ids(place.id) == {halal}
+
+    batch = PlaceTagsBatch(place_ids=[place.id, other.id], add_tag_ids=[kosher], remove_tag_ids=[halal])
+    response = await update_places_tags(test_uow, batch)
+    assert (response.added, response.removed) == (2, 1)
+    assert await tag_ids(place.id) == {kosher}
+    assert await tag_ids(other.id) == {kosher}
@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import delete
+
+from app.db.rate_limit import PostgresRateLimitBackend
+from app.models.rate_limit import rate_limit_buckets
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.db.uow import DBUnitOfWork
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_rate_limit_buckets_are_shared(
+    test_async_sessionmaker: "async_sessionmaker",
+    test_uow: "DBUnitOfWork",
+) -> None:
+    """Test that processes take from the same bucket of a client, through the database."""
+    nodes = [PostgresRateLimitBackend(5, 0.001, lambda: test_async_sessionmaker) for _ in range(2)]
+
+    assert (await nodes[0].take("ip:10.0.0.1", 2)).remaining == 3
+    assert (await nodes[1].take("ip:10.0.0.1", 2)).remaining == 1
+    # Not enough tokens left, none is taken
+    limit = await nodes[0].take("ip:10.0.0.1", 2)
+    assert (limit.allowed, limit.remaining) == (False, 1)
+    assert (await nodes[1].take("ip:10.0.0.2", 2)).allowed
+
+    await test_uow.execute(delete(rate_limit_buckets))
+    await test_uow.commit()
@@ -0,0 +1,26 @@
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from app.constants import PG_QUERY_CANCELED
+from app.db.uow import DBUnitOfWork
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_statements_are_cancelled_past_the_deadline(test_async_sessionmaker: "async_sessionmaker") -> None:
+    """Test that Postgres cancels a statement still running once the deadline of its unit of work passes."""
+    started = time.monotonic()
+
+    async with DBUnitOfWork(test_async_sessionmaker, deadline=started + 0.2) as db:
+        with pytest.raises(DBAPIError) as exc_info:
+            await db.execute(select(func.pg_sleep(5)))
+
+    assert exc_info.value.orig.sqlstate == PG_QUERY_CANCELED
+    assert time.monotonic() - started < 1
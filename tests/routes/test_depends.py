@@ -0,0 +1,77 @@
+import pytest
+from pytest_mock import MockerFixture
+from starlette.requests import Request
+
+from app.constants import AdmissionPriority
+from app.routes.depends import get_admission_priority, get_deadline, get_property_filters
+from app.schemas.errors import InvalidPropertyFilterError
+
+
+def make_request(query_string: str) -> Request:
+    return Request({"type": "http", "query_string": query_string.encode()})
+
+
+@pytest.mark.asyncio
+async def test_get_property_filters() -> None:
+    request = make_request("q=noodles&prop.has_parking=true&prop.cuisine=sichuan&prop.payment.cards=true&prop.seats=40")
+
+    assert await get_property_filters(request) == {
+        "has_parking": True,
+        "cuisine": "sichuan",
+        "payment": {"cards": True},
+        "seats": 40,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query_string", ["prop.=1", "prop.a=1&prop.a.b=2", "prop.a.b=2&prop.a=1", "prop..a=1"])
+async def test_get_property_filters_invalid(query_string: str) -> None:
+    with pytest.raises(InvalidPropertyFilterError):
+        await get_property_filters(make_request(query_string))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("method", "path", "query_string", "priority"),
+    [
+        ("POST", "/admin/places/bulk", "", AdmissionPriority.HIGH),
+        ("POST", "/places/batch-get", "", AdmissionPriority.NORMAL),
+        ("GET", "/places/123", "", AdmissionPriority.NORMAL),
+        ("GET", "/places/", "sw_lat=1", AdmissionPriority.NORMAL),
+        ("GET", "/places/", "q=noodles", AdmissionPriority.LOW),
+    ],
+)
+async def test_get_admission_priority(
+    method: str,
+    path: str,
+    query_string: str,
+    priority: AdmissionPriority,
+) -> None:
+    scope = {"type": "http", "method": method, "path": path, "query_string": query_string.encode(), "headers": []}
+    request = Request(scope)
+
+    assert await get_admission_priority(request) == priority
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "query_string", "request_timeout", "budget"),
+    [
+        ("/places/123", "", None, 5.0),
+        ("/places/", "q=noodles", None, 3.0),
+        ("/admin/places/duplicates", "", None, 60.0),
+        ("/places/123", "", 0.5, 0.5),
+        ("/places/", "q=noodles", 30.0, 3.0),
+    ],
+)
+async def test_get_deadline(
+    mocker: MockerFixture,
+    path: str,
+    query_string: str,
+    request_timeout: float | None,
+    budget: float,
+) -> None:
+    mocker.patch("app.routes.depends.time.monotonic", return_value=100.0)
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query_string.encode(), "headers": []}
+
+    assert await get_deadline(Request(scope), request_timeout) == 100.0 + budget
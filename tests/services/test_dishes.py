@@ -0,0 +1,90 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.constants import Language
+from app.schemas.errors import InvalidPriceRangeError
+from app.schemas.options import PaginationOptions, PriceRange
+from app.schemas.places import LocationBounds
+from app.services.dishes import search_dishes
+from tests.mocks.mock_uow import MockDBUoW
+
+
+def make_dish_row(**values: object) -> SimpleNamespace:
+    row = {
+        "id": uuid4(),
+        "name": "Dan Dan Noodles",
+        "price": Decimal("12.50"),
+        "properties": {},
+        "place_id": uuid4(),
+        "place_name": "Sichuan Garden",
+        "latitude": 37.7749,
+        "longitude": -122.4194,
+    }
+    return SimpleNamespace(**{**row, **values})
+
+
+def make_result(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+@pytest.mark.asyncio
+async def test_search_dishes() -> None:
+    row = make_dish_row()
+    db = MockDBUoW()
+    db.get_count.return_value = 1
+    db.execute.side_effect = [MagicMock(), make_result([row])]
+
+    items, total = await search_dishes(
+        db,
+        "dan dan noodles",
+        bounds=LocationBounds(sw_lat=37.7, sw_lng=-122.5, ne_lat=37.8, ne_lng=-122.4),
+        price_range=PriceRange(max_price=Decimal(15)),
+        pagination_options=PaginationOptions(page=1, page_size=10),
+    )
+
+    assert total == 1
+    [item] = items
+    assert item.display_name == "Dan Dan Noodles"
+    assert item.place.id == row.place_id
+    assert item.place.display_name == "Sichuan Garden"
+    assert item.place.location.latitude == 37.7749
+
+    # The dishes and their places come from a single join query
+    stmt_passed = db.execute.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert "JOIN menus ON menus.id = dishes.menu_id JOIN places ON places.id = menus.place_id" in compiled_sql
+    assert "dishes.name % 'dan dan noodles'" in compiled_sql
+    assert "places.location_geom && ST_MakeEnvelope(-122.5, 37.7, -122.4, 37.8, 4326)" in compiled_sql
+    assert "dishes.price <= 15" in compiled_sql
+    assert "dishes.price >=" not in compiled_sql
+    assert "name_zh AS" not in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_search_dishes_cjk() -> None:
+    row = make_dish_row(name_zh="担担面", place_name_zh="川菜馆")
+    db = MockDBUoW()
+    db.get_count.return_value = 1
+    db.execute.return_value = make_result([row])
+
+    [item], _ = await search_dishes(db, "担担", lang=Language.ZH_CN)
+
+    assert item.display_name == "担担面"
+    assert item.place.display_name == "川菜馆"
+
+    # No similarity threshold is needed for a substring match
+    db.execute.assert_awaited_once()
+    stmt_passed = db.execute.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert "dishes.name_zh LIKE '%' || '担担' || '%'" in compiled_sql
+
+
+def test_price_range_rejects_inverted_bounds() -> None:
+    with pytest.raises(InvalidPriceRangeError):
+        PriceRange(min_price=Decimal(20), max_price=Decimal(10))
@@ -0,0 +1,113 @@
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.services.duplicates import SelfMergeError, find_duplicate_clusters, merge_places
+from app.services.errors import ObjectNotFoundError, ValidationError
+from tests.mocks.mock_uow import MockDBUoW
+
+
+async def stream_rows(rows: list[SimpleNamespace]) -> AsyncIterator[SimpleNamespace]:  # noqa: RUF029
+    for row in rows:
+        yield row
+
+
+def pair(place_id: UUID, duplicate_id: UUID, similarity: float) -> SimpleNamespace:
+    return SimpleNamespace(place_id=place_id, duplicate_id=duplicate_id, distance=12.5, similarity=similarity)
+
+
+@pytest.mark.asyncio
+async def test_find_duplicate_clusters() -> None:
+    a, b, c, d, e = sorted(uuid4() for _ in range(5))
+    db = MockDBUoW()
+    db.stream.return_value = stream_rows([pair(a, b, 0.6), pair(d, e, 0.9), pair(b, c, 0.7)])
+
+    clusters = await find_duplicate_clusters(db, max_distance=30, min_similarity=0.5)
+
+    # Pairs sharing a place are grouped, the most similar cluster first
+    assert [cluster.place_ids for cluster in clusters] == [[d, e], [a, b, c]]
+    assert [cluster.score for cluster in clusters] == [0.9, 0.7]
+    assert [(p.place_id, p.duplicate_id) for p in clusters[1].pairs] == [(a, b), (b, c)]
+
+    # The pairs come from a single spatial self-join, streamed
+    sql = str(db.stream.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FROM places AS place JOIN places AS other ON place.id < other.id AND place.type = other.type" in sql
+    assert "ST_DWithin(other.location_geom, place.location_geom" in sql
+    assert "similarity(place.name_zh, other.name_zh)" in sql
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_find_duplicate_clusters_without_duplicates() -> None:
+    db = MockDBUoW()
+    db.stream.return_value = stream_rows([])
+
+    assert await find_duplicate_clusters(db) == []
+
+
+def ids_result(ids: list[UUID]) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value = ids
+    return result
+
+
+@pytest.mark.asyncio
+async def test_merge_places() -> None:
+    place_id, duplicate_id = uuid4(), uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        ids_result([place_id, duplicate_id]),
+        MagicMock(rowcount=2),
+        MagicMock(rowcount=1),
+        MagicMock(rowcount=1),
+    ]
+
+    response = await merge_places(db, place_id, [duplicate_id, duplicate_id])
+
+    assert (response.merged, response.tags, response.menus) == (1, 2, 1)
+    statements = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in db.execute.await_args_list]
+    assert statements[1].startswith("INSERT INTO places_tags (place_id, tag_id) SELECT DISTINCT")
+    assert statements[1].endswith("ON CONFLICT DO NOTHING")
+    assert statements[2].startswith("UPDATE menus SET place_id=")
+    assert statements[3].startswith("DELETE FROM places WHERE places.id IN")
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_merge_places_constraint_violation() -> None:
+    place_id, duplicate_id = uuid4(), uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [ids_result([place_id, duplicate_id]), IntegrityError("stmt", {}, Exception())]
+
+    with pytest.raises(ValidationError):
+        await merge_places(db, place_id, [duplicate_id])
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_merge_places_missing_duplicate() -> None:
+    place_id, duplicate_id = uuid4(), uuid4()
+    db = MockDBUoW()
+    db.execute.return_value = ids_result([place_id])
+
+    with pytest.raises(ObjectNotFoundError, match=str(duplicate_id)):
+        await merge_places(db, place_id, [duplicate_id])
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_merge_places_into_itself() -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+
+    with pytest.raises(SelfMergeError):
+        await merge_places(db, place_id, [place_id])
+
+    db.execute.assert_not_awaited()
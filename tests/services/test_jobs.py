@@ -0,0 +1,187 @@
+from unittest.mock import ANY, AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.dialects import postgresql
+
+import app.services.jobs as jobs_service
+from app.constants import JobKind, JobStatus
+from app.models.job import Job
+from app.schemas.duplicates import DuplicateCluster
+from app.schemas.places import PlaceBulkDelete, PlaceBulkDeleteResponse
+from app.services.errors import ObjectNotFoundError, ValidationError
+from app.services.jobs import JobRunner, claim_job, enqueue_job, get_job
+from tests.mocks.mock_uow import MockDBUoW
+
+
+def make_job(**values: object) -> Job:
+    defaults = {
+        "id": uuid4(),
+        "kind": JobKind.PLACE_BULK_DELETE,
+        "status": JobStatus.QUEUED,
+        "payload": {"ids": [str(uuid4())]},
+        "progress": 0,
+        "attempts": 0,
+        "created_at": "2026-01-01T00:00:00Z",
+    }
+    return Job(**(defaults | values))
+
+
+@pytest.mark.asyncio
+async def test_enqueue_job() -> None:
+    job = make_job()
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock()
+    db.execute.return_value.scalar_one.return_value = job
+
+    response = await enqueue_job(db, JobKind.PLACE_BULK_DELETE, PlaceBulkDelete(ids=[uuid4()]))
+
+    assert (response.id, response.status) == (job.id, JobStatus.QUEUED)
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO jobs (kind, status, payload")
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_job_not_found() -> None:
+    db = MockDBUoW()
+    db.get.return_value = None
+
+    with pytest.raises(ObjectNotFoundError):
+        await get_job(db, uuid4())
+
+
+@pytest.mark.asyncio
+async def test_claim_job() -> None:
+    job = make_job(status=JobStatus.RUNNING, attempts=1)
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = job
+
+    assert await claim_job(db, "worker") is job
+
+    statements = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in db.execute.await_args_list]
+    # Jobs abandoned too many times are failed, then the oldest waiting job is claimed without waiting
+    assert statements[0].startswith("UPDATE jobs SET status=")
+    assert statements[1].startswith("UPDATE jobs SET status=")
+    assert "FOR UPDATE SKIP LOCKED" in statements[1]
+    assert "RETURNING jobs.kind, jobs.status" in statements[1]
+    db.commit.assert_awaited_once()
+
+
+@pytest.fixture
+def recorded(monkeypatch: pytest.MonkeyPatch) -> dict[str, AsyncMock]:
+    mocks = {name: AsyncMock(return_value=True) for name in ("claim_job", "finish_job", "fail_job", "release_job")}
+    for name, mock in mocks.items():
+        monkeypatch.setattr(jobs_service, name, mock)
+    return mocks
+
+
+@pytest.mark.asyncio
+async def test_job_runner_without_job(recorded: dict[str, AsyncMock]) -> None:
+    recorded["claim_job"].return_value = None
+    handler = AsyncMock()
+    runner = JobRunner(AsyncMock, {JobKind.PLACE_BULK_DELETE: handler})
+
+    assert not await runner.run_next()
+
+    handler.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_runner_runs_job(recorded: dict[str, AsyncMock]) -> None:
+    job = make_job()
+    recorded["claim_job"].return_value = job
+    handler = AsyncMock(return_value=PlaceBulkDeleteResponse(deleted=3))
+    runner = JobRunner(AsyncMock, {JobKind.PLACE_BULK_DELETE: handler})
+
+    assert await runner.run_next()
+
+    handler.assert_awaited_once_with(ANY, job.payload, ANY)
+    worker = recorded["claim_job"].await_args.args[1]
+    recorded["finish_job"].assert_awaited_once_with(ANY, job.id, worker, {"deleted": 3})
+    recorded["fail_job"].assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_runner_fails_job(recorded: dict[str, AsyncMock]) -> None:
+    job = make_job()
+    recorded["claim_job"].return_value = job
+    handler = AsyncMock(side_effect=ValidationError("Invalid places"))
+    runner = JobRunner(AsyncMock, {JobKind.PLACE_BULK_DELETE: handler})
+
+    assert await runner.run_next()
+
+    recorded["fail_job"].assert_awaited_once_with(ANY, job.id, ANY, "Invalid places")
+    recorded["finish_job"].assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_runner_claims_under_distinct_names(recorded: dict[str, AsyncMock]) -> None:
+    recorded["claim_job"].return_value = None
+    runner = JobRunner(AsyncMock, {})
+
+    await runner.run_next()
+    await runner.run_next()
+
+    first, second = (call.args[1] for call in recorded["claim_job"].await_args_list)
+    assert first != second
+
+
+@pytest.mark.asyncio
+async def test_job_runner_stops_job_claimed_again(
+    recorded: dict[str, AsyncMock],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    job = make_job()
+    recorded["claim_job"].return_value = job
+    monkeypatch.setattr(jobs_service, "report_job_progress", AsyncMock(return_value=False))
+
+    async def handler(_db: object, _payload: dict, report: jobs_service.ProgressReporter) -> None:
+        await report(1, 2)
+        pytest.fail("The job kept running after it was claimed again")
+
+    runner = JobRunner(AsyncMock, {JobKind.PLACE_BULK_DELETE: handler})
+
+    assert await runner.run_next()
+
+    recorded["finish_job"].assert_not_awaited()
+    recorded["fail_job"].assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_updates_check_ownership() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock(rowcount=0)
+
+    assert not await jobs_service.finish_job(db, uuid4(), "host:1:2", None)
+
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "jobs.worker = %(worker_1)s::VARCHAR AND jobs.status = %(status_1)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_place_bulk_upsert_job_reports_progress(mocker: MockerFixture) -> None:
+    upsert = mocker.patch.object(jobs_service.places_service, "bulk_upsert_places", return_value=None)
+    report = AsyncMock()
+    db = MockDBUoW()
+
+    handler = jobs_service.JOB_HANDLERS[JobKind.PLACE_BULK_UPSERT]
+    await handler(db, {"places": [{"name": "Place", "type": "food"}]}, report)
+
+    report.assert_awaited_once_with(0, 1)
+    assert upsert.await_args.kwargs["report"] is report
+
+
+@pytest.mark.asyncio
+async def test_place_duplicate_search_job(mocker: MockerFixture) -> None:
+    cluster = DuplicateCluster(place_ids=[uuid4(), uuid4()], score=0.8)
+    find = mocker.patch.object(jobs_service.duplicates_service, "find_duplicate_clusters", return_value=[cluster])
+    db = MockDBUoW()
+
+    handler = jobs_service.JOB_HANDLERS[JobKind.PLACE_DUPLICATE_SEARCH]
+    result = await handler(db, {"max_distance": 20}, AsyncMock())
+
+    find.assert_awaited_once_with(db=db, max_distance=20, min_similarity=ANY)
+    assert result.model_dump(mode="json") == {"clusters": [cluster.model_dump(mode="json")]}
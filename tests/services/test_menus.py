@@ -0,0 +1,194 @@
+import hashlib
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.constants import MENU_IMPORT_MAX_DISHES, Language, MenuImportMode
+from app.models.food import MenuSnapshot
+from app.schemas.errors import DuplicateDishCategoryError, TooManyDishesError
+from app.schemas.menus import DishCategoryImport, DishImport, MenuImport, MenuImportResponse
+from app.services.errors import ObjectNotFoundError, ValidationError
+from app.services.menus import get_menu_snapshot, import_place_menu
+from tests.mocks.mock_uow import MockDBUoW
+
+
+def make_result(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def make_scalar_result(value: object) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    result.scalar_one.return_value = value
+    return result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lang", [Language.EN_US, Language.ZH_CN])
+async def test_get_menu_snapshot(lang: Language) -> None:
+    place_id = uuid4()
+    snapshot = MenuSnapshot(place_id=place_id, lang=lang, document='[{"id": "1"}]', etag="abc")
+    db = MockDBUoW()
+    db.execute.return_value = make_scalar_result(snapshot)
+
+    assert await get_menu_snapshot(db, place_id, lang) is snapshot
+
+    # A single primary key lookup, nothing is rendered on read
+    db.execute.assert_awaited_once()
+    stmt_passed = db.execute.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert f"menu_snapshots.place_id = '{place_id}'" in compiled_sql
+    assert f"menu_snapshots.lang = '{lang}'" in compiled_sql
+    assert "json_agg" not in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_get_menu_snapshot_without_menus() -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [make_scalar_result(None), make_scalar_result(place_id)]
+
+    snapshot = await get_menu_snapshot(db, place_id, Language.EN_US)
+
+    assert snapshot.document == "[]"
+    assert snapshot.etag == hashlib.sha256(b"[]").hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_get_menu_snapshot_place_not_found() -> None:
+    db = MockDBUoW()
+    db.execute.side_effect = [make_scalar_result(None), make_scalar_result(None)]
+
+    with pytest.raises(ObjectNotFoundError):
+        await get_menu_snapshot(db, uuid4(), Language.EN_US)
+
+
+@pytest.fixture
+def menu_import() -> MenuImport:
+    return MenuImport(
+        categories=[
+            DishCategoryImport(
+                name="Noodles",
+                name_zh="面",
+                dishes=[DishImport(name=f"Noodles {i}", name_zh=f"面 {i}", price=Decimal("9.99")) for i in range(300)],
+            ),
+        ],
+        dishes=[DishImport(name="Tea", name_zh="茶", price=Decimal("2.00"))],
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_place_menu_replace(menu_import: MenuImport) -> None:
+    place_id = uuid4()
+    menu_id = uuid4()
+    category_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        make_scalar_result(place_id),
+        MagicMock(),
+        MagicMock(),
+        make_scalar_result(menu_id),
+        make_result([("Noodles", category_id)]),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+    ]
+
+    response = await import_place_menu(db, place_id, menu_import)
+
+    assert response == MenuImportResponse(menu_id=menu_id, categories=1, dishes=301)
+    db.commit.assert_awaited_once()
+
+    statements = [call.args[0].compile(dialect=postgresql.dialect()) for call in db.execute.call_args_list]
+    assert str(statements[2]).startswith("DELETE FROM menus")
+    # Every dish is written by the same multi-row INSERT
+    dishes_insert = statements[5]
+    assert str(dishes_insert).startswith("INSERT INTO dishes")
+    assert dishes_insert.params["category_id_m0"] is None
+    assert dishes_insert.params["category_id_m1"] == category_id
+    assert dishes_insert.params["name_m300"] == "Noodles 299"
+
+    # The snapshot triggers are deferred during the writes, and the snapshot of the place is rendered once
+    assert str(statements[1]).startswith("SELECT set_config(")
+    assert list(statements[1].params.values()) == ["weat.defer_menu_snapshots", "on"]
+    assert list(statements[6].params.values()) == ["weat.defer_menu_snapshots", "off"]
+    assert "refresh_menu_snapshots(ARRAY[" in str(statements[7])
+    assert statements[7].params["param_1"] == place_id
+
+
+@pytest.mark.asyncio
+async def test_import_place_menu_merge(menu_import: MenuImport) -> None:
+    place_id = uuid4()
+    menu_id = uuid4()
+    category_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        make_scalar_result(place_id),
+        MagicMock(),
+        make_scalar_result(menu_id),
+        make_result([("Noodles", category_id, "面条")]),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+    ]
+
+    response = await import_place_menu(db, place_id, menu_import, MenuImportMode.MERGE)
+
+    assert response.menu_id == menu_id
+    statements = [call.args[0].compile(dialect=postgresql.dialect()) for call in db.execute.call_args_list]
+    # The existing category is reused and renamed, and dishes of the same name are replaced
+    assert str(statements[4]).startswith("UPDATE dish_categories SET name_zh=names.name_zh")
+    assert "FROM (VALUES" in str(statements[4])
+    assert statements[4].params["param_1"] == category_id
+    assert statements[4].params["param_2"] == "面"
+    assert str(statements[5]).startswith("DELETE FROM dishes")
+    assert str(statements[6]).startswith("INSERT INTO dishes")
+    assert "refresh_menu_snapshots(ARRAY[" in str(statements[8])
+    assert not any(str(statement).startswith("INSERT INTO dish_categories") for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_import_place_menu_constraint_violation(menu_import: MenuImport) -> None:
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        make_scalar_result(uuid4()),
+        MagicMock(),
+        MagicMock(),
+        IntegrityError("INSERT INTO menus", None, Exception("violates foreign key constraint")),
+    ]
+
+    with pytest.raises(ValidationError):
+        await import_place_menu(db, uuid4(), menu_import)
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_import_place_menu_place_not_found(menu_import: MenuImport) -> None:
+    db = MockDBUoW()
+    db.execute.return_value = make_scalar_result(None)
+
+    with pytest.raises(ObjectNotFoundError):
+        await import_place_menu(db, uuid4(), menu_import)
+
+    db.commit.assert_not_awaited()
+
+
+def test_menu_import_rejects_duplicate_categories() -> None:
+    with pytest.raises(DuplicateDishCategoryError):
+        MenuImport(categories=[DishCategoryImport(name="Noodles", name_zh="面")] * 2)
+
+
+def test_menu_import_rejects_too_many_dishes() -> None:
+    dish = DishImport(name="Tea", name_zh="茶", price=Decimal("2.00"))
+
+    with pytest.raises(TooManyDishesError):
+        MenuImport(dishes=[dish] * (MENU_IMPORT_MAX_DISHES + 1))
@@ -1,25 +1,57 @@
+import asyncio
 import datetime
+from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from uuid import uuid4
 
 import pytest
 from geoalchemy2 import WKTElement
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 
+from app.constants import (
+    PLACE_BATCH_GET_MAX_PLACES,
+    PLACE_BULK_DELETE_MAX_PLACES,
+    PLACE_BULK_UPSERT_MAX_PLACES,
+    PLACE_FACET_CANDIDATE_LIMIT,
+    PLACE_TAGS_BATCH_MAX_PLACES,
+    Language,
+    PlaceUpsertStatus,
+)
 from app.models.place import Place
 from app.models.tag import Tag, TagType
-from app.schemas.options import FilterOptions, PaginationOptions
-from app.schemas.places import Location, LocationBounds, PlaceCreate, PlaceResponse, PlaceUpdate
+from app.schemas.options import FilterOptions, PaginationOptions, PriceRange, SortOptions
+from app.schemas.places import (
+    LocalizedPlaceResponse,
+    Location,
+    LocationBounds,
+    MatchingDish,
+    PlaceBatchGet,
+    PlaceBulkDelete,
+    PlaceBulkUpsert,
+    PlaceCreate,
+    PlaceResponse,
+    PlaceTagsBatch,
+    PlaceUpdate,
+)
 from app.services.errors import (
     ObjectNotFoundError,
     ValidationError,
 )
 from app.services.places import (
+    add_place_tags,
+    bulk_delete_places,
+    bulk_upsert_places,
     create_place,
     delete_place,
     get_place,
+    get_places,
+    list_place_facets,
     list_places,
+    remove_place_tags,
     update_place,
+    update_places_tags,
 )
 from tests.mocks.mock_uow import MockDBUoW
 
@@ -32,6 +64,7 @@ def mock_place() -> Place:
         type="food",
         location_geom=WKTElement("POINT(1.0 2.0)", srid=4326),
         opening_hours=[],
+        timezone="UTC",
         properties={},
         created_at=datetime.datetime.now(datetime.UTC),
         updated_at=datetime.datetime.now(datetime.UTC),
@@ -63,7 +96,7 @@ async def test_get_place(mock_place: Place) -> None:
     response = await get_place(db, place_id)
     assert isinstance(response, PlaceResponse)
     assert isinstance(response.location, Location)
-    db.get.assert_awaited_with(Place, place_id)
+    db.get.assert_awaited_with(Place, place_id, options=[])
 
 
 @pytest.mark.asyncio
@@ -74,39 +107,79 @@ async def test_get_place_not_found() -> None:
         await get_place(db, uuid4())
 
 
+# The result of an INSERT or UPDATE ... RETURNING of a place
+def _written_result(**values: object) -> MagicMock:
+    now = datetime.datetime.now(datetime.UTC)
+    mapping = {
+        "id": uuid4(),
+        "name": "Test",
+        "name_zh": None,
+        "type": "food",
+        "address": None,
+        "google_maps_url": None,
+        "google_maps_place_id": None,
+        "phone_number": None,
+        "website_url": None,
+        "opening_hours": [],
+        "timezone": "UTC",
+        "properties": {},
+        "created_at": now,
+        "updated_at": now,
+        "latitude": None,
+        "longitude": None,
+        **values,
+    }
+    row = SimpleNamespace(_asdict=lambda: mapping, **mapping)
+    result = MagicMock()
+    result.one.return_value = row
+    result.one_or_none.return_value = row
+    return result
+
+
 @pytest.mark.asyncio
 async def test_create_place_success() -> None:
-    def fake_refresh_created(obj: Place) -> None:
-        obj.id = uuid4()
-        obj.created_at = "2023-01-01T00:00:00Z"
-        obj.updated_at = "2023-01-01T00:00:00Z"
-
     db = MockDBUoW()
-    db.get_all.return_value = []
-    db.refresh.side_effect = fake_refresh_created
+    db.execute.return_value = _written_result(latitude=2.0, longitude=1.0)
 
     data = PlaceCreate(
         name="Test",
         name_zh=None,
         type="food",
+        location=Location(latitude=2.0, longitude=1.0),
     )
 
     response = await create_place(db, data)
     assert isinstance(response, PlaceResponse)
-    db.add.assert_awaited()
-    db.commit.assert_awaited()
+    assert response.location == Location(latitude=2.0, longitude=1.0)
+    assert response.tags == []
+
+    # A single INSERT ... RETURNING, with no tags to look up or write and nothing to read back
+    assert db.execute.await_count == 1
+    stmt = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    assert str(stmt).startswith("INSERT INTO places")
+    assert "ST_MakePoint" in str(stmt)
+    assert "RETURNING" in str(stmt)
+    db.get_all.assert_not_awaited()
+    db.add.assert_not_awaited()
+    db.refresh.assert_not_awaited()
+    db.commit.assert_awaited_once()
+
+
+def test_place_create_derives_timezone_from_location() -> None:
+    place = PlaceCreate(name="Test", type="food", location=Location(latitude=37.7749, longitude=-122.4194))
+    assert place.timezone == "America/Los_Angeles"
+
+    # A given timezone is kept, and places without a location are in the default timezone
+    place = PlaceCreate(name="Test", type="food", timezone="UTC", location=Location(latitude=35.0, longitude=139.0))
+    assert place.timezone == "UTC"
+    assert PlaceCreate(name="Test", type="food").timezone == "UTC"
 
 
 @pytest.mark.asyncio
 async def test_create_place_with_valid_tags(mock_tag: Tag) -> None:
-    def fake_refresh_created(obj: Place) -> None:
-        obj.id = uuid4()
-        obj.created_at = "2023-01-01T00:00:00Z"
-        obj.updated_at = "2023-01-01T00:00:00Z"
-
     db = MockDBUoW()
     db.get_all.return_value = [mock_tag]
-    db.refresh.side_effect = fake_refresh_created
+    db.execute.return_value = _written_result()
 
     data = PlaceCreate(
         name="Test",
@@ -117,8 +190,15 @@ async def test_create_place_with_valid_tags(mock_tag: Tag) -> None:
 
     response = await create_place(db, data)
     assert isinstance(response, PlaceResponse)
-    db.add.assert_awaited()
-    db.commit.assert_awaited()
+    assert [tag.id for tag in response.tags] == [mock_tag.id]
+
+    # The tags are looked up once, then the place and its tags are each written with one INSERT
+    db.get_all.assert_awaited_once()
+    assert db.execute.await_count == 2
+    stmt = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    assert str(stmt).startswith("INSERT INTO places_tags")
+    db.refresh.assert_not_awaited()
+    db.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -141,7 +221,7 @@ async def test_create_place_with_invalid_tags() -> None:
 async def test_create_place_integrity_error() -> None:
     db = MockDBUoW()
     db.get_all.return_value = []
-    db.commit.side_effect = IntegrityError("stmt", {}, Exception())
+    db.execute.side_effect = IntegrityError("stmt", {}, Exception())
 
     data = PlaceCreate(
         name="Test",
@@ -155,6 +235,7 @@ async def test_create_place_integrity_error() -> None:
         phone_number=None,
         website_url=None,
         opening_hours=[],
+        timezone="UTC",
         properties={},
         tag_ids=[],
     )
@@ -172,25 +253,117 @@ async def test_get_place_success(mock_place: Place) -> None:
 
 
 @pytest.mark.asyncio
-async def test_update_place_success(mock_place: Place) -> None:
+async def test_get_places_preserves_order_and_reports_missing() -> None:
+    places = [
+        Place(
+            id=uuid4(),
+            name=f"Place {i}",
+            name_zh=f"地方 {i}",
+            type="food",
+            opening_hours=[],
+            timezone="UTC",
+            properties={},
+        )
+        for i in range(3)
+    ]
+    for place in places:
+        place.created_at = place.updated_at = datetime.datetime.now(datetime.UTC)
+    missing_id = uuid4()
     db = MockDBUoW()
-    db.get.return_value = mock_place
-    db.get_all.return_value = []
+    db.get_all.return_value = list(reversed(places))
+
+    requested = [places[1].id, missing_id, places[0].id, places[2].id, places[1].id]
+    response = await get_places(db, requested, Language.ZH_CN)
+
+    assert [item.id for item in response.items] == [places[1].id, places[0].id, places[2].id]
+    assert [item.display_name for item in response.items] == ["地方 1", "地方 0", "地方 2"]
+    assert isinstance(response.items[0], LocalizedPlaceResponse)
+    assert response.missing == [missing_id]
+
+    # A single query with one array parameter, each ID once
+    db.get_all.assert_awaited_once()
+    db.get.assert_not_awaited()
+    stmt = db.get_all.await_args.args[0]
+    assert "places.id = ANY" in str(stmt.compile(dialect=postgresql.dialect()))
+    assert stmt.compile().params["param_1"] == [places[1].id, missing_id, places[0].id, places[2].id]
+
+
+@pytest.mark.asyncio
+async def test_get_places_without_ids() -> None:
+    db = MockDBUoW()
+
+    response = await get_places(db, [])
+
+    assert response.items == []
+    assert response.missing == []
+    db.get_all.assert_not_awaited()
+
+
+def test_place_batch_get_rejects_too_many_places() -> None:
+    with pytest.raises(ValidationError, match="can be fetched at once"):
+        PlaceBatchGet(ids=[uuid4()] * (PLACE_BATCH_GET_MAX_PLACES + 1))
+
+
+@pytest.mark.asyncio
+async def test_update_place_success() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = _written_result(name="Updated")
 
     data = PlaceUpdate(name="Updated", tag_ids=[])
     response = await update_place(db, uuid4(), data)
     assert isinstance(response, PlaceResponse)
     assert response.name == "Updated"
-    db.commit.assert_awaited()
+
+    # One UPDATE ... RETURNING and one DELETE of the previous tags, without loading the place
+    assert db.execute.await_count == 2
+    stmt = str(db.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert stmt.startswith("UPDATE places SET name=")
+    assert "RETURNING" in stmt
+    db.get.assert_not_awaited()
+    db.get_all.assert_not_awaited()
+    db.refresh.assert_not_awaited()
+    db.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_update_place_integrity_error() -> None:
+async def test_update_place_without_tag_ids_keeps_tags(mock_tag: Tag) -> None:
     db = MockDBUoW()
-    db.get.return_value = MagicMock()
-    db.get_all.return_value = []
+    db.execute.return_value = _written_result(name="Updated")
+    db.get_all.return_value = [mock_tag]
+
+    response = await update_place(db, uuid4(), PlaceUpdate(name="Updated"))
+    assert [tag.id for tag in response.tags] == [mock_tag.id]
+
+    # Only the UPDATE, the current tags being read for the response rather than replaced
+    assert db.execute.await_count == 1
+    db.get_all.assert_awaited_once()
+    tags_sql = str(db.get_all.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN places_tags" in tags_sql
+
 
-    db.commit.side_effect = IntegrityError("stmt", {}, Exception())
+def test_place_update_rejects_null_timezone() -> None:
+    # An unset timezone keeps the current one, but a place cannot be left without a timezone
+    assert "timezone" not in PlaceUpdate(name="Test").model_dump(exclude_unset=True)
+    with pytest.raises(ValidationError, match="Invalid timezone: None"):
+        PlaceUpdate(timezone=None)
+
+
+@pytest.mark.asyncio
+async def test_update_place_not_found() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock()
+    db.execute.return_value.one_or_none.return_value = None
+
+    with pytest.raises(ObjectNotFoundError):
+        await update_place(db, uuid4(), PlaceUpdate(name="Missing", tag_ids=[]))
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_place_integrity_error() -> None:
+    db = MockDBUoW()
+    db.execute.side_effect = IntegrityError("stmt", {}, Exception())
 
     data = PlaceUpdate(name="Fail", tag_ids=[])
 
@@ -198,16 +371,224 @@ async def test_update_place_integrity_error() -> None:
         await update_place(db, uuid4(), data)
 
 
+def _ids_result(ids: list) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value = ids
+    return result
+
+
+@pytest.mark.asyncio
+async def test_add_place_tags(mock_tag: Tag) -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [_ids_result([place_id]), _ids_result([mock_tag.id]), MagicMock(rowcount=1)]
+
+    response = await add_place_tags(db, place_id, [mock_tag.id])
+
+    assert response.added == 1
+    assert response.removed == 0
+    # Place check, tag check and a single INSERT, without loading the tags of the place
+    assert db.execute.await_count == 3
+    insert_sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert insert_sql.startswith("INSERT INTO places_tags (place_id, tag_id) SELECT")
+    assert "tags.id = ANY (%(param_2)s::UUID[])" in insert_sql
+    assert insert_sql.endswith("ON CONFLICT DO NOTHING")
+    db.get_all.assert_not_awaited()
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_add_place_tags_place_not_found() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = _ids_result([])
+
+    with pytest.raises(ObjectNotFoundError):
+        await add_place_tags(db, uuid4(), [uuid4()])
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_place_tags_invalid_tag() -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [_ids_result([place_id]), _ids_result([])]
+
+    with pytest.raises(ValidationError, match="Invalid tag IDs"):
+        await add_place_tags(db, place_id, [uuid4()])
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_remove_place_tags() -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [_ids_result([place_id]), MagicMock(rowcount=2)]
+
+    response = await remove_place_tags(db, place_id, [uuid4(), uuid4()])
+
+    assert response.removed == 2
+    assert db.execute.await_count == 2
+    delete_sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert delete_sql.startswith("DELETE FROM places_tags WHERE places_tags.place_id = ANY")
+    assert "places_tags.tag_id = ANY" in delete_sql
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_places_tags(mock_tag: Tag) -> None:
+    place_ids = [uuid4() for _ in range(3)]
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        _ids_result(place_ids),
+        _ids_result([mock_tag.id]),
+        MagicMock(rowcount=1),
+        MagicMock(rowcount=3),
+    ]
+
+    batch = PlaceTagsBatch(place_ids=place_ids, add_tag_ids=[mock_tag.id], remove_tag_ids=[uuid4()])
+    response = await update_places_tags(db, batch)
+
+    assert (response.added, response.removed) == (3, 1)
+    # Place check, tag check, one DELETE and one INSERT, whatever the number of places
+    assert db.execute.await_count == 4
+    insert_stmt = db.execute.await_args.args[0]
+    assert insert_stmt.compile().params["param_1"] == place_ids
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_places_tags_place_not_found() -> None:
+    place_ids = [uuid4(), uuid4()]
+    db = MockDBUoW()
+    db.execute.return_value = _ids_result(place_ids[:1])
+
+    with pytest.raises(ObjectNotFoundError, match=str(place_ids[1])):
+        await update_places_tags(db, PlaceTagsBatch(place_ids=place_ids, remove_tag_ids=[uuid4()]))
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_places_tags_constraint_violation(mock_tag: Tag) -> None:
+    place_ids = [uuid4()]
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        _ids_result(place_ids),
+        _ids_result([mock_tag.id]),
+        IntegrityError("stmt", {}, Exception()),
+    ]
+
+    with pytest.raises(ValidationError):
+        await update_places_tags(db, PlaceTagsBatch(place_ids=place_ids, add_tag_ids=[mock_tag.id]))
+
+    db.commit.assert_not_awaited()
+
+
+def test_place_tags_batch_rejects_conflicting_tags() -> None:
+    tag_id = uuid4()
+    with pytest.raises(ValidationError, match="Conflicting tag IDs"):
+        PlaceTagsBatch(place_ids=[uuid4()], add_tag_ids=[tag_id], remove_tag_ids=[tag_id])
+
+
+def test_place_tags_batch_rejects_too_many_places() -> None:
+    with pytest.raises(ValidationError, match="can be tagged at once"):
+        PlaceTagsBatch(place_ids=[uuid4()] * (PLACE_TAGS_BATCH_MAX_PLACES + 1))
+
+
 @pytest.mark.asyncio
 async def test_delete_place(mock_place: Place) -> None:
     db = MockDBUoW()
-    db.get.return_value = mock_place
+    db.execute.return_value = MagicMock(rowcount=1)
 
     await delete_place(db, mock_place.id)
-    db.delete.assert_awaited_with(mock_place)
+
+    # A single DELETE, without loading the place, its tags or its menus
+    db.execute.assert_awaited_once()
+    assert str(db.execute.await_args.args[0].compile()).startswith("DELETE FROM places WHERE places.id =")
+    db.get.assert_not_awaited()
+    db.delete.assert_not_awaited()
     db.commit.assert_awaited()
 
 
+@pytest.mark.asyncio
+async def test_delete_place_not_found() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock(rowcount=0)
+
+    with pytest.raises(ObjectNotFoundError):
+        await delete_place(db, uuid4())
+
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_places_by_ids() -> None:
+    place_ids = [uuid4() for _ in range(3)]
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock(rowcount=2)
+
+    response = await bulk_delete_places(db, place_ids=place_ids)
+
+    assert response.deleted == 2
+    db.execute.assert_awaited_once()
+    stmt = db.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM places WHERE places.id IN (SELECT places.id")
+    assert "places.id = ANY (%(param_1)s::UUID[])" in sql
+    assert stmt.compile().params["param_1"] == place_ids
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_places_by_filter() -> None:
+    db = MockDBUoW()
+    db.execute.return_value = MagicMock(rowcount=10000)
+
+    response = await bulk_delete_places(
+        db,
+        bounds=LocationBounds(sw_lat=0, sw_lng=0, ne_lat=1, ne_lng=1),
+        filter_options=FilterOptions(properties={"closed": True}),
+    )
+
+    assert response.deleted == 10000
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "places.location_geom && ST_MakeEnvelope" in sql
+    assert "places.properties @>" in sql
+
+
+def test_place_bulk_delete_requires_a_selection() -> None:
+    with pytest.raises(ValidationError, match="Missing place selection"):
+        PlaceBulkDelete()
+    with pytest.raises(ValidationError, match="Missing place selection"):
+        PlaceBulkDelete(filters={"price_range": {}})
+
+    assert PlaceBulkDelete(ids=[]).ids == []
+    assert PlaceBulkDelete(filters={"properties": {"closed": True}}).filters.properties == {"closed": True}
+
+
+@pytest.mark.parametrize("filters", [{"q": "!"}, {"q": " "}, {"dish_q": "noodles"}, {"q": "closed", "properties": {}}])
+def test_place_bulk_delete_rejects_search_queries(filters: dict) -> None:
+    with pytest.raises(ValidationError, match="Inexact place selection"):
+        PlaceBulkDelete(ids=[uuid4()], filters=filters)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_places_rejects_search_queries() -> None:
+    db = MockDBUoW()
+
+    with pytest.raises(ValidationError, match="Inexact place selection"):
+        await bulk_delete_places(db, filter_options=FilterOptions(q="é"))
+
+    db.execute.assert_not_awaited()
+
+
+def test_place_bulk_delete_rejects_too_many_places() -> None:
+    with pytest.raises(ValidationError, match="can be deleted at once"):
+        PlaceBulkDelete(ids=[uuid4()] * (PLACE_BULK_DELETE_MAX_PLACES + 1))
+
+
 @pytest.mark.asyncio
 async def test_list_places(mock_place: Place) -> None:
     db = MockDBUoW()
@@ -260,6 +641,31 @@ async def test_list_places_with_valid_bounds(mock_place: Place) -> None:
     assert f"places.location_geom && ST_MakeEnvelope({sw_lng}, {sw_lat}, {ne_lng}, {ne_lat}, 4326)" in compiled_sql
 
 
+@pytest.mark.asyncio
+async def test_list_places_coalesces_identical_calls(mock_place: Place) -> None:
+    async def count(_stmt: object) -> int:
+        # Let the other calls start while the first one queries
+        await asyncio.sleep(0)
+        return 123
+
+    dbs = [MockDBUoW() for _ in range(3)]
+    for db in dbs:
+        db.get_all.return_value = [mock_place]
+        db.get_count.side_effect = count
+
+    bounds = LocationBounds(sw_lat=1, sw_lng=2, ne_lat=3, ne_lng=4)
+    results = await asyncio.gather(
+        list_places(dbs[0], bounds=bounds, filter_options=FilterOptions(q="noodles")),
+        list_places(dbs[1], bounds=bounds, filter_options=FilterOptions(q="noodles")),
+        list_places(dbs[2], bounds=bounds, filter_options=FilterOptions(q="dumplings")),
+    )
+
+    # The identical calls share the queries and result of the first
+    assert results[0] is results[1]
+    assert [db.get_count.await_count for db in dbs] == [1, 0, 1]
+    assert [db.get_all.await_count for db in dbs] == [1, 0, 1]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("sw_lat", "sw_lng", "ne_lat", "ne_lng"),
@@ -319,6 +725,7 @@ async def test_search_places(mock_place: Place) -> None:
     assert "places.name %" in compiled_sql
     assert "places.name_zh %" in compiled_sql
     assert "places.address %" in compiled_sql
+    assert "places.name_zh_pinyin %" in compiled_sql
 
 
 @pytest.mark.asyncio
@@ -338,3 +745,402 @@ async def test_search_places_no_query(mock_place: Place) -> None:
 
     compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
     assert "LIKE" not in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_search_places_cjk(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(q="牛肉麵"))
+
+    # CJK queries match the bigram tokens of name_zh instead of trigrams
+    stmt_passed = db.get_all.call_args.args[0]
+
+    compiled_sql = str(stmt_passed.compile(dialect=postgresql.dialect()))
+    assert "places.name_zh_tokens @>" in compiled_sql
+    assert "places.name %" not in compiled_sql
+    assert stmt_passed.compile(dialect=postgresql.dialect()).params["name_zh_tokens_1"] == ["牛肉", "肉面"]
+
+
+def test_place_search_fields_follow_name_zh(mock_place: Place) -> None:
+    mock_place.name_zh = "鼎泰豐"
+    assert mock_place.name_zh_tokens == ["丰", "泰", "泰丰", "鼎", "鼎泰"]
+    assert mock_place.name_zh_pinyin == "dingtaifeng"
+    assert mock_place.name_zh_pinyin_initials == "dtf"
+
+    mock_place.update(PlaceUpdate(name_zh=None))
+    assert mock_place.name_zh_tokens == []
+    assert mock_place.name_zh_pinyin is None
+
+
+@pytest.mark.asyncio
+async def test_search_places_pinyin(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(q="Xiao Long Bao"))
+
+    # The query is compacted to match the stored transliteration, which is never computed at query time
+    stmt_passed = db.get_all.call_args.args[0]
+
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert "places.name_zh_pinyin % 'xiaolongbao'" in compiled_sql
+    assert "places.name_zh_pinyin_initials LIKE 'xiaolongbao' || '%'" in compiled_sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q", ["!!!", "é", "—", " "])
+async def test_search_places_without_pinyin(mock_place: Place, q: str) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(q=q))
+
+    # An empty pinyin prefix would match every place with a Chinese name
+    compiled_sql = str(db.get_all.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "places.name %" in compiled_sql
+    assert "name_zh_pinyin" not in compiled_sql.partition("ORDER BY")[0]
+    assert "name_zh_pinyin_initials" not in compiled_sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("lang", "display_name"),
+    [
+        (Language.EN_US, "Test Place"),
+        (Language.ZH_CN, "测试地点"),
+    ],
+)
+async def test_get_place_localized(mock_place: Place, lang: Language, display_name: str) -> None:
+    mock_place.name_zh = "测试地点"
+    db = MockDBUoW()
+    db.get.return_value = mock_place
+
+    response = await get_place(db, mock_place.id, lang=lang)
+    assert isinstance(response, LocalizedPlaceResponse)
+    assert response.display_name == display_name
+    assert "name_zh" not in response.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_get_place_localized_falls_back_to_name(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get.return_value = mock_place
+
+    response = await get_place(db, mock_place.id, lang=Language.ZH_CN)
+    assert response.display_name == "Test Place"
+
+
+@pytest.mark.asyncio
+async def test_list_places_localized_leaves_name_zh_unloaded(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    items, _ = await list_places(db, filter_options=FilterOptions(q="Test"), lang=Language.EN_US)
+    assert isinstance(items[0], LocalizedPlaceResponse)
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    select_clause = compiled_sql.split("FROM")[0]
+    assert "places.name," in select_clause
+    assert "places.name_zh," not in select_clause
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("lang", "name_weight", "name_zh_weight"),
+    [
+        (Language.EN_US, 1.0, 1.5),
+        (Language.ZH_CN, 1.5, 1.0),
+    ],
+)
+async def test_search_places_ranking_follows_lang(
+    mock_place: Place,
+    lang: Language,
+    name_weight: float,
+    name_zh_weight: float,
+) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(q="Test"), lang=lang)
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert f"coalesce(CAST(places.name <-> 'Test' AS FLOAT), 1.0) * {name_weight}" in compiled_sql
+    assert f"coalesce(CAST(places.name_zh <-> 'Test' AS FLOAT), 1.0) * {name_zh_weight}" in compiled_sql
+
+
+def make_facet_row(grouping: int, count: int, **values: object) -> SimpleNamespace:
+    row = {"tag_id": None, "tag_name": None, "tag_type_id": None, "type_id": None, "tag_type_name": None}
+    return SimpleNamespace(grouping=grouping, count=count, **{**row, **values})
+
+
+@pytest.mark.asyncio
+async def test_list_place_facets(mock_tag: Tag) -> None:
+    db = MockDBUoW()
+    result = MagicMock()
+    result.all.return_value = [
+        make_facet_row(1, 3, tag_id=mock_tag.id, tag_name=mock_tag.name, tag_type_id=mock_tag.tag_type_id),
+        # Places without any tag
+        make_facet_row(1, 2),
+        make_facet_row(2, 3, type_id=mock_tag.tag_type_id, tag_type_name=mock_tag.tag_type.name),
+        make_facet_row(3, 5),
+    ]
+    db.execute.return_value = result
+
+    facets = await list_place_facets(db, filter_options=FilterOptions(q="Test"))
+
+    assert [(tag.id, tag.count) for tag in facets.tags] == [(mock_tag.id, 3)]
+    assert [(tag_type.name, tag_type.count) for tag_type in facets.tag_types] == [("Test Tag Type", 3)]
+    assert not facets.approximate
+
+    # A single grouped query over the same candidates as list_places, capped
+    db.execute.assert_awaited_once()
+    stmt_passed = db.execute.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert "GROUP BY GROUPING SETS" in compiled_sql
+    assert "places.name % 'Test'" in compiled_sql
+    assert f"LIMIT {PLACE_FACET_CANDIDATE_LIMIT + 1}" in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_list_place_facets_approximate() -> None:
+    db = MockDBUoW()
+    result = MagicMock()
+    result.all.return_value = [make_facet_row(3, PLACE_FACET_CANDIDATE_LIMIT + 1)]
+    db.execute.return_value = result
+
+    facets = await list_place_facets(db)
+
+    assert facets.tags == []
+    assert facets.approximate
+
+
+@pytest.mark.asyncio
+async def test_list_places_by_dish(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(dish_q="hot pot"), lang=Language.EN_US)
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    # A semi-join through menus to dishes, leaving one row per place
+    assert "WHERE EXISTS (SELECT dishes.id" in compiled_sql
+    assert "menus.place_id = places.id AND ((dishes.name % 'hot pot') OR (dishes.name_zh % 'hot pot'))" in compiled_sql
+    # The best matching dishes are not looked up unless asked for
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_places_with_best_dish(mock_place: Place) -> None:
+    dish_id = uuid4()
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+    result = MagicMock()
+    result.all.return_value = [
+        SimpleNamespace(
+            place_id=mock_place.id,
+            id=dish_id,
+            name="Spicy Hot Pot",
+            price=Decimal("28.00"),
+            properties={},
+        ),
+    ]
+    db.execute.return_value = result
+
+    [item], _ = await list_places(
+        db,
+        filter_options=FilterOptions(dish_q="hot pot"),
+        lang=Language.EN_US,
+        include_best_dish=True,
+    )
+
+    assert item.best_dish == MatchingDish(id=dish_id, display_name="Spicy Hot Pot", price=Decimal("28.00"))
+
+    # One query for the whole page
+    db.execute.assert_awaited_once()
+    stmt_passed = db.execute.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(dialect=postgresql.dialect()))
+    assert "SELECT DISTINCT ON (menus.place_id)" in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_list_places_by_price_stats(mock_place: Place) -> None:
+    mock_place.price_min = Decimal("8.00")
+    mock_place.price_median = Decimal("12.50")
+    mock_place.price_max = Decimal("30.00")
+    mock_place.dish_count = 42
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    [item], _ = await list_places(
+        db,
+        sort_options=SortOptions(sort_by="price_median", order="desc"),
+        filter_options=FilterOptions(price_range=PriceRange(max_price=Decimal(15))),
+    )
+
+    assert (item.price_min, item.price_median, item.price_max, item.dish_count) == (
+        Decimal("8.00"),
+        Decimal("12.50"),
+        Decimal("30.00"),
+        42,
+    )
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    # The precomputed stats are used without joining dishes
+    assert "dishes" not in compiled_sql
+    assert "places.price_median <= 15" in compiled_sql
+    assert "ORDER BY places.price_median DESC NULLS LAST" in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_list_places_sort_by_name_is_case_insensitive(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, sort_options=SortOptions(sort_by="name"))
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    assert "ORDER BY lower(places.name) ASC NULLS LAST" in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_list_places_open_at_wall_clock_time(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    # Friday at 9pm, in the local time of each place
+    await list_places(db, filter_options=FilterOptions(open_at=datetime.datetime(2026, 10, 23, 21, 0)))  # noqa: DTZ001
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(compile_kwargs={"literal_binds": True}))
+    # A constant minute of the week, which can use the GiST index
+    assert f"places.opening_minutes @> {4 * 24 * 60 + 21 * 60}" in compiled_sql
+    assert "timezone(" not in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_list_places_open_at_instant(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(open_at=datetime.datetime.now(datetime.UTC)))
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(dialect=postgresql.dialect()))
+    # The instant is converted to the local time of each distinct timezone, not of each place
+    assert compiled_sql.startswith("WITH RECURSIVE zones(timezone) AS")
+    assert "timezone(places.timezone" not in compiled_sql
+    assert "open_place.timezone = zones.timezone AND (open_place.opening_minutes @> CAST(" in compiled_sql
+    assert "EXTRACT(isodow FROM timezone(zones.timezone" in compiled_sql
+    count_stmt = db.get_count.call_args.args[0]
+    assert str(count_stmt.compile(dialect=postgresql.dialect())).startswith("WITH RECURSIVE zones(timezone) AS")
+
+
+@pytest.mark.asyncio
+async def test_list_places_by_properties(mock_place: Place) -> None:
+    db = MockDBUoW()
+    db.get_all.return_value = [mock_place]
+    db.get_count.return_value = 1
+
+    await list_places(db, filter_options=FilterOptions(properties={"has_parking": True}))
+
+    stmt_passed = db.get_all.call_args.args[0]
+    compiled_sql = str(stmt_passed.compile(dialect=postgresql.dialect()))
+    # Containment, which can use the jsonb_path_ops GIN index
+    assert "places.properties @> %(properties_1)s" in compiled_sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_places() -> None:
+    tag_id = uuid4()
+    created_id = uuid4()
+    updated_id = uuid4()
+    places = [
+        PlaceCreate(name="New Place", name_zh="新地方", type="food", google_maps_place_id="new", tag_ids=[tag_id]),
+        PlaceCreate(
+            name="Old Place",
+            type="food",
+            google_maps_place_id="old",
+            location=Location(latitude=2.0, longitude=1.0),
+        ),
+        PlaceCreate(name="No Key", type="food"),
+        PlaceCreate(name="Repeated", type="food", google_maps_place_id="new"),
+        PlaceCreate(name="Unknown Tag", type="food", google_maps_place_id="other", tag_ids=[uuid4()]),
+    ]
+    tags_result = MagicMock()
+    tags_result.scalars.return_value = [tag_id]
+    upsert_result = MagicMock()
+    upsert_result.all.return_value = [
+        SimpleNamespace(id=created_id, google_maps_place_id="new", inserted=True),
+        SimpleNamespace(id=updated_id, google_maps_place_id="old", inserted=False),
+    ]
+    db = MockDBUoW()
+    db.execute.side_effect = [tags_result, upsert_result, MagicMock(), MagicMock()]
+
+    response = await bulk_upsert_places(db, places)
+
+    assert [(result.index, result.id, result.status) for result in response.results] == [
+        (0, created_id, PlaceUpsertStatus.CREATED),
+        (1, updated_id, PlaceUpsertStatus.UPDATED),
+        (2, None, PlaceUpsertStatus.FAILED),
+        (3, None, PlaceUpsertStatus.FAILED),
+        (4, None, PlaceUpsertStatus.FAILED),
+    ]
+    assert (response.created, response.updated, response.failed) == (1, 1, 3)
+    assert "Google Maps Place ID" in response.results[2].error
+    assert "Invalid tag IDs" in response.results[4].error
+
+    # Tag lookup, upsert, tag deletion and tag insertion, then a single commit
+    assert db.execute.await_count == 4
+    db.commit.assert_awaited_once()
+    upsert_sql = str(db.execute.call_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert upsert_sql.count("INSERT INTO places") == 1
+    assert "ON CONFLICT (google_maps_place_id) DO UPDATE" in upsert_sql
+    assert "name_zh_tokens = excluded.name_zh_tokens" in upsert_sql
+    assert "ST_SetSRID(ST_MakePoint(" in upsert_sql
+    tags_stmt = db.execute.call_args_list[3].args[0]
+    assert tags_stmt.compile().params == {"place_id_m0": created_id, "tag_id_m0": tag_id}
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_places_all_invalid() -> None:
+    db = MockDBUoW()
+
+    response = await bulk_upsert_places(db, [PlaceCreate(name="No Key", type="food")])
+
+    assert response.failed == 1
+    db.execute.assert_not_awaited()
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_places_constraint_violation() -> None:
+    db = MockDBUoW()
+    db.execute.side_effect = IntegrityError("INSERT INTO places", {}, Exception("violates not-null constraint"))
+
+    with pytest.raises(ValidationError):
+        await bulk_upsert_places(db, [PlaceCreate(name="New Place", type="food", google_maps_place_id="new")])
+
+    db.commit.assert_not_awaited()
+
+
+def test_bulk_upsert_rejects_too_many_places() -> None:
+    with pytest.raises(ValidationError, match="can be upserted at once"):
+        PlaceBulkUpsert(places=[{"name": "Place", "type": "food"}] * (PLACE_BULK_UPSERT_MAX_PLACES + 1))
@@ -0,0 +1,194 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.schemas.places import Location, PlaceSuggestion
+from app.services import suggestions
+from app.services.suggestions import (
+    PlaceSuggestionIndex,
+    build_suggestion_index,
+    get_suggestion_index,
+    load_place_suggestions,
+    refresh_place_suggestions,
+    tokenize,
+)
+from tests.mocks.mock_uow import MockDBUoW
+
+
+def make_suggestion(name: str, name_zh: str | None = None) -> PlaceSuggestion:
+    return PlaceSuggestion(
+        id=uuid4(),
+        name=name,
+        name_zh=name_zh,
+        location=Location(latitude=37.7749, longitude=-122.4194),
+    )
+
+
+def make_result(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+@pytest.fixture
+def index() -> PlaceSuggestionIndex:
+    return PlaceSuggestionIndex()
+
+
+def test_tokenize_normalizes_width_and_case() -> None:
+    assert tokenize("\uff24\uff21\uff2e Dan  Noodles") == ["dan", "dan", "noodles"]
+    assert tokenize(None) == []
+
+
+def test_search_by_prefix(index: PlaceSuggestionIndex) -> None:
+    noodle = make_suggestion("Dan Dan Noodle House")
+    dumpling = make_suggestion("Dumpling Time")
+    index.upsert(noodle)
+    index.upsert(dumpling)
+
+    assert index.search("dan") == [noodle]
+    assert index.search("du") == [dumpling]
+    assert index.search("d") == [noodle, dumpling]
+
+
+def test_search_requires_every_token(index: PlaceSuggestionIndex) -> None:
+    noodle = make_suggestion("Dan Dan Noodle House")
+    index.upsert(noodle)
+    index.upsert(make_suggestion("Noodle Bar"))
+
+    assert index.search("noodle house") == [noodle]
+
+
+def test_search_tolerates_typos(index: PlaceSuggestionIndex) -> None:
+    dumpling = make_suggestion("Dumpling Time")
+    index.upsert(dumpling)
+
+    assert index.search("dumplnig") == [dumpling]
+
+
+def test_search_by_name_zh(index: PlaceSuggestionIndex) -> None:
+    hot_pot = make_suggestion("Little Sheep", "小肥羊")
+    index.upsert(hot_pot)
+
+    assert index.search("小肥") == [hot_pot]
+
+
+def test_search_by_alias(index: PlaceSuggestionIndex) -> None:
+    soup_dumplings = make_suggestion("Soup Dumpling House", "小笼包")
+    index.upsert(soup_dumplings, aliases=["xiaolongbao", "xlb"])
+
+    assert index.search("xiaolong") == [soup_dumplings]
+    assert index.search("xlb") == [soup_dumplings]
+
+
+def test_search_by_tag_ranks_below_name(index: PlaceSuggestionIndex) -> None:
+    tagged = make_suggestion("Golden Dragon")
+    named = make_suggestion("Sichuan Garden")
+    index.upsert(tagged, ["Sichuan"])
+    index.upsert(named)
+
+    assert index.search("sichuan") == [named, tagged]
+
+
+def test_search_respects_limit(index: PlaceSuggestionIndex) -> None:
+    for i in range(5):
+        index.upsert(make_suggestion(f"Cafe {i}"))
+
+    assert len(index.search("cafe", limit=3)) == 3
+
+
+def test_upsert_replaces_previous_terms(index: PlaceSuggestionIndex) -> None:
+    place = make_suggestion("Old Name")
+    index.upsert(place)
+    renamed = place.model_copy(update={"name": "New Name"})
+    index.upsert(renamed)
+
+    assert index.search("old") == []
+    assert index.search("new") == [renamed]
+    assert len(index) == 1
+
+
+def test_remove(index: PlaceSuggestionIndex) -> None:
+    place = make_suggestion("Dumpling Time")
+    index.upsert(place)
+    index.remove(place.id)
+
+    assert index.search("dumpling") == []
+    assert len(index) == 0
+
+    # Slots are reused after removal
+    other = make_suggestion("Dumpling Home")
+    index.upsert(other)
+    assert index.search("dumpling") == [other]
+
+
+@pytest.mark.asyncio
+async def test_load_place_suggestions(index: PlaceSuggestionIndex) -> None:
+    place_id = uuid4()
+    db = MockDBUoW()
+    db.execute.side_effect = [
+        make_result([(place_id, "Sichuan")]),
+        make_result(
+            [
+                SimpleNamespace(
+                    id=place_id,
+                    name="Golden Dragon",
+                    name_zh="金龙",
+                    name_zh_pinyin="jinlong",
+                    name_zh_pinyin_initials="jl",
+                    latitude=1.0,
+                    longitude=2.0,
+                ),
+            ],
+        ),
+    ]
+
+    await load_place_suggestions(db, index)
+
+    [suggestion] = index.search("sichuan")
+    assert suggestion.id == place_id
+    assert suggestion.location == Location(latitude=1.0, longitude=2.0)
+    assert index.search("jinlong") == [suggestion]
+
+
+@pytest.mark.asyncio
+async def test_load_place_suggestions_removes_missing_places(index: PlaceSuggestionIndex) -> None:
+    place = make_suggestion("Dumpling Time")
+    index.upsert(place)
+
+    db = MockDBUoW()
+    db.execute.side_effect = [make_result([]), make_result([])]
+
+    await load_place_suggestions(db, index, [place.id])
+
+    assert index.search("dumpling") == []
+
+
+@pytest.mark.asyncio
+async def test_build_suggestion_index_replays_refreshes(mocker: MockerFixture) -> None:
+    old_index = get_suggestion_index()
+    place_id = uuid4()
+    loads: list[tuple[PlaceSuggestionIndex, list[UUID] | None]] = []
+
+    async def load(_db: MockDBUoW, index: PlaceSuggestionIndex, place_ids: list[UUID] | None = None) -> None:
+        loads.append((index, place_ids))
+        if place_ids is None:
+            # The place changes while the new index is loading
+            await refresh_place_suggestions({str(place_id)})
+
+    db = MagicMock()
+    db.__aenter__.return_value = MockDBUoW()
+    mocker.patch.object(suggestions, "DBUnitOfWork", return_value=db)
+    mocker.patch.object(suggestions, "get_async_session_maker")
+    mocker.patch.object(suggestions, "load_place_suggestions", side_effect=load)
+    mocker.patch.object(suggestions, "_suggestion_index", old_index)
+
+    await build_suggestion_index()
+
+    new_index = get_suggestion_index()
+    assert new_index is not old_index
+    assert loads == [(new_index, None), (old_index, [place_id]), (new_index, [place_id])]
+    assert suggestions._rebuild_refreshes == []  # noqa: SLF001
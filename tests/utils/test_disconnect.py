@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from app.utils.disconnect import CANCELLED, CancelOnDisconnectMiddleware
+
+
+def make_receive(*messages: Message) -> Receive:
+    queue: asyncio.Queue[Message] = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    return queue.get
+
+
+async def send_nothing(_message: Message) -> None:
+    pass
+
+
+class QueryError(Exception):
+    pass
+
+
+SCOPE = {"type": "http", "method": "GET", "path": "/places/"}
+
+
+@pytest.mark.asyncio
+async def test_request_is_cancelled_when_its_client_disconnects() -> None:
+    received: list[Message] = []
+    cancelled = asyncio.Event()
+
+    async def app(_scope: Scope, receive: Receive, _send: Send) -> None:
+        received.append(await receive())
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    before = CANCELLED.value()
+    receive = make_receive({"type": "http.request", "body": b"", "more_body": False}, {"type": "http.disconnect"})
+    await CancelOnDisconnectMiddleware(app)(SCOPE, receive, send_nothing)
+
+    assert received == [{"type": "http.request", "body": b"", "more_body": False}]
+    assert cancelled.is_set()
+    assert CANCELLED.value() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_request_is_not_cancelled_once_its_response_is_sent() -> None:
+    sent: list[Message] = []
+    finished = asyncio.Event()
+
+    async def app(_scope: Scope, _receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+        # A background task, run once the response is sent
+        await asyncio.sleep(0.01)
+        finished.set()
+
+    async def send(message: Message) -> None:  # noqa: RUF029
+        sent.append(message)
+
+    await CancelOnDisconnectMiddleware(app)(SCOPE, make_receive({"type": "http.disconnect"}), send)
+
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+    assert finished.is_set()
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_raised() -> None:
+    async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+        await asyncio.sleep(0)
+        raise QueryError
+
+    with pytest.raises(QueryError):
+        await CancelOnDisconnectMiddleware(app)(SCOPE, make_receive(), send_nothing)
+
+
+@pytest.mark.asyncio
+async def test_request_body_is_not_read_ahead_of_the_application() -> None:
+    reads = 0
+    body_wanted = asyncio.Event()
+    chunks = [{"type": "http.request", "body": b"x", "more_body": True}] * 10
+    queue = make_receive(*chunks, {"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive() -> Message:
+        nonlocal reads
+        reads += 1
+        return await queue()
+
+    async def app(_scope: Scope, receive: Receive, send: Send) -> None:
+        await body_wanted.wait()
+        body = b""
+        while (message := await receive())["more_body"]:
+            body += message["body"]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    middleware = asyncio.create_task(CancelOnDisconnectMiddleware(app)(SCOPE, receive, send_nothing))
+    await asyncio.sleep(0.01)
+    # One message is queued for the application and the next one waits to be
+    assert reads == 2
+
+    body_wanted.set()
+    await middleware
+    # The whole body is read, then the client is waited for until the response is sent
+    assert reads == len(chunks) + 2
+
+
+@pytest.mark.asyncio
+async def test_request_is_cancelled_when_its_client_disconnects_before_its_body_is_read() -> None:
+    cancelled = asyncio.Event()
+
+    async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    receive = make_receive({"type": "http.request", "body": b"", "more_body": False}, {"type": "http.disconnect"})
+    await CancelOnDisconnectMiddleware(app)(SCOPE, receive, send_nothing)
+
+    assert cancelled.is_set()
@@ -0,0 +1,24 @@
+import hashlib
+
+from app.utils.http import etag_matches, make_etag, quote_etag
+
+
+def test_make_etag_is_stable() -> None:
+    assert make_etag(b"[]") == make_etag(b"[]")
+    assert make_etag(b"[]") != make_etag(b"[{}]")
+    assert make_etag(b"[]").startswith('"')
+
+
+def test_quote_etag() -> None:
+    assert quote_etag("abc") == '"abc"'
+    assert make_etag(b"[]") == quote_etag(hashlib.sha256(b"[]").hexdigest())
+
+
+def test_etag_matches() -> None:
+    etag = make_etag(b"[]")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,20 @@
+from app.utils.metrics import Counter, Gauge, render_metrics
+
+
+def test_render_metrics() -> None:
+    counter = Counter("test_requests_total", "Requests, by route.", labels=("route",))
+    counter.inc(route="list")
+    counter.inc(2, route="list")
+    counter.inc(route="get")
+    Gauge("test_queue_depth", "Requests waiting.", lambda: 3)
+
+    assert counter.value(route="list") == 3
+    assert (
+        "# HELP test_requests_total Requests, by route.\n"
+        "# TYPE test_requests_total counter\n"
+        'test_requests_total{route="get"} 1\n'
+        'test_requests_total{route="list"} 3\n'
+        "# HELP test_queue_depth Requests waiting.\n"
+        "# TYPE test_queue_depth gauge\n"
+        "test_queue_depth 3\n"
+    ) in render_metrics()
@@ -0,0 +1,21 @@
+from app.utils.opening_hours import minute_of_day, minute_of_week, opening_minute_ranges
+
+
+def test_minute_of_week() -> None:
+    assert minute_of_day("00:00") == 0
+    assert minute_of_day("21:30") == 21 * 60 + 30
+    assert minute_of_week(1, 0) == 0
+    assert minute_of_week(7, minute_of_day("23:59")) == 7 * 24 * 60 - 1
+
+
+def test_opening_minute_ranges() -> None:
+    opening_hours = [
+        {"day": 2, "open": "08:00", "close": "12:00"},
+        {"day": 1, "open": "18:00", "close": "22:00"},
+    ]
+
+    assert opening_minute_ranges(opening_hours) == [
+        (18 * 60, 22 * 60),
+        (24 * 60 + 8 * 60, 24 * 60 + 12 * 60),
+    ]
+    assert opening_minute_ranges([]) == []
@@ -0,0 +1,97 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.datastructures import QueryParams
+
+from app.constants import RATE_LIMIT_SEARCH_COST
+from app.utils.rate_limit import MemoryRateLimitBackend, RateLimitMiddleware, client_key, request_cost
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_memory_rate_limit_backend() -> None:
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(capacity=10, refill_rate=2, clock=clock)
+
+    assert await backend.take("ip:1", 4) == (True, 6, 2, 0)
+    assert await backend.take("ip:1", 5) == (True, 1, 5, 0)
+    # Not enough tokens left, none is taken
+    assert await backend.take("ip:1", 3) == (False, 1, 5, 1)
+    # Other clients have their own bucket
+    assert (await backend.take("ip:2", 3)).allowed
+
+    clock.now = 1
+    assert await backend.take("ip:1", 3) == (True, 0, 5, 0)
+
+    # Buckets never hold more than their capacity
+    clock.now = 100
+    assert await backend.take("ip:1", 1) == (True, 9, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_memory_rate_limit_backend_forgets_full_buckets() -> None:
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(capacity=10, refill_rate=0.1, max_buckets=2, clock=clock)
+
+    await backend.take("ip:1", 1)
+    clock.now = 5
+    await backend.take("ip:2", 1)
+    clock.now = 10
+    await backend.take("ip:3", 1)
+
+    # The first bucket is full again, so it is forgotten
+    assert len(backend._buckets) == 2  # noqa: SLF001
+    assert await backend.take("ip:1", 1) == (True, 9, 10, 0)
+
+
+def test_request_cost() -> None:
+    assert request_cost("GET", "/places/123", QueryParams("")) == 1
+    assert request_cost("GET", "/places/", QueryParams("sw_lat=1")) == 2
+    assert request_cost("GET", "/places/", QueryParams("q=noodles")) == RATE_LIMIT_SEARCH_COST
+
+
+def test_client_key() -> None:
+    scope = {"type": "http", "client": ("10.0.0.1", 1234)}
+
+    assert client_key(scope | {"path": "/places/"}) == "ip:10.0.0.1"
+    # Tokens are not verified yet, so admin clients are told apart by address as well
+    assert client_key(scope | {"path": "/admin/places/"}) == "ip:10.0.0.1"
+    assert client_key({"type": "http", "path": "/places/"}) == "ip:unknown"
+
+
+def make_client(backend: MemoryRateLimitBackend) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/places/")
+    async def list_places() -> list:
+        return []
+
+    app.add_middleware(RateLimitMiddleware, backend=backend)
+    return TestClient(app)
+
+
+def test_rate_limit_middleware() -> None:
+    # Two nodes sharing a backend, standing in for the shared backend of a multi-node deployment
+    backend = MemoryRateLimitBackend(capacity=6, refill_rate=1, clock=FakeClock())
+    nodes = [make_client(backend), make_client(backend)]
+
+    response = nodes[0].get("/places/")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "6"
+    assert response.headers["RateLimit-Remaining"] == "4"
+    assert response.headers["RateLimit-Reset"] == "2"
+
+    assert nodes[1].get("/places/").headers["RateLimit-Remaining"] == "2"
+
+    response = nodes[0].get("/places/", params={"q": "noodles"})
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests"}
+    assert response.headers["Retry-After"] == "3"
+    assert response.headers["RateLimit-Remaining"] == "2"
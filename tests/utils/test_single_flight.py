@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import CALLS, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result() -> None:
+    flight = SingleFlight("test_shares_result")
+    calls = []
+
+    async def query(name: str) -> str:
+        calls.append(name)
+        await asyncio.sleep(0)
+        return name
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: query("first")),
+        flight.do("a", lambda: query("second")),
+        flight.do("b", lambda: query("third")),
+    )
+
+    assert results == ["first", "first", "third"]
+    assert calls == ["first", "third"]
+    assert CALLS.value(name="test_shares_result", role="leader") == 2
+    assert CALLS.value(name="test_shares_result", role="follower") == 1
+
+    # Once finished, the next call runs its own function
+    assert await flight.do("a", lambda: query("fourth")) == "fourth"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_error() -> None:
+    flight = SingleFlight("test_shares_error")
+
+    async def fail() -> None:
+        await asyncio.sleep(0)
+        raise ValueError
+
+    results = await asyncio.gather(flight.do("a", fail), flight.do("a", fail), return_exceptions=True)
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_leader_cancelled() -> None:
+    flight = SingleFlight("test_leader_cancelled")
+    started = asyncio.Event()
+
+    async def query(name: str) -> str:
+        started.set()
+        await asyncio.sleep(0.01)
+        return name
+
+    leader = asyncio.create_task(flight.do("a", lambda: query("leader")))
+    await started.wait()
+    followers = [asyncio.create_task(flight.do("a", lambda name=name: query(name))) for name in ("f1", "f2")]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    # The first follower runs its own function in place of the cancelled leader, for the other follower
+    assert await asyncio.gather(*followers) == ["f1", "f1"]
+    assert leader.cancelled()
+
+
+class DeadlineError(Exception):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_share_own_errors() -> None:
+    flight = SingleFlight("test_own_errors", is_own_error=lambda error: isinstance(error, DeadlineError))
+    started = asyncio.Event()
+
+    async def query(name: str) -> str:
+        started.set()
+        await asyncio.sleep(0.01)
+        if name == "leader":
+            raise DeadlineError
+        return name
+
+    leader = asyncio.create_task(flight.do("a", lambda: query("leader")))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("a", lambda: query("follower")))
+
+    # The deadline of the leader is its own, so the follower runs its own function
+    assert await follower == "follower"
+    with pytest.raises(DeadlineError):
+        await leader
@@ -0,0 +1,39 @@
+from app.utils.text import contains_cjk, normalize_zh, pinyin_query, to_pinyin, zh_query_tokens, zh_search_tokens
+
+
+def test_contains_cjk() -> None:
+    assert contains_cjk("小笼包")
+    assert contains_cjk("Din Tai Fung 鼎泰豐")
+    assert not contains_cjk("Din Tai Fung")
+    assert not contains_cjk(None)
+
+
+def test_normalize_zh_converts_traditional_and_full_width() -> None:
+    assert normalize_zh("鼎泰豐") == "鼎泰丰"
+    assert normalize_zh("\uff2b\uff26\uff23") == "kfc"
+
+
+def test_zh_search_tokens() -> None:
+    assert zh_search_tokens("牛肉麵 KFC") == ["kfc", "牛", "牛肉", "肉", "肉面", "面"]
+    assert zh_search_tokens(None) == []
+
+
+def test_zh_query_tokens() -> None:
+    assert zh_query_tokens("牛肉麵") == ["牛肉", "肉面"]
+    assert zh_query_tokens("麵") == ["面"]
+
+
+def test_query_tokens_are_contained_in_search_tokens() -> None:
+    tokens = set(zh_search_tokens("臺灣牛肉麵館"))
+    assert set(zh_query_tokens("台湾牛肉面")) <= tokens
+    assert set(zh_query_tokens("牛肉")) <= tokens
+
+
+def test_to_pinyin() -> None:
+    assert to_pinyin("小籠包") == ("xiaolongbao", "xlb")
+    assert to_pinyin("麻辣烫 2号店") == ("malatang2haodian", "mlt2hd")
+    assert to_pinyin(None) == (None, None)
+
+
+def test_pinyin_query() -> None:
+    assert pinyin_query("Xiao Long-Bao") == "xiaolongbao"